@@ -5,7 +5,9 @@ from alembic import context
 from sqlalchemy import engine_from_config, pool
 
 from app.db.base import Base
+import app.models.owner_shard  # noqa: F401
 import app.models.prompt  # noqa: F401
+import app.models.retention_policy  # noqa: F401
 import app.models.user  # noqa: F401
 import app.models.user_api_key  # noqa: F401
 
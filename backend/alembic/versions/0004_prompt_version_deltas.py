@@ -0,0 +1,36 @@
+"""Allow prompt versions to be stored as reverse deltas.
+
+Revision ID: 0004_prompt_version_deltas
+Revises: 0003_user_api_keys
+Create Date: 2026-10-19 00:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004_prompt_version_deltas"
+down_revision: Union[str, None] = "0003_user_api_keys"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("prompt_versions", sa.Column("content_delta", sa.Text(), nullable=True))
+    op.alter_column("prompt_versions", "content", existing_type=sa.Text(), nullable=True)
+    op.create_check_constraint(
+        "ck_prompt_versions_content_stored",
+        "prompt_versions",
+        "content IS NOT NULL OR content_delta IS NOT NULL",
+    )
+
+
+def downgrade() -> None:
+    # Delta rows must be expanded first, e.g. with PROMPT_VERSION_STORAGE=full and
+    # prompt_dal.rebuild_prompt_version_storage for every prompt.
+    op.drop_constraint("ck_prompt_versions_content_stored", "prompt_versions", type_="check")
+    op.alter_column("prompt_versions", "content", existing_type=sa.Text(), nullable=False)
+    op.drop_column("prompt_versions", "content_delta")
@@ -0,0 +1,56 @@
+"""Replace redundant indexes with composites that match the DAL queries.
+
+Revision ID: 0005_index_overhaul
+Revises: 0004_prompt_version_deltas
+Create Date: 2026-10-19 01:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005_index_overhaul"
+down_revision: Union[str, None] = "0004_prompt_version_deltas"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns) for indexes that duplicate a primary key or are a leading
+# prefix of a unique constraint (uq_prompts_owner_name, uq_prompt_version,
+# uq_user_api_keys_user_name) and so never serve a query the constraint cannot.
+REDUNDANT_INDEXES = (
+    ("ix_users_id", "users", ["id"]),
+    ("ix_prompts_id", "prompts", ["id"]),
+    ("ix_prompts_owner_id", "prompts", ["owner_id"]),
+    ("ix_prompt_versions_id", "prompt_versions", ["id"]),
+    ("ix_prompt_versions_prompt_id", "prompt_versions", ["prompt_id"]),
+    ("ix_prompt_tags_id", "prompt_tags", ["id"]),
+    ("ix_prompt_tags_name", "prompt_tags", ["name"]),
+    ("ix_prompt_tags_prompt_version_id", "prompt_tags", ["prompt_version_id"]),
+    ("ix_user_api_keys_id", "user_api_keys", ["id"]),
+    ("ix_user_api_keys_user_id", "user_api_keys", ["user_id"]),
+)
+
+COMPOSITE_INDEXES = (
+    ("ix_prompt_tags_name_prompt_version_id", "prompt_tags", ["name", "prompt_version_id"]),
+    ("ix_prompt_tags_prompt_version_id_id", "prompt_tags", ["prompt_version_id", "id"]),
+)
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction. A failed concurrent build leaves an
+    # INVALID index behind; drop it by name before re-running the migration.
+    with op.get_context().autocommit_block():
+        for name, table, columns in COMPOSITE_INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True)
+        for name, table, _ in REDUNDANT_INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in REDUNDANT_INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True)
+        for name, table, _ in COMPOSITE_INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
@@ -0,0 +1,46 @@
+"""Store prompt version metadata as JSONB with a GIN index.
+
+Revision ID: 0006_prompt_version_metadata
+Revises: 0005_index_overhaul
+Create Date: 2026-10-19 02:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006_prompt_version_metadata"
+down_revision: Union[str, None] = "0005_index_overhaul"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # A nullable column without a default is a catalog-only change; existing rows are
+    # not rewritten.
+    op.add_column("prompt_versions", sa.Column("metadata", postgresql.JSONB(), nullable=True))
+    # CONCURRENTLY cannot run inside a transaction. A failed concurrent build leaves an
+    # INVALID index behind; drop it by name before re-running the migration.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_prompt_versions_metadata",
+            "prompt_versions",
+            ["metadata"],
+            postgresql_using="gin",
+            postgresql_ops={"metadata": "jsonb_path_ops"},
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_prompt_versions_metadata",
+            table_name="prompt_versions",
+            postgresql_concurrently=True,
+        )
+    op.drop_column("prompt_versions", "metadata")
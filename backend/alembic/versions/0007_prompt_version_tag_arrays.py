@@ -0,0 +1,89 @@
+"""Move prompt tags into a GIN-indexed array on prompt_versions.
+
+Revision ID: 0007_prompt_version_tag_arrays
+Revises: 0006_prompt_version_metadata
+Create Date: 2026-10-19 03:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0007_prompt_version_tag_arrays"
+down_revision: Union[str, None] = "0006_prompt_version_metadata"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # A constant default is stored in the catalog, so adding the column does not rewrite
+    # the table; only versions that had tag rows are updated by the backfill. Tags keep
+    # their insertion order, so the first one is still the version's `tag`.
+    op.add_column(
+        "prompt_versions",
+        sa.Column(
+            "tags",
+            postgresql.ARRAY(sa.String(length=64)),
+            nullable=False,
+            server_default=sa.text("'{}'"),
+        ),
+    )
+    op.execute(
+        """
+        UPDATE prompt_versions
+        SET tags = grouped.tags
+        FROM (
+            SELECT prompt_version_id, array_agg(name ORDER BY first_id) AS tags
+            FROM (
+                SELECT prompt_version_id, name, min(id) AS first_id
+                FROM prompt_tags
+                GROUP BY prompt_version_id, name
+            ) AS distinct_tags
+            GROUP BY prompt_version_id
+        ) AS grouped
+        WHERE prompt_versions.id = grouped.prompt_version_id
+        """
+    )
+    op.drop_table("prompt_tags")
+    # CONCURRENTLY cannot run inside a transaction. A failed concurrent build leaves an
+    # INVALID index behind; drop it by name before re-running the migration.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_prompt_versions_tags",
+            "prompt_versions",
+            ["tags"],
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_prompt_versions_tags", table_name="prompt_versions", postgresql_concurrently=True
+        )
+    op.create_table(
+        "prompt_tags",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("prompt_version_id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=64), nullable=False),
+        sa.ForeignKeyConstraint(["prompt_version_id"], ["prompt_versions.id"]),
+    )
+    op.create_index(
+        "ix_prompt_tags_name_prompt_version_id", "prompt_tags", ["name", "prompt_version_id"]
+    )
+    op.create_index("ix_prompt_tags_prompt_version_id_id", "prompt_tags", ["prompt_version_id", "id"])
+    op.execute(
+        """
+        INSERT INTO prompt_tags (prompt_version_id, name)
+        SELECT prompt_versions.id, tag.name
+        FROM prompt_versions
+        CROSS JOIN LATERAL unnest(prompt_versions.tags) WITH ORDINALITY AS tag(name, position)
+        ORDER BY prompt_versions.id, tag.position
+        """
+    )
+    op.drop_column("prompt_versions", "tags")
@@ -0,0 +1,33 @@
+"""Add the owner_shards directory.
+
+Revision ID: 0008_owner_shards
+Revises: 0007_prompt_version_tag_arrays
+Create Date: 2026-10-19 06:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0008_owner_shards"
+down_revision: Union[str, None] = "0007_prompt_version_tag_arrays"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "owner_shards",
+        sa.Column("owner_id", sa.Integer(), primary_key=True),
+        sa.Column("shard", sa.String(length=64), nullable=False),
+        sa.Column("moving_to", sa.String(length=64), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["owner_id"], ["users.id"]),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("owner_shards")
@@ -0,0 +1,81 @@
+"""Add retention policies and the prompt version archive.
+
+Revision ID: 0009_retention_and_archive
+Revises: 0008_owner_shards
+Create Date: 2026-10-19 08:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0009_retention_and_archive"
+down_revision: Union[str, None] = "0008_owner_shards"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "retention_policies",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("owner_id", sa.Integer(), nullable=False),
+        sa.Column("prompt_name", sa.String(length=255), nullable=True),
+        sa.Column("keep_last", sa.Integer(), nullable=True),
+        sa.Column("keep_tagged", sa.Boolean(), nullable=False),
+        sa.Column("keep_days", sa.Integer(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["owner_id"], ["users.id"]),
+        sa.UniqueConstraint("owner_id", "prompt_name", name="uq_retention_policies_owner_prompt"),
+        sa.CheckConstraint(
+            "keep_last IS NULL OR keep_last >= 1", name="ck_retention_policies_keep_last"
+        ),
+        sa.CheckConstraint(
+            "keep_days IS NULL OR keep_days >= 1", name="ck_retention_policies_keep_days"
+        ),
+    )
+    op.create_index(
+        "uq_retention_policies_owner_default",
+        "retention_policies",
+        ["owner_id"],
+        unique=True,
+        postgresql_where=sa.text("prompt_name IS NULL"),
+    )
+
+    op.create_table(
+        "prompt_versions_archive",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("owner_id", sa.Integer(), nullable=False),
+        sa.Column("prompt_name", sa.String(length=255), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column(
+            "tags",
+            postgresql.ARRAY(sa.String(length=64)),
+            nullable=False,
+            server_default=sa.text("'{}'"),
+        ),
+        sa.Column("metadata", postgresql.JSONB(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("archived_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["owner_id"], ["users.id"]),
+    )
+    op.create_index(
+        "ix_prompt_versions_archive_owner_name_version",
+        "prompt_versions_archive",
+        ["owner_id", "prompt_name", "version"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_prompt_versions_archive_owner_name_version", table_name="prompt_versions_archive"
+    )
+    op.drop_table("prompt_versions_archive")
+    op.drop_index("uq_retention_policies_owner_default", table_name="retention_policies")
+    op.drop_table("retention_policies")
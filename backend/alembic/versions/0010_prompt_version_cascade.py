@@ -0,0 +1,43 @@
+"""Delete prompt versions together with their prompt.
+
+Revision ID: 0010_prompt_version_cascade
+Revises: 0009_retention_and_archive
+Create Date: 2026-10-19 09:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0010_prompt_version_cascade"
+down_revision: Union[str, None] = "0009_retention_and_archive"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _replace_prompt_fk(on_delete: str) -> None:
+    # NOT VALID swaps the constraint without scanning prompt_versions under the ACCESS
+    # EXCLUSIVE lock, and that lock is released when the swap commits. VALIDATE then scans
+    # in its own transaction under SHARE UPDATE EXCLUSIVE, so reads and writes continue.
+    op.execute("ALTER TABLE prompt_versions DROP CONSTRAINT prompt_versions_prompt_id_fkey")
+    op.execute(
+        f"""
+        ALTER TABLE prompt_versions
+        ADD CONSTRAINT prompt_versions_prompt_id_fkey
+        FOREIGN KEY (prompt_id) REFERENCES prompts (id) {on_delete} NOT VALID
+        """
+    )
+    with op.get_context().autocommit_block():
+        op.execute(
+            "ALTER TABLE prompt_versions VALIDATE CONSTRAINT prompt_versions_prompt_id_fkey"
+        )
+
+
+def upgrade() -> None:
+    _replace_prompt_fk("ON DELETE CASCADE")
+
+
+def downgrade() -> None:
+    _replace_prompt_fk("")
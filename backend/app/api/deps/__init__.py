@@ -1,3 +1,12 @@
+from app.api.deps.admin import require_admin
 from app.api.deps.auth import PromptReadAccess, get_current_user, get_prompt_read_access
+from app.api.deps.shards import get_prompt_read_db, get_prompt_write_db
 
-__all__ = ["PromptReadAccess", "get_current_user", "get_prompt_read_access"]
+__all__ = [
+    "PromptReadAccess",
+    "get_current_user",
+    "get_prompt_read_access",
+    "get_prompt_read_db",
+    "get_prompt_write_db",
+    "require_admin",
+]
@@ -5,22 +5,21 @@ from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.orm import Session
 
 from app.core.security import JWTError, decode_access_token, hash_api_key
-from app.dal.api_key_dal import ApiKeyNotFoundError, get_active_key_by_hash, touch_last_used
-from app.dal.auth_dal import get_user_by_id
-from app.db.session import get_db
-from app.models.user import User
+from app.dal.api_key_dal import ApiKeyNotFoundError, get_active_key_row_by_hash, touch_last_used
+from app.dal.auth_dal import UserRow, get_user_row_by_id
+from app.db.session import EDGE_MODE, get_db
 
 bearer_scheme = HTTPBearer(auto_error=False)
 
 
 @dataclass
 class PromptReadAccess:
-    user: User | None
+    user: UserRow | None
     owner_id: int
     source: str
 
 
-def _resolve_user_from_token(db: Session, token: str) -> User:
+def _resolve_user_from_token(db: Session, token: str) -> UserRow:
     try:
         payload = decode_access_token(token)
         subject = payload.get("sub")
@@ -35,7 +34,7 @@ def _resolve_user_from_token(db: Session, token: str) -> User:
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user = get_user_by_id(db, user_id=user_id)
+    user = get_user_row_by_id(db, user_id=user_id)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -49,7 +48,7 @@ def _resolve_user_from_token(db: Session, token: str) -> User:
 def get_current_user(
     credentials: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
     db: Session = Depends(get_db),
-) -> User:
+) -> UserRow:
     if credentials is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -71,15 +70,18 @@ def get_prompt_read_access(
 
     if x_api_key:
         key_hash = hash_api_key(x_api_key)
-        api_key = get_active_key_by_hash(db, key_hash=key_hash)
+        api_key = get_active_key_row_by_hash(db, key_hash=key_hash)
         if api_key is not None:
-            try:
-                touch_last_used(db, key_id=api_key.id)
-            except ApiKeyNotFoundError:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Not authenticated.",
-                )
+            # Edge snapshots hold only keys that were active at export and cannot be
+            # written to, so last use is recorded by the primary alone.
+            if not EDGE_MODE:
+                try:
+                    touch_last_used(db, key_id=api_key.id)
+                except ApiKeyNotFoundError:
+                    raise HTTPException(
+                        status_code=status.HTTP_401_UNAUTHORIZED,
+                        detail="Not authenticated.",
+                    )
             return PromptReadAccess(user=None, owner_id=api_key.user_id, source="api_key")
 
     raise HTTPException(
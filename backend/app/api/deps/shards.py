@@ -0,0 +1,52 @@
+from collections.abc import Generator
+from typing import cast
+
+from fastapi import Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.api.deps.auth import PromptReadAccess, get_current_user, get_prompt_read_access
+from app.dal import shard_dal
+from app.dal.auth_dal import UserRow
+from app.db.session import LazySession, get_db, shard_router
+from app.db.sharding import DEFAULT_SHARD
+
+OWNER_MOVE_RETRY_AFTER_SECONDS = 5
+
+
+def _owner_db(db: Session, owner_id: int, *, writing: bool) -> Generator[Session, None, None]:
+    # Owners on the default shard share the request's session, so unsharded setups and
+    # default-shard owners never check out a second connection.
+    if not shard_router.is_sharded:
+        yield db
+        return
+
+    placement = shard_dal.get_owner_placement(db, owner_id=owner_id)
+    if writing and placement.moving_to is not None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Prompts are being moved to another database. Retry shortly.",
+            headers={"Retry-After": str(OWNER_MOVE_RETRY_AFTER_SECONDS)},
+        )
+    if placement.shard == DEFAULT_SHARD:
+        yield db
+        return
+
+    owner_db = LazySession(shard_router.sessionmaker(placement.shard))
+    try:
+        yield cast(Session, owner_db)
+    finally:
+        owner_db.close()
+
+
+def get_prompt_read_db(
+    access: PromptReadAccess = Depends(get_prompt_read_access),
+    db: Session = Depends(get_db),
+) -> Generator[Session, None, None]:
+    yield from _owner_db(db, access.owner_id, writing=False)
+
+
+def get_prompt_write_db(
+    current_user: UserRow = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> Generator[Session, None, None]:
+    yield from _owner_db(db, current_user.id, writing=True)
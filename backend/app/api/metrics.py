@@ -0,0 +1,22 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core.config import settings
+from app.core.metrics import registry
+from app.core.metrics_multiprocess import WorkerMetricsPublisher
+
+router = APIRouter()
+
+worker_metrics: WorkerMetricsPublisher | None = None
+if settings.METRICS_MULTIPROC_DIR:
+    worker_metrics = WorkerMetricsPublisher(
+        registry,
+        settings.METRICS_MULTIPROC_DIR,
+        interval_seconds=settings.METRICS_PUBLISH_SECONDS,
+    )
+
+
+@router.get("/metrics", include_in_schema=False)
+def get_metrics() -> PlainTextResponse:
+    body = worker_metrics.render() if worker_metrics is not None else registry.render()
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
@@ -0,0 +1,13 @@
+from app.api.middleware.load_shedding import ROUTE_CLASS_LIMITS, LoadSheddingMiddleware
+from app.api.middleware.metrics import MetricsMiddleware
+from app.api.middleware.query_audit import QUERY_BUDGETS, QueryAuditMiddleware
+from app.api.middleware.read_only import ReadOnlyMiddleware
+
+__all__ = [
+    "LoadSheddingMiddleware",
+    "MetricsMiddleware",
+    "QUERY_BUDGETS",
+    "QueryAuditMiddleware",
+    "ReadOnlyMiddleware",
+    "ROUTE_CLASS_LIMITS",
+]
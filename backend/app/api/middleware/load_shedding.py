@@ -0,0 +1,115 @@
+import json
+from time import perf_counter
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.concurrency import AdaptiveLimiter, LimiterConfig
+from app.core.config import settings
+from app.core.metrics import registry
+
+# Caps per route class. Limits start at `initial_limit` and move between the bounds
+# as observed latency crosses the target. Auth targets are loose because password
+# hashing is deliberately slow. Routes outside these classes (health, probes,
+# metrics, admin) are never queued or shed.
+ROUTE_CLASS_LIMITS: dict[str, LimiterConfig] = {
+    "prompt_reads": LimiterConfig(
+        initial_limit=16, min_limit=2, max_limit=64, latency_target_seconds=0.25
+    ),
+    "prompt_writes": LimiterConfig(
+        initial_limit=8, min_limit=1, max_limit=32, latency_target_seconds=1.0
+    ),
+    "auth": LimiterConfig(initial_limit=8, min_limit=1, max_limit=32, latency_target_seconds=1.5),
+}
+
+http_requests_shed_total = registry.counter(
+    "http_requests_shed_total", "Requests rejected with 503 by the concurrency limiter.", ("route_class",)
+)
+http_concurrency_limit = registry.gauge(
+    "http_concurrency_limit", "Current adaptive concurrency limit.", ("route_class",)
+)
+http_requests_queued = registry.gauge(
+    "http_requests_queued", "Requests waiting for a concurrency slot.", ("route_class",)
+)
+
+
+def classify_route(method: str, path: str) -> str | None:
+    prefix = settings.API_V1_PREFIX
+    if path.startswith(f"{prefix}/bundles"):
+        return "prompt_reads"
+    if path.startswith(f"{prefix}/prompts"):
+        # Bulk resolve is a POST only because of its body.
+        if method in ("GET", "HEAD") or path == f"{prefix}/prompts/resolve":
+            return "prompt_reads"
+        return "prompt_writes"
+    if path.startswith(f"{prefix}/auth"):
+        return "auth"
+    return None
+
+
+class LoadSheddingMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self.limiters = {
+            route_class: AdaptiveLimiter(
+                config,
+                max_queue=settings.LOAD_SHEDDING_MAX_QUEUE,
+                queue_timeout_seconds=settings.LOAD_SHEDDING_QUEUE_TIMEOUT_SECONDS,
+            )
+            for route_class, config in ROUTE_CLASS_LIMITS.items()
+        }
+        registry.add_collector(self._collect)
+
+    def _collect(self) -> None:
+        for route_class, limiter in self.limiters.items():
+            http_concurrency_limit.set(route_class, value=int(limiter.limit))
+            http_requests_queued.set(route_class, value=limiter.queued)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        route_class = classify_route(scope["method"], scope["path"])
+        if route_class is None:
+            await self.app(scope, receive, send)
+            return
+
+        limiter = self.limiters[route_class]
+        if not await limiter.acquire():
+            http_requests_shed_total.inc(route_class)
+            await self._reject(send)
+            return
+
+        status_code = 500
+        retry_after = False
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code, retry_after
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                retry_after = any(name.lower() == b"retry-after" for name, _ in message["headers"])
+            await send(message)
+
+        started = perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # A 503 with Retry-After is a deliberate "come back later" (an owner whose
+            # prompts are moving shards), not a sign of overload.
+            overloaded = status_code >= 500 and not (status_code == 503 and retry_after)
+            limiter.release(perf_counter() - started, overloaded=overloaded)
+
+    async def _reject(self, send: Send) -> None:
+        body = json.dumps({"detail": "Server is overloaded. Retry later."}).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 503,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode("latin-1")),
+                    (b"retry-after", str(settings.LOAD_SHEDDING_RETRY_AFTER_SECONDS).encode("latin-1")),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
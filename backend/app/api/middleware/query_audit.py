@@ -0,0 +1,75 @@
+import logging
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.db.query_log import start_request_query_log
+
+logger = logging.getLogger(__name__)
+
+# Maximum SQL statements per request, keyed by method and route template. Counts
+# include auth (user lookup, or API key lookup plus last-used update). Each is the count
+# measured by benchmarks.query_budgets, the higher of full and delta storage: delta adds a
+# chain read wherever an older version's text is rebuilt or re-encoded.
+QUERY_BUDGETS: dict[tuple[str, str], int] = {
+    ("GET", "/api/v1/health"): 1,
+    ("POST", "/api/v1/auth/register"): 4,
+    ("POST", "/api/v1/auth/login"): 1,
+    ("GET", "/api/v1/auth/me"): 1,
+    ("GET", "/api/v1/auth/api-keys"): 2,
+    ("POST", "/api/v1/auth/api-keys"): 5,
+    ("DELETE", "/api/v1/auth/api-keys/{key_id}"): 3,
+    ("GET", "/api/v1/prompts"): 4,
+    ("GET", "/api/v1/prompts/summary"): 3,
+    ("GET", "/api/v1/prompts/archive"): 3,
+    ("POST", "/api/v1/prompts"): 4,
+    ("PUT", "/api/v1/prompts/{prompt_version_id}"): 8,
+    ("DELETE", "/api/v1/prompts/{prompt_version_id}"): 6,
+    ("POST", "/api/v1/prompts/versions/delete"): 6,
+    ("DELETE", "/api/v1/prompts/{prompt_id}/versions"): 2,
+    ("GET", "/api/v1/retention-policies"): 2,
+    ("PUT", "/api/v1/retention-policies"): 4,
+    ("DELETE", "/api/v1/retention-policies/{policy_id}"): 3,
+}
+
+REPEATED_STATEMENT_THRESHOLD = 3
+
+
+class QueryAuditMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        log = start_request_query_log()
+
+        async def send_with_query_count(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-query-count", str(log.count).encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_with_query_count)
+
+        method = scope["method"]
+        route = getattr(scope.get("route"), "path", None)
+        if route is None:
+            return
+
+        budget = QUERY_BUDGETS.get((method, route))
+        if budget is not None and log.count > budget:
+            logger.warning(
+                "%s %s issued %d SQL statements (budget %d).", method, route, log.count, budget
+            )
+
+        for statement, occurrences in log.repeated(REPEATED_STATEMENT_THRESHOLD).items():
+            logger.warning(
+                "%s %s ran the same statement %d times (possible N+1): %s",
+                method,
+                route,
+                occurrences,
+                " ".join(statement.split()),
+            )
@@ -0,0 +1,43 @@
+import json
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+def is_read_request(method: str, path: str) -> bool:
+    # Bulk resolve is a POST only because of its body.
+    return method in READ_METHODS or path == f"{settings.API_V1_PREFIX}/prompts/resolve"
+
+
+class ReadOnlyMiddleware:
+    # Edge nodes serve a snapshot file that only the export job writes, so anything that
+    # would change data is turned away before it reaches a route.
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or is_read_request(scope["method"], scope["path"]):
+            await self.app(scope, receive, send)
+            return
+        await self._reject(send)
+
+    async def _reject(self, send: Send) -> None:
+        body = json.dumps({"detail": "Read-only edge node. Send writes to the primary."}).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 405,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode("latin-1")),
+                    (b"allow", b"GET, HEAD, OPTIONS"),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+
+__all__ = ["ReadOnlyMiddleware", "is_read_request"]
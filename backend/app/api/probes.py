@@ -0,0 +1,27 @@
+from dataclasses import asdict
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from app.db.session import readiness_probe
+from app.schemas.health import LivenessResponse, ReadinessResponse
+
+router = APIRouter()
+
+NO_STORE = {"Cache-Control": "no-store"}
+
+
+# Both probes are async and do no I/O, so they are answered on the event loop even
+# when the threadpool and the connection pool are saturated.
+@router.get("/livez", response_model=LivenessResponse, include_in_schema=False)
+async def get_liveness() -> JSONResponse:
+    return JSONResponse({"status": "ok"}, headers=NO_STORE)
+
+
+@router.get("/readyz", response_model=ReadinessResponse, include_in_schema=False)
+async def get_readiness() -> JSONResponse:
+    ready = readiness_probe.is_ready()
+    body = ReadinessResponse(status="ok" if ready else "unavailable", **asdict(readiness_probe.status))
+    return JSONResponse(
+        body.model_dump(mode="json"), status_code=200 if ready else 503, headers=NO_STORE
+    )
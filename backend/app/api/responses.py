@@ -0,0 +1,38 @@
+import hashlib
+from typing import Any
+
+import orjson
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+
+
+def _dumps(content: Any) -> bytes:
+    # Matches Pydantic's JSON output for UTC datetimes ("...Z") so both paths agree.
+    # SQLite, including edge snapshots, returns the stored UTC times without an offset.
+    return orjson.dumps(content, option=orjson.OPT_UTC_Z | orjson.OPT_NAIVE_UTC)
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return _dumps(content)
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def conditional_json_response(request: Request, content: Any) -> Response:
+    # The ETag is a hash of the rendered body, so it changes exactly when the response
+    # would. Clients that send it back get an empty 304 instead of the full list.
+    body = _dumps(content)
+    etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+__all__ = ["FastJSONResponse", "conditional_json_response", "etag_matches"]
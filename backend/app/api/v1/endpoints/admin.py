@@ -0,0 +1,20 @@
+from dataclasses import asdict
+
+from fastapi import APIRouter, Depends, Response, status
+
+from app.api.deps.admin import require_admin
+from app.db.session import slow_query_log
+from app.schemas.admin import SlowQueryResponse
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+
+@router.get("/slow-queries", response_model=list[SlowQueryResponse])
+def get_slow_queries() -> list[SlowQueryResponse]:
+    return [SlowQueryResponse(**asdict(entry)) for entry in slow_query_log.entries()]
+
+
+@router.delete("/slow-queries", status_code=status.HTTP_204_NO_CONTENT)
+def clear_slow_queries() -> Response:
+    slow_query_log.clear()
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -20,7 +20,13 @@ from app.dal.api_key_dal import (
     list_user_api_keys,
     revoke_user_api_key,
 )
-from app.dal.auth_dal import InvalidCredentialsError, UserAlreadyExistsError, authenticate_user, create_user
+from app.dal.auth_dal import (
+    InvalidCredentialsError,
+    UserAlreadyExistsError,
+    UserRow,
+    authenticate_user,
+    create_user,
+)
 from app.db.session import get_db
 from app.models.user_api_key import UserApiKey
 from app.models.user import User
@@ -37,7 +43,7 @@ from app.schemas.auth import (
 router = APIRouter()
 
 
-def _to_user_response(user: User) -> UserResponse:
+def _to_user_response(user: User | UserRow) -> UserResponse:
     return UserResponse(id=user.id, email=user.email, created_at=user.created_at)
 
 
@@ -84,13 +90,13 @@ def login_user(payload: LoginRequest, db: Session = Depends(get_db)) -> TokenRes
 
 
 @router.get("/me", response_model=UserResponse)
-def get_me(current_user: User = Depends(get_current_user)) -> UserResponse:
+def get_me(current_user: UserRow = Depends(get_current_user)) -> UserResponse:
     return _to_user_response(current_user)
 
 
 @router.get("/api-keys", response_model=list[ApiKeyMetadataResponse])
 def get_api_keys(
-    current_user: User = Depends(get_current_user),
+    current_user: UserRow = Depends(get_current_user),
     db: Session = Depends(get_db),
 ) -> list[ApiKeyMetadataResponse]:
     api_keys = list_user_api_keys(db, user_id=current_user.id)
@@ -100,7 +106,7 @@ def get_api_keys(
 @router.post("/api-keys", response_model=ApiKeyCreateResponse, status_code=status.HTTP_201_CREATED)
 def create_api_key(
     payload: ApiKeyCreateRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: UserRow = Depends(get_current_user),
     db: Session = Depends(get_db),
 ) -> ApiKeyCreateResponse:
     raw_api_key = generate_api_key()
@@ -136,7 +142,7 @@ def create_api_key(
 @router.delete("/api-keys/{key_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_api_key(
     key_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: UserRow = Depends(get_current_user),
     db: Session = Depends(get_db),
 ) -> None:
     try:
@@ -0,0 +1,55 @@
+from urllib.parse import urlencode
+
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response
+from fastapi.responses import FileResponse
+from sqlalchemy.orm import Session
+
+from app.api.deps.auth import PromptReadAccess, get_prompt_read_access
+from app.api.deps.shards import get_prompt_read_db
+from app.api.responses import conditional_json_response, etag_matches
+from app.core.config import settings
+from app.dal import bundle_dal
+from app.schemas.bundle import ReleaseBundleResponse
+
+router = APIRouter()
+
+# Bundles are content-addressed and never rewritten, so a cached copy never goes stale.
+IMMUTABLE_CACHE_CONTROL = "private, max-age=31536000, immutable"
+
+
+@router.get("", response_model=ReleaseBundleResponse)
+def get_release_bundle(
+    request: Request,
+    tag: str = Query(..., min_length=1, max_length=64, description="Tag to bundle."),
+    access: PromptReadAccess = Depends(get_prompt_read_access),
+    db: Session = Depends(get_prompt_read_db),
+) -> Response:
+    pointer = bundle_dal.get_release_bundle(db, owner_id=access.owner_id, tag=tag)
+    return conditional_json_response(
+        request,
+        {
+            "tag": pointer.tag,
+            "digest": pointer.digest,
+            "prompt_count": pointer.prompt_count,
+            "built_at": pointer.built_at,
+            # The tag lets a node that does not have the file build it on download.
+            "url": f"{settings.API_V1_PREFIX}/bundles/{pointer.digest}?{urlencode({'tag': tag})}",
+        },
+    )
+
+
+@router.get("/{digest}")
+def download_release_bundle(
+    request: Request,
+    digest: str = Path(..., pattern="^[0-9a-f]{64}$"),
+    tag: str | None = Query(None, min_length=1, max_length=64, description="Bundle's tag."),
+    access: PromptReadAccess = Depends(get_prompt_read_access),
+    db: Session = Depends(get_prompt_read_db),
+) -> Response:
+    headers = {"ETag": f'"{digest}"', "Cache-Control": IMMUTABLE_CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    path = bundle_dal.find_release_bundle(db, owner_id=access.owner_id, digest=digest, tag=tag)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Release bundle not found.")
+    return FileResponse(path, media_type="application/json", headers=headers)
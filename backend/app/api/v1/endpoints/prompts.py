@@ -1,68 +1,170 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
 
 from app.api.deps.auth import PromptReadAccess, get_current_user, get_prompt_read_access
-from app.dal import prompt_dal
-from app.db.session import get_db
+from app.api.deps.shards import get_prompt_read_db, get_prompt_write_db
+from app.api.responses import FastJSONResponse, conditional_json_response
+from app.dal import prompt_dal, retention_dal
+from app.dal.auth_dal import UserRow
 from app.models.prompt import PromptVersion
-from app.models.user import User
 from app.schemas.prompt import (
+    MAX_ARCHIVED_VERSIONS_PER_PAGE,
+    MAX_PROMPTS_PER_SUMMARY_PAGE,
+    ArchivedPromptVersionResponse,
     PromptCreateRequest,
     PromptLookupQuery,
+    PromptResolution,
+    PromptResolveRequest,
+    PromptSummaryPage,
     PromptUpdateRequest,
+    PromptVersionBulkDeleteRequest,
+    PromptVersionBulkDeleteResponse,
     PromptVersionResponse,
+    parse_metadata_filters,
 )
 
 router = APIRouter()
 
 
-def _to_prompt_response(
-    prompt_version: PromptVersion, explicit_tag: str | None = None
-) -> PromptVersionResponse:
-    resolved_tag = explicit_tag
-    if resolved_tag is None and prompt_version.tags:
-        resolved_tag = prompt_version.tags[0].name
-
-    return PromptVersionResponse(
-        id=prompt_version.id,
-        prompt_id=prompt_version.prompt_id,
-        name=prompt_version.prompt.name,
-        content=prompt_version.content,
-        version=prompt_version.version,
-        tag=resolved_tag,
-        created_at=prompt_version.created_at,
-        updated_at=prompt_version.updated_at,
-    )
+def _to_prompt_row(prompt_version: PromptVersion) -> dict[str, Any]:
+    return {
+        "id": prompt_version.id,
+        "prompt_id": prompt_version.prompt_id,
+        "name": prompt_version.prompt.name,
+        "content": prompt_version.content,
+        "version": prompt_version.version,
+        "tag": prompt_version.tags[0] if prompt_version.tags else None,
+        "tags": prompt_version.tags,
+        "metadata": prompt_version.metadata_,
+        "created_at": prompt_version.created_at,
+        "updated_at": prompt_version.updated_at,
+    }
+
+
+def _to_prompt_response(prompt_version: PromptVersion) -> PromptVersionResponse:
+    return PromptVersionResponse(**_to_prompt_row(prompt_version))
 
 
 @router.get("", response_model=list[PromptVersionResponse])
 def get_prompts(
+    request: Request,
     name: str | None = Query(None, description="Optional prompt name filter"),
     tag: str | None = Query(None, description="Optional prompt tag"),
+    tags_any: list[str] | None = Query(
+        None, description="Match versions carrying any of these tags (repeatable)."
+    ),
+    tags_all: list[str] | None = Query(
+        None, description="Match versions carrying all of these tags (repeatable)."
+    ),
     latest: bool = Query(False, description="Return only the latest matching version."),
     limit: int | None = Query(
         None, ge=1, le=100, description="Optional max number of matching versions."
     ),
     access: PromptReadAccess = Depends(get_prompt_read_access),
-    db: Session = Depends(get_db),
-) -> list[PromptVersionResponse]:
-    lookup = PromptLookupQuery(name=name, tag=tag)
+    db: Session = Depends(get_prompt_read_db),
+) -> Response:
+    # `metadata.<key>[.<key>...]=<value>` parameters are open-ended, so they are read
+    # from the raw query string instead of being declared.
+    try:
+        metadata = parse_metadata_filters(request.query_params.multi_items())
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+
+    try:
+        lookup = PromptLookupQuery(
+            name=name, tag=tag, tags_any=tags_any, tags_all=tags_all, metadata=metadata
+        )
+    except ValidationError as exc:
+        raise HTTPException(
+            status_code=422, detail=exc.errors(include_url=False, include_context=False)
+        )
     resolved_limit = 1 if latest else limit
-    prompt_versions = prompt_dal.get_prompt_versions(
+    rows = prompt_dal.get_prompt_version_rows(
         db,
         name=lookup.name,
         tag=lookup.tag,
         owner_id=access.owner_id,
         limit=resolved_limit,
+        metadata=lookup.metadata,
+        tags_any=lookup.tags_any,
+        tags_all=lookup.tags_all,
+    )
+    # Rows are built from trusted DB values, so skip per-row model validation and
+    # FastAPI's response_model pass; response_model still drives the OpenAPI schema.
+    return conditional_json_response(request, [row._asdict() for row in rows])
+
+
+@router.post("/resolve", response_model=list[PromptResolution])
+def resolve_prompts(
+    payload: PromptResolveRequest,
+    access: PromptReadAccess = Depends(get_prompt_read_access),
+    db: Session = Depends(get_prompt_read_db),
+) -> Response:
+    selectors = [(selector.name, selector.tag) for selector in payload.prompts]
+    rows = prompt_dal.get_latest_prompt_version_rows(
+        db, owner_id=access.owner_id, selectors=selectors
+    )
+    return FastJSONResponse(
+        [
+            {
+                "name": name,
+                "tag": tag,
+                "prompt": row._asdict() if (row := rows.get((name, tag))) is not None else None,
+            }
+            for name, tag in selectors
+        ]
+    )
+
+
+@router.get("/summary", response_model=PromptSummaryPage)
+def get_prompt_summary(
+    request: Request,
+    cursor: str | None = Query(
+        None, max_length=255, description="`next_cursor` from the previous page."
+    ),
+    limit: int = Query(100, ge=1, le=MAX_PROMPTS_PER_SUMMARY_PAGE),
+    access: PromptReadAccess = Depends(get_prompt_read_access),
+    db: Session = Depends(get_prompt_read_db),
+) -> Response:
+    # One row more than asked for tells whether another page follows.
+    rows = prompt_dal.get_prompt_summaries(
+        db, owner_id=access.owner_id, after=cursor, limit=limit + 1
+    )
+    items = rows[:limit]
+    return conditional_json_response(
+        request,
+        {
+            "items": [row._asdict() for row in items],
+            "next_cursor": items[-1].name if len(rows) > limit else None,
+        },
+    )
+
+
+@router.get("/archive", response_model=list[ArchivedPromptVersionResponse])
+def get_archived_versions(
+    name: str = Query(..., min_length=1, max_length=255),
+    before_version: int | None = Query(
+        None, ge=1, description="Return versions older than this one, newest first."
+    ),
+    limit: int = Query(20, ge=1, le=MAX_ARCHIVED_VERSIONS_PER_PAGE),
+    access: PromptReadAccess = Depends(get_prompt_read_access),
+    db: Session = Depends(get_prompt_read_db),
+) -> Response:
+    # Archived versions are read rarely, so they bypass the DAL cache.
+    rows = retention_dal.get_archived_version_rows(
+        db, owner_id=access.owner_id, name=name, before_version=before_version, limit=limit
     )
-    return [_to_prompt_response(version, lookup.tag) for version in prompt_versions]
+    return FastJSONResponse([row._asdict() for row in rows])
 
 
 @router.post("", response_model=PromptVersionResponse, status_code=201)
 def create_prompt(
     payload: PromptCreateRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: UserRow = Depends(get_current_user),
+    db: Session = Depends(get_prompt_write_db),
 ) -> PromptVersionResponse:
     prompt_version = prompt_dal.create_prompt_version(
         db,
@@ -70,19 +172,21 @@ def create_prompt(
         name=payload.name,
         content=payload.content,
         tag=payload.tag,
+        tags=payload.tags,
+        metadata=payload.metadata,
     )
-    return _to_prompt_response(prompt_version)
+    return PromptVersionResponse(**prompt_version._asdict())
 
 
 @router.put("/{prompt_version_id}", response_model=PromptVersionResponse)
 def update_prompt_version(
     prompt_version_id: int,
     payload: PromptUpdateRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: UserRow = Depends(get_current_user),
+    db: Session = Depends(get_prompt_write_db),
 ) -> PromptVersionResponse:
     try:
-        prompt_version, explicit_tag = prompt_dal.update_prompt_version(
+        prompt_version = prompt_dal.update_prompt_version(
             db,
             owner_id=current_user.id,
             prompt_version_id=prompt_version_id,
@@ -90,17 +194,21 @@ def update_prompt_version(
             tag=payload.tag,
             content_is_set="content" in payload.model_fields_set,
             tag_is_set="tag" in payload.model_fields_set,
+            tags=payload.tags,
+            tags_is_set="tags" in payload.model_fields_set,
+            add_tags=payload.add_tags,
+            remove_tags=payload.remove_tags,
         )
     except prompt_dal.PromptVersionNotFoundError:
         raise HTTPException(status_code=404, detail="Prompt version not found.")
-    return _to_prompt_response(prompt_version, explicit_tag)
+    return _to_prompt_response(prompt_version)
 
 
 @router.delete("/{prompt_version_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_prompt_version(
     prompt_version_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: UserRow = Depends(get_current_user),
+    db: Session = Depends(get_prompt_write_db),
 ) -> Response:
     try:
         prompt_dal.delete_prompt_version(
@@ -111,3 +219,30 @@ def delete_prompt_version(
     except prompt_dal.PromptVersionNotFoundError:
         raise HTTPException(status_code=404, detail="Prompt version not found.")
     return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.post("/versions/delete", response_model=PromptVersionBulkDeleteResponse)
+def delete_prompt_versions(
+    payload: PromptVersionBulkDeleteRequest,
+    current_user: UserRow = Depends(get_current_user),
+    db: Session = Depends(get_prompt_write_db),
+) -> PromptVersionBulkDeleteResponse:
+    deleted = prompt_dal.delete_prompt_versions(
+        db, owner_id=current_user.id, prompt_version_ids=payload.ids
+    )
+    return PromptVersionBulkDeleteResponse(deleted=deleted)
+
+
+# `/{prompt_version_id}` already names a version, so a whole prompt is addressed through
+# its versions collection.
+@router.delete("/{prompt_id}/versions", status_code=status.HTTP_204_NO_CONTENT)
+def delete_prompt(
+    prompt_id: int,
+    current_user: UserRow = Depends(get_current_user),
+    db: Session = Depends(get_prompt_write_db),
+) -> Response:
+    try:
+        prompt_dal.delete_prompt(db, owner_id=current_user.id, prompt_id=prompt_id)
+    except prompt_dal.PromptNotFoundError:
+        raise HTTPException(status_code=404, detail="Prompt not found.")
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
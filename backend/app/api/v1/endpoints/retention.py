@@ -0,0 +1,71 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.api.deps.auth import get_current_user
+from app.dal.auth_dal import UserRow
+from app.dal.retention_dal import (
+    RetentionPolicyConflictError,
+    RetentionPolicyNotFoundError,
+    delete_retention_policy,
+    list_retention_policies,
+    set_retention_policy,
+)
+from app.db.session import get_db
+from app.models.retention_policy import RetentionPolicy
+from app.schemas.retention import RetentionPolicyRequest, RetentionPolicyResponse
+
+router = APIRouter()
+
+
+def _to_retention_policy_response(policy: RetentionPolicy) -> RetentionPolicyResponse:
+    return RetentionPolicyResponse(
+        id=policy.id,
+        prompt_name=policy.prompt_name,
+        keep_last=policy.keep_last,
+        keep_tagged=policy.keep_tagged,
+        keep_days=policy.keep_days,
+        updated_at=policy.updated_at,
+    )
+
+
+# Policies live in the default database with the owner directory, whatever shard holds
+# the owner's prompts.
+@router.get("", response_model=list[RetentionPolicyResponse])
+def get_retention_policies(
+    current_user: UserRow = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> list[RetentionPolicyResponse]:
+    policies = list_retention_policies(db, owner_id=current_user.id)
+    return [_to_retention_policy_response(policy) for policy in policies]
+
+
+@router.put("", response_model=RetentionPolicyResponse)
+def put_retention_policy(
+    payload: RetentionPolicyRequest,
+    current_user: UserRow = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> RetentionPolicyResponse:
+    try:
+        policy = set_retention_policy(
+            db,
+            owner_id=current_user.id,
+            prompt_name=payload.prompt_name,
+            keep_last=payload.keep_last,
+            keep_tagged=payload.keep_tagged,
+            keep_days=payload.keep_days,
+        )
+    except RetentionPolicyConflictError:
+        raise HTTPException(status_code=409, detail="Retention policy was changed concurrently.")
+    return _to_retention_policy_response(policy)
+
+
+@router.delete("/{policy_id}", status_code=status.HTTP_204_NO_CONTENT)
+def remove_retention_policy(
+    policy_id: int,
+    current_user: UserRow = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> None:
+    try:
+        delete_retention_policy(db, owner_id=current_user.id, policy_id=policy_id)
+    except RetentionPolicyNotFoundError:
+        raise HTTPException(status_code=404, detail="Retention policy not found.")
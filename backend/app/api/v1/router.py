@@ -1,10 +1,18 @@
 from fastapi import APIRouter
 
+from app.api.v1.endpoints.admin import router as admin_router
 from app.api.v1.endpoints.auth import router as auth_router
+from app.api.v1.endpoints.bundles import router as bundles_router
 from app.api.v1.endpoints.health import router as health_router
 from app.api.v1.endpoints.prompts import router as prompts_router
+from app.api.v1.endpoints.retention import router as retention_router
 
 api_router = APIRouter()
 api_router.include_router(health_router, tags=["health"])
 api_router.include_router(auth_router, prefix="/auth", tags=["auth"])
 api_router.include_router(prompts_router, prefix="/prompts", tags=["prompts"])
+api_router.include_router(bundles_router, prefix="/bundles", tags=["bundles"])
+api_router.include_router(
+    retention_router, prefix="/retention-policies", tags=["retention"]
+)
+api_router.include_router(admin_router, prefix="/admin", tags=["admin"])
@@ -0,0 +1,94 @@
+import hashlib
+import json
+import os
+import tempfile
+from contextlib import suppress
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+import orjson
+
+BUNDLE_FORMAT = 1
+
+
+@dataclass(frozen=True)
+class BundlePointer:
+    # Which artifact is current for an (owner, tag), plus the state it was built from.
+    tag: str
+    digest: str
+    prompt_count: int
+    built_at: str
+    # Hash of the (prompt, version id, updated_at) stamps the bundle was built from.
+    source_digest: str
+    # Earlier bundles of the tag still on disk, newest first.
+    history: list[str] = field(default_factory=list)
+
+
+def render_bundle(owner_id: int, tag: str, prompts: list[dict[str, Any]]) -> tuple[str, bytes]:
+    # Only the prompts go into the body, never build times, so the same tagged state
+    # always renders the same bytes and the same digest.
+    body = orjson.dumps(
+        {"format": BUNDLE_FORMAT, "owner_id": owner_id, "tag": tag, "prompts": prompts},
+        option=orjson.OPT_UTC_Z,
+    )
+    return hashlib.sha256(body).hexdigest(), body
+
+
+class BundleStore:
+    # <root>/<owner_id>/<digest>.json        immutable bundles, never rewritten
+    # <root>/<owner_id>/tags/<tag hash>.json  pointer to the current bundle for a tag
+    def __init__(self, root: str | os.PathLike[str]) -> None:
+        self.root = Path(root)
+
+    def bundle_path(self, owner_id: int, digest: str) -> Path:
+        return self.root / str(owner_id) / f"{digest}.json"
+
+    def _pointer_path(self, owner_id: int, tag: str) -> Path:
+        # Tags may contain any character, so the file is named after a hash of the tag.
+        name = hashlib.sha256(tag.encode()).hexdigest()[:32]
+        return self.root / str(owner_id) / "tags" / f"{name}.json"
+
+    def read_bundle(self, owner_id: int, digest: str) -> dict[str, Any] | None:
+        try:
+            return orjson.loads(self.bundle_path(owner_id, digest).read_bytes())
+        except (OSError, orjson.JSONDecodeError):
+            return None
+
+    def write_bundle(self, owner_id: int, digest: str, body: bytes) -> None:
+        path = self.bundle_path(owner_id, digest)
+        if not path.exists():
+            self._write_atomic(path, body)
+
+    def delete_bundle(self, owner_id: int, digest: str) -> None:
+        self.bundle_path(owner_id, digest).unlink(missing_ok=True)
+
+    def read_pointer(self, owner_id: int, tag: str) -> BundlePointer | None:
+        try:
+            pointer = BundlePointer(**json.loads(self._pointer_path(owner_id, tag).read_text()))
+        except (OSError, ValueError, TypeError):
+            return None
+        return pointer if pointer.tag == tag else None
+
+    def write_pointer(self, owner_id: int, pointer: BundlePointer) -> None:
+        self._write_atomic(
+            self._pointer_path(owner_id, pointer.tag), json.dumps(asdict(pointer)).encode()
+        )
+
+    def _write_atomic(self, path: Path, payload: bytes) -> None:
+        # Readers see either the old file or the complete new one, never a partial write.
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                tmp.write(payload)
+                tmp.flush()
+                os.fsync(tmp.fileno())
+            os.replace(tmp_name, path)
+        except BaseException:
+            with suppress(OSError):
+                os.unlink(tmp_name)
+            raise
+
+
+__all__ = ["BUNDLE_FORMAT", "BundlePointer", "BundleStore", "render_bundle"]
@@ -0,0 +1,89 @@
+import asyncio
+from collections import deque
+from contextlib import suppress
+from dataclasses import dataclass
+from time import monotonic
+
+
+@dataclass(frozen=True)
+class LimiterConfig:
+    initial_limit: int
+    min_limit: int
+    max_limit: int
+    latency_target_seconds: float
+
+
+class AdaptiveLimiter:
+    # AIMD: every request that finishes within the latency target grows the limit by
+    # 1/limit (about +1 per limit's worth of requests); a slow or failed request
+    # shrinks it by `backoff`, at most once per target interval so a burst of slow
+    # completions counts as one congestion signal.
+    def __init__(
+        self,
+        config: LimiterConfig,
+        *,
+        max_queue: int,
+        queue_timeout_seconds: float,
+        backoff: float = 0.9,
+    ) -> None:
+        self.config = config
+        self.max_queue = max_queue
+        self.queue_timeout_seconds = queue_timeout_seconds
+        self.backoff = backoff
+        self.limit = float(config.initial_limit)
+        self.in_flight = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self._last_decrease = 0.0
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> bool:
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            return True
+        if len(self._waiters) >= self.max_queue:
+            return False
+
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout_seconds)
+        except asyncio.TimeoutError:
+            with suppress(ValueError):
+                self._waiters.remove(waiter)
+            return False
+        except asyncio.CancelledError:
+            with suppress(ValueError):
+                self._waiters.remove(waiter)
+            # The slot may have been handed over just before the client went away.
+            if waiter.done() and not waiter.cancelled():
+                self.in_flight -= 1
+                self._wake()
+            raise
+        return True
+
+    def release(self, latency_seconds: float, *, overloaded: bool = False) -> None:
+        self.in_flight -= 1
+        config = self.config
+        if overloaded or latency_seconds > config.latency_target_seconds:
+            now = monotonic()
+            if now - self._last_decrease >= config.latency_target_seconds:
+                self._last_decrease = now
+                self.limit = max(float(config.min_limit), self.limit * self.backoff)
+        else:
+            self.limit = min(float(config.max_limit), self.limit + 1 / self.limit)
+        self._wake()
+
+    def _wake(self) -> None:
+        # Slots are handed to waiters directly, so a new arrival cannot jump the queue.
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self.in_flight += 1
+            waiter.set_result(None)
+
+
+__all__ = ["AdaptiveLimiter", "LimiterConfig"]
@@ -18,6 +18,87 @@ class Settings:
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = int(
         os.getenv("JWT_ACCESS_TOKEN_EXPIRE_MINUTES", "1440")
     )
+    DB_QUERY_CACHE_SIZE: int = int(os.getenv("DB_QUERY_CACHE_SIZE", "500"))
+    DB_PREPARE_THRESHOLD: int | None = (
+        None
+        if os.getenv("DB_PREPARE_THRESHOLD", "5").strip().lower() in ("", "none")
+        else int(os.getenv("DB_PREPARE_THRESHOLD", "5"))
+    )
+    DB_PGBOUNCER: bool = os.getenv("DB_PGBOUNCER", "false").strip().lower() == "true"
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").strip().lower() == "true"
+    # Shared by the processes of one server so /metrics adds up every worker; gunicorn sets
+    # a default, a single uvicorn process needs none.
+    METRICS_MULTIPROC_DIR: str = os.getenv("METRICS_MULTIPROC_DIR", "").strip()
+    METRICS_PUBLISH_SECONDS: float = float(os.getenv("METRICS_PUBLISH_SECONDS", "1"))
+    QUERY_AUDIT: bool = os.getenv("QUERY_AUDIT", "false").strip().lower() == "true"
+    SLOW_QUERY_LOG_ENABLED: bool = (
+        os.getenv("SLOW_QUERY_LOG_ENABLED", "false").strip().lower() == "true"
+    )
+    SLOW_QUERY_THRESHOLD_MS: float = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))
+    SLOW_QUERY_LOG_SIZE: int = int(os.getenv("SLOW_QUERY_LOG_SIZE", "100"))
+    SLOW_QUERY_EXPLAIN: bool = os.getenv("SLOW_QUERY_EXPLAIN", "true").strip().lower() == "true"
+    ADMIN_TOKEN: str = os.getenv("ADMIN_TOKEN", "")
+    LOAD_SHEDDING_ENABLED: bool = (
+        os.getenv("LOAD_SHEDDING_ENABLED", "true").strip().lower() == "true"
+    )
+    LOAD_SHEDDING_MAX_QUEUE: int = int(os.getenv("LOAD_SHEDDING_MAX_QUEUE", "64"))
+    LOAD_SHEDDING_QUEUE_TIMEOUT_SECONDS: float = float(
+        os.getenv("LOAD_SHEDDING_QUEUE_TIMEOUT_SECONDS", "2")
+    )
+    LOAD_SHEDDING_RETRY_AFTER_SECONDS: int = int(
+        os.getenv("LOAD_SHEDDING_RETRY_AFTER_SECONDS", "1")
+    )
+    SERVER_HOST: str = os.getenv("SERVER_HOST", "0.0.0.0")
+    SERVER_PORT: int = int(os.getenv("SERVER_PORT", "8000"))
+    WEB_CONCURRENCY: int = int(os.getenv("WEB_CONCURRENCY", str(os.cpu_count() or 1)))
+    SERVER_KEEPALIVE_SECONDS: int = int(os.getenv("SERVER_KEEPALIVE_SECONDS", "5"))
+    SERVER_BACKLOG: int = int(os.getenv("SERVER_BACKLOG", "2048"))
+    SERVER_GRACEFUL_TIMEOUT_SECONDS: int = int(os.getenv("SERVER_GRACEFUL_TIMEOUT_SECONDS", "30"))
+    STARTUP_WARMUP: bool = os.getenv("STARTUP_WARMUP", "true").strip().lower() == "true"
+    DB_WARMUP_CONNECTIONS: int = int(os.getenv("DB_WARMUP_CONNECTIONS", "5"))
+    READINESS_PROBE_INTERVAL_SECONDS: float = float(
+        os.getenv("READINESS_PROBE_INTERVAL_SECONDS", "5")
+    )
+    READINESS_PROBE_TIMEOUT_SECONDS: float = float(
+        os.getenv("READINESS_PROBE_TIMEOUT_SECONDS", "2")
+    )
+    CACHE_ENABLED: bool = os.getenv("CACHE_ENABLED", "true").strip().lower() == "true"
+    CACHE_TTL_SECONDS: float = float(os.getenv("CACHE_TTL_SECONDS", "30"))
+    CACHE_MAX_ENTRIES: int = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+    # "postgres", "memory", or empty to pick postgres on a PostgreSQL database.
+    CACHE_INVALIDATION_BUS: str = os.getenv("CACHE_INVALIDATION_BUS", "").strip().lower()
+    # LISTEN needs a session-level connection; point this past PgBouncer transaction pooling.
+    CACHE_INVALIDATION_DATABASE_URL: str = (
+        os.getenv("CACHE_INVALIDATION_DATABASE_URL", "").strip() or DATABASE_URL
+    )
+    PROMPT_READ_COALESCING: bool = (
+        os.getenv("PROMPT_READ_COALESCING", "true").strip().lower() == "true"
+    )
+    PROMPT_READ_COALESCE_TIMEOUT_SECONDS: float = float(
+        os.getenv("PROMPT_READ_COALESCE_TIMEOUT_SECONDS", "5")
+    )
+    RELEASE_BUNDLE_DIR: str = os.getenv("RELEASE_BUNDLE_DIR", "var/release-bundles")
+    # Bundles kept per tag, the current one included; older files are deleted.
+    RELEASE_BUNDLE_KEEP: int = max(1, int(os.getenv("RELEASE_BUNDLE_KEEP", "5")))
+    PROMPT_VERSION_STORAGE: str = os.getenv("PROMPT_VERSION_STORAGE", "full")
+    PROMPT_VERSION_SNAPSHOT_INTERVAL: int = int(
+        os.getenv("PROMPT_VERSION_SNAPSHOT_INTERVAL", "16")
+    )
+    # Extra owner shards as "name=url,name=url". DATABASE_URL is the "default" shard and
+    # also holds users, API keys and the owner -> shard directory.
+    DATABASE_SHARDS: dict[str, str] = dict(
+        (name.strip(), url.strip())
+        for name, _, url in (
+            entry.partition("=") for entry in os.getenv("DATABASE_SHARDS", "").split(",")
+        )
+        if name.strip()
+    )
+    # Set on edge nodes: serve reads from this exported SQLite file instead of DATABASE_URL.
+    EDGE_SNAPSHOT_PATH: str = os.getenv("EDGE_SNAPSHOT_PATH", "").strip()
+    EDGE_SNAPSHOT_MMAP_BYTES: int = int(
+        os.getenv("EDGE_SNAPSHOT_MMAP_BYTES", str(256 * 1024 * 1024))
+    )
+    EDGE_SNAPSHOT_POLL_SECONDS: float = float(os.getenv("EDGE_SNAPSHOT_POLL_SECONDS", "5"))
 
 
 settings = Settings()
@@ -0,0 +1,33 @@
+import json
+from difflib import SequenceMatcher
+
+
+def encode_delta(base: str, target: str) -> str:
+    # `[start, end]` copies a slice of base lines; a string inserts literal text.
+    base_lines = base.splitlines(keepends=True)
+    target_lines = target.splitlines(keepends=True)
+    matcher = SequenceMatcher(None, base_lines, target_lines, autojunk=False)
+
+    operations: list[list[int] | str] = []
+    for opcode, base_start, base_end, target_start, target_end in matcher.get_opcodes():
+        if opcode == "equal":
+            operations.append([base_start, base_end])
+        elif opcode in ("replace", "insert"):
+            operations.append("".join(target_lines[target_start:target_end]))
+
+    return json.dumps(operations, ensure_ascii=False, separators=(",", ":"))
+
+
+def apply_delta(base: str, delta: str) -> str:
+    base_lines = base.splitlines(keepends=True)
+    parts: list[str] = []
+    for operation in json.loads(delta):
+        if isinstance(operation, str):
+            parts.append(operation)
+        else:
+            start, end = operation
+            parts.extend(base_lines[start:end])
+    return "".join(parts)
+
+
+__all__ = ["apply_delta", "encode_delta"]
@@ -0,0 +1,254 @@
+from bisect import bisect_left
+from collections.abc import Callable, Iterable
+from contextvars import ContextVar
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any
+
+LabelValues = tuple[str, ...]
+# A metric's values as plain lists, so other processes can publish them as JSON.
+MetricSnapshot = list[list[Any]]
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 4, 6, 8, 12, 16, 24, 32, 64)
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple[str, ...], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape_label_value(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, label_names: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self._values: dict[LabelValues, float] = {}
+        self._lock = Lock()
+
+    def inc(self, *label_values: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def set(self, *label_values: str, value: float) -> None:
+        with self._lock:
+            self._values[label_values] = value
+
+    def snapshot(self) -> MetricSnapshot:
+        with self._lock:
+            return [[list(label_values), value] for label_values, value in self._values.items()]
+
+    def samples(self, others: Iterable[MetricSnapshot] = ()) -> Iterable[str]:
+        with self._lock:
+            values = dict(self._values)
+        for snapshot in others:
+            for label_values, value in snapshot:
+                key = tuple(label_values)
+                values[key] = values.get(key, 0.0) + value
+        for label_values, value in values.items():
+            yield f"{self.name}{_format_labels(self.label_names, label_values)} {_format_value(value)}"
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *label_values: str, amount: float = 1.0) -> None:
+        self.inc(*label_values, amount=-amount)
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self.buckets = buckets
+        # Per label set: non-cumulative bucket counts (last slot is +Inf) and the sum.
+        self._values: dict[LabelValues, tuple[list[int], list[float]]] = {}
+        self._lock = Lock()
+
+    def observe(self, *label_values: str, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(label_values)
+            if series is None:
+                series = ([0] * (len(self.buckets) + 1), [0.0])
+                self._values[label_values] = series
+            series[0][index] += 1
+            series[1][0] += value
+
+    def snapshot(self) -> MetricSnapshot:
+        with self._lock:
+            return [
+                [list(label_values), list(counts), total[0]]
+                for label_values, (counts, total) in self._values.items()
+            ]
+
+    def samples(self, others: Iterable[MetricSnapshot] = ()) -> Iterable[str]:
+        with self._lock:
+            values = {
+                labels: (list(counts), total[0]) for labels, (counts, total) in self._values.items()
+            }
+        for snapshot in others:
+            for label_values, counts, total in snapshot:
+                key = tuple(label_values)
+                merged_counts, merged_total = values.get(key, ([0] * len(counts), 0.0))
+                values[key] = (
+                    [mine + theirs for mine, theirs in zip(merged_counts, counts)],
+                    merged_total + total,
+                )
+        for label_values, (counts, total) in values.items():
+            cumulative = 0
+            for upper_bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                bound = "+Inf" if upper_bound == float("inf") else _format_value(upper_bound)
+                labels = _format_labels(self.label_names, label_values, f'le="{bound}"')
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.label_names, label_values)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+Metric = Counter | Gauge | Histogram
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: list[Metric] = []
+        self._collectors: list[Callable[[], None]] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, documentation: str, label_names: tuple[str, ...] = ()) -> Counter:
+        return self.register(Counter(name, documentation, label_names))
+
+    def gauge(self, name: str, documentation: str, label_names: tuple[str, ...] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, label_names))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        label_names: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, label_names, buckets))
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        # Collectors refresh gauges that are cheaper to read at scrape time (pool, caches).
+        self._collectors.append(collector)
+
+    def collect(self) -> None:
+        for collector in self._collectors:
+            collector()
+
+    def kinds(self) -> dict[str, str]:
+        return {metric.name: metric.kind for metric in self._metrics}
+
+    def snapshot(self) -> dict[str, MetricSnapshot]:
+        self.collect()
+        return {metric.name: metric.snapshot() for metric in self._metrics}
+
+    def render(self, others: Iterable[dict[str, MetricSnapshot]] = ()) -> str:
+        # `others` are snapshots published by sibling processes; their values are added to
+        # this process's own, series by series.
+        self.collect()
+        others = list(others)
+
+        lines: list[str] = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(
+                metric.samples(
+                    snapshot[metric.name] for snapshot in others if metric.name in snapshot
+                )
+            )
+        return "\n".join(lines) + "\n"
+
+
+@dataclass
+class RequestStats:
+    queries: int = 0
+    db_seconds: float = 0.0
+
+
+_request_stats: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+def start_request_stats() -> RequestStats:
+    stats = RequestStats()
+    _request_stats.set(stats)
+    return stats
+
+
+def get_request_stats() -> RequestStats | None:
+    return _request_stats.get()
+
+
+registry = MetricsRegistry()
+
+http_requests_total = registry.counter(
+    "http_requests_total", "HTTP requests by method, route and status.", ("method", "route", "status")
+)
+http_request_duration_seconds = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency.", ("method", "route")
+)
+http_requests_in_flight = registry.gauge(
+    "http_requests_in_flight", "HTTP requests currently being served.", ("method",)
+)
+http_request_db_queries = registry.histogram(
+    "http_request_db_queries",
+    "SQL statements issued per HTTP request.",
+    ("method", "route"),
+    QUERY_COUNT_BUCKETS,
+)
+http_request_db_seconds = registry.histogram(
+    "http_request_db_seconds", "Time spent in SQL per HTTP request.", ("method", "route")
+)
+db_queries_total = registry.counter("db_queries_total", "SQL statements executed.")
+db_query_duration_seconds = registry.histogram(
+    "db_query_duration_seconds", "SQL statement latency."
+)
+
+__all__ = [
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "MetricSnapshot",
+    "MetricsRegistry",
+    "RequestStats",
+    "db_queries_total",
+    "db_query_duration_seconds",
+    "get_request_stats",
+    "http_request_db_queries",
+    "http_request_db_seconds",
+    "http_request_duration_seconds",
+    "http_requests_in_flight",
+    "http_requests_total",
+    "registry",
+    "start_request_stats",
+]
@@ -0,0 +1,117 @@
+import asyncio
+import json
+import logging
+import os
+import tempfile
+from contextlib import suppress
+from pathlib import Path
+from typing import Any
+
+from app.core.metrics import MetricSnapshot, MetricsRegistry
+
+logger = logging.getLogger(__name__)
+
+
+def _write_atomic(path: Path, payload: dict[str, Any]) -> None:
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w") as tmp:
+            json.dump(payload, tmp)
+        os.replace(tmp_name, path)
+    except BaseException:
+        with suppress(OSError):
+            os.unlink(tmp_name)
+        raise
+
+
+def clear_worker_metrics(directory: str | os.PathLike[str]) -> None:
+    # Called by the gunicorn master before any worker starts; counters restart from zero
+    # with the server, as they would in a single process.
+    path = Path(directory)
+    path.mkdir(parents=True, exist_ok=True)
+    for published in path.glob("*.json"):
+        published.unlink(missing_ok=True)
+
+
+def mark_worker_exited(directory: str | os.PathLike[str], pid: int) -> None:
+    # Called by the gunicorn master when a worker dies, including crashes that skip the
+    # worker's own shutdown. Its counters keep counting toward the totals so they never go
+    # backwards; its gauges describe a process that is gone and are dropped.
+    path = Path(directory) / f"{pid}.json"
+    try:
+        published = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return
+    published["exited"] = True
+    _write_atomic(path, published)
+
+
+class WorkerMetricsPublisher:
+    # Every worker process keeps its own registry, so a scrape reaches one arbitrary
+    # worker. Each worker writes its values to <directory>/<pid>.json every
+    # `interval_seconds`, and /metrics in any worker adds its siblings' latest files to
+    # its own live values.
+    def __init__(
+        self,
+        registry: MetricsRegistry,
+        directory: str | os.PathLike[str],
+        *,
+        interval_seconds: float,
+    ) -> None:
+        self.registry = registry
+        self.directory = Path(directory)
+        self.interval_seconds = interval_seconds
+        self._task: asyncio.Task[None] | None = None
+
+    def publish(self, *, exited: bool = False) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        _write_atomic(
+            self.directory / f"{os.getpid()}.json",
+            {"exited": exited, "metrics": self.registry.snapshot()},
+        )
+
+    def sibling_snapshots(self) -> list[dict[str, MetricSnapshot]]:
+        own = f"{os.getpid()}.json"
+        gauges = {name for name, kind in self.registry.kinds().items() if kind == "gauge"}
+        snapshots: list[dict[str, MetricSnapshot]] = []
+        for path in self.directory.glob("*.json"):
+            if path.name == own:
+                continue
+            try:
+                published = json.loads(path.read_text())
+            except (OSError, ValueError):
+                continue
+            metrics = published["metrics"]
+            if published["exited"]:
+                metrics = {name: values for name, values in metrics.items() if name not in gauges}
+            snapshots.append(metrics)
+        return snapshots
+
+    def render(self) -> str:
+        return self.registry.render(self.sibling_snapshots())
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.publish)
+            except OSError:
+                logger.warning("Could not publish metrics to %s.", self.directory, exc_info=True)
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+        # The final values stay behind for the surviving workers to keep counting.
+        with suppress(OSError):
+            await asyncio.to_thread(self.publish, exited=True)
+
+
+__all__ = ["WorkerMetricsPublisher", "clear_worker_metrics", "mark_worker_exited"]
@@ -0,0 +1,34 @@
+from contextvars import ContextVar
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+_current_scope: ContextVar[Scope | None] = ContextVar("current_scope", default=None)
+
+
+def get_current_route() -> str | None:
+    scope = _current_scope.get()
+    if scope is None:
+        return None
+    route = getattr(scope.get("route"), "path", None)
+    return f"{scope['method']} {route or scope['path']}"
+
+
+class RequestContextMiddleware:
+    # The router adds the matched route to this same scope dict, so code running
+    # inside the endpoint can read it back through the context variable.
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = _current_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current_scope.reset(token)
+
+
+__all__ = ["RequestContextMiddleware", "get_current_route"]
@@ -1,22 +1,47 @@
 from datetime import datetime, timedelta, timezone
+from functools import cache
 import hashlib
 import hmac
 import secrets
+from types import ModuleType
+from typing import TYPE_CHECKING
 
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+from jose import JWTError
 
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
+
+
+# jose.jwt (via cryptography) and passlib are a noticeable share of app.main's import
+# time, so they load on first use; load_crypto_backends() pulls them in during startup
+# warm-up instead of on the first request.
+@cache
+def _pwd_context() -> "CryptContext":
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+@cache
+def _jwt() -> ModuleType:
+    from jose import jwt
+
+    return jwt
+
+
+def load_crypto_backends() -> None:
+    _pwd_context()
+    _jwt()
 
 
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    return _pwd_context().hash(password)
 
 
 def verify_password(plain_password: str, password_hash: str) -> bool:
-    return pwd_context.verify(plain_password, password_hash)
+    return _pwd_context().verify(plain_password, password_hash)
 
 
 def create_access_token(*, subject: str) -> str:
@@ -26,11 +51,11 @@ def create_access_token(*, subject: str) -> str:
         "sub": subject,
         "exp": expire_at,
     }
-    return jwt.encode(payload, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+    return _jwt().encode(payload, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
 
 
 def decode_access_token(token: str) -> dict:
-    return jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+    return _jwt().decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
 
 
 def generate_api_key() -> str:
@@ -57,5 +82,6 @@ __all__ = [
     "get_api_key_prefix",
     "hash_api_key",
     "hash_password",
+    "load_crypto_backends",
     "verify_password",
 ]
@@ -0,0 +1,55 @@
+from collections.abc import Callable, Hashable
+from concurrent.futures import Future, wait
+from threading import Lock
+from typing import Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class SingleFlightTimeoutError(Exception):
+    pass
+
+
+class SingleFlight(Generic[K, V]):
+    # The first caller for a key runs `load`; callers arriving while it runs wait for
+    # and share its result, or its exception.
+    def __init__(self) -> None:
+        self._calls: dict[K, Future[V]] = {}
+        self._lock = Lock()
+
+    def do(self, key: K, load: Callable[[], V], *, timeout_seconds: float) -> tuple[V, bool]:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = self._calls[key] = Future()
+
+        if not leader:
+            # Checked with wait() so a TimeoutError raised by the leader's own load
+            # propagates as is instead of looking like this caller's timeout.
+            if not wait((call,), timeout=timeout_seconds).done:
+                raise SingleFlightTimeoutError(f"Shared call did not finish in {timeout_seconds:g}s.")
+            return call.result(), True
+
+        try:
+            value = load()
+        except BaseException as exc:
+            call.set_exception(exc)
+            raise
+        else:
+            call.set_result(value)
+            return value, False
+        finally:
+            with self._lock:
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+
+    def forget_where(self, predicate: Callable[[K], bool]) -> None:
+        # Callers arriving later start a new call; current waiters keep the old one.
+        with self._lock:
+            for key in [key for key in self._calls if predicate(key)]:
+                del self._calls[key]
+
+
+__all__ = ["SingleFlight", "SingleFlightTimeoutError"]
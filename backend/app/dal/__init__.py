@@ -3,8 +3,10 @@ from app.dal.api_key_dal import (
     ApiKeyNameConflictError,
     ApiKeyNameInvalidError,
     ApiKeyNotFoundError,
+    ApiKeyRow,
     create_user_api_key,
     get_active_key_by_hash,
+    get_active_key_row_by_hash,
     list_user_api_keys,
     revoke_user_api_key,
     touch_last_used,
@@ -13,16 +15,24 @@ from app.dal.auth_dal import (
     InvalidCredentialsError,
     UserAlreadyExistsError,
     UserNotFoundError,
+    UserRow,
     authenticate_user,
     create_user,
     get_user_by_email,
     get_user_by_id,
+    get_user_row_by_id,
 )
 from app.dal.prompt_dal import (
+    PromptNotFoundError,
     PromptVersionNotFoundError,
+    PromptVersionRow,
     create_prompt_version,
+    delete_prompt,
     delete_prompt_version,
+    delete_prompt_versions,
+    get_prompt_version_rows,
     get_prompt_versions,
+    rebuild_prompt_version_storage,
     update_prompt_version,
 )
 
@@ -31,21 +41,31 @@ __all__ = [
     "ApiKeyNameConflictError",
     "ApiKeyNameInvalidError",
     "ApiKeyNotFoundError",
+    "ApiKeyRow",
     "InvalidCredentialsError",
+    "PromptNotFoundError",
     "PromptVersionNotFoundError",
+    "PromptVersionRow",
     "UserAlreadyExistsError",
     "UserNotFoundError",
+    "UserRow",
     "authenticate_user",
     "create_user_api_key",
     "create_user",
     "create_prompt_version",
+    "delete_prompt",
     "delete_prompt_version",
+    "delete_prompt_versions",
     "get_active_key_by_hash",
+    "get_active_key_row_by_hash",
     "get_user_by_email",
     "get_user_by_id",
+    "get_user_row_by_id",
     "list_user_api_keys",
     "revoke_user_api_key",
     "touch_last_used",
+    "get_prompt_version_rows",
     "get_prompt_versions",
+    "rebuild_prompt_version_storage",
     "update_prompt_version",
 ]
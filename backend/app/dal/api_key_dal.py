@@ -1,9 +1,12 @@
 from datetime import datetime, timezone
+from typing import NamedTuple
 
-from sqlalchemy import func, select
+from sqlalchemy import func, select, update
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from app.dal.cache import API_KEY, dal_caches
+from app.db.invalidation import queue_invalidation
 from app.models.user_api_key import UserApiKey
 
 MAX_ACTIVE_API_KEYS_PER_USER = 5
@@ -25,6 +28,11 @@ class ApiKeyNameInvalidError(Exception):
     pass
 
 
+class ApiKeyRow(NamedTuple):
+    id: int
+    user_id: int
+
+
 def list_user_api_keys(db: Session, *, user_id: int) -> list[UserApiKey]:
     statement = (
         select(UserApiKey)
@@ -74,6 +82,7 @@ def create_user_api_key(
 
     try:
         db.add(api_key)
+        queue_invalidation(db, API_KEY, key_hash)
         db.commit()
     except IntegrityError as exc:
         db.rollback()
@@ -98,6 +107,7 @@ def revoke_user_api_key(db: Session, *, user_id: int, key_id: int) -> UserApiKey
 
     if api_key.revoked_at is None:
         api_key.revoked_at = datetime.now(timezone.utc)
+        queue_invalidation(db, API_KEY, api_key.key_hash)
         try:
             db.commit()
         except Exception:
@@ -115,13 +125,31 @@ def get_active_key_by_hash(db: Session, *, key_hash: str) -> UserApiKey | None:
     return db.execute(statement).scalar_one_or_none()
 
 
-def touch_last_used(db: Session, *, key_id: int) -> None:
-    api_key = db.get(UserApiKey, key_id)
-    if api_key is None:
-        raise ApiKeyNotFoundError("API key not found.")
+def _load_active_key_row(db: Session, key_hash: str) -> ApiKeyRow | None:
+    statement = select(UserApiKey.id, UserApiKey.user_id).where(
+        UserApiKey.key_hash == key_hash,
+        UserApiKey.revoked_at.is_(None),
+    )
+    row = db.execute(statement).one_or_none()
+    return ApiKeyRow._make(row) if row is not None else None
+
+
+def get_active_key_row_by_hash(db: Session, *, key_hash: str) -> ApiKeyRow | None:
+    # Revocation is the only change that matters here and it invalidates by hash.
+    return dal_caches.read_through(API_KEY, key_hash, lambda: _load_active_key_row(db, key_hash))
 
-    api_key.last_used_at = datetime.now(timezone.utc)
+
+def touch_last_used(db: Session, *, key_id: int) -> None:
     try:
+        result = db.execute(
+            update(UserApiKey)
+            # A cached key row can outlive its revocation until the invalidation lands;
+            # the revoked_at check makes this update reject it in the meantime.
+            .where(UserApiKey.id == key_id, UserApiKey.revoked_at.is_(None))
+            .values(last_used_at=datetime.now(timezone.utc))
+        )
+        if result.rowcount == 0:
+            raise ApiKeyNotFoundError("API key not found.")
         db.commit()
     except Exception:
         db.rollback()
@@ -1,9 +1,11 @@
 from datetime import datetime, timezone
-from typing import Callable
+from typing import Callable, NamedTuple
 
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from app.dal.cache import USER, dal_caches
+from app.db.invalidation import queue_invalidation
 from app.models.user import User
 
 
@@ -19,6 +21,12 @@ class UserNotFoundError(Exception):
     pass
 
 
+class UserRow(NamedTuple):
+    id: int
+    email: str
+    created_at: datetime
+
+
 def get_user_by_email(db: Session, *, email: str) -> User | None:
     statement = select(User).where(User.email == email.lower())
     return db.execute(statement).scalar_one_or_none()
@@ -29,6 +37,16 @@ def get_user_by_id(db: Session, *, user_id: int) -> User | None:
     return db.execute(statement).scalar_one_or_none()
 
 
+def _load_user_row(db: Session, user_id: int) -> UserRow | None:
+    statement = select(User.id, User.email, User.created_at).where(User.id == user_id)
+    row = db.execute(statement).one_or_none()
+    return UserRow._make(row) if row is not None else None
+
+
+def get_user_row_by_id(db: Session, *, user_id: int) -> UserRow | None:
+    return dal_caches.read_through(USER, user_id, lambda: _load_user_row(db, user_id))
+
+
 def create_user(db: Session, *, email: str, password_hash: str) -> User:
     existing_user = get_user_by_email(db, email=email)
     if existing_user is not None:
@@ -39,6 +57,8 @@ def create_user(db: Session, *, email: str, password_hash: str) -> User:
 
     try:
         db.add(user)
+        db.flush()
+        queue_invalidation(db, USER, user.id)
         db.commit()
     except Exception:
         db.rollback()
@@ -0,0 +1,137 @@
+import hashlib
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy.orm import Session
+
+from app.core.bundle_store import BundlePointer, BundleStore, render_bundle
+from app.core.config import settings
+from app.core.metrics import registry
+from app.dal import prompt_dal
+from app.dal.cache import PROMPTS, dal_caches
+
+# Keeps IN lists well inside driver parameter limits for large bundles.
+_ID_BATCH_SIZE = 1000
+
+release_bundle_builds = registry.counter(
+    "release_bundle_builds_total", "Release bundles written, by build mode.", ("mode",)
+)
+
+bundle_store = BundleStore(settings.RELEASE_BUNDLE_DIR)
+
+
+def _source_digest(stamps: list[prompt_dal.VersionStamp]) -> str:
+    source = hashlib.sha256()
+    for stamp in stamps:
+        source.update(f"{stamp.prompt_id}:{stamp.id}:{stamp.updated_at.isoformat()}\n".encode())
+    return source.hexdigest()
+
+
+def _incremental_entries(
+    db: Session,
+    *,
+    owner_id: int,
+    tag: str,
+    previous: BundlePointer,
+    stamps: list[prompt_dal.VersionStamp],
+) -> list[dict[str, Any]] | None:
+    # Keeps every entry of the previous bundle whose version id and updated_at still
+    # match what the tag resolves to, and loads content only for the rest.
+    bundle = bundle_store.read_bundle(owner_id, previous.digest)
+    if bundle is None:
+        return None
+    previous_entries = {entry["prompt_id"]: entry for entry in bundle["prompts"]}
+
+    entries: dict[int, dict[str, Any]] = {}
+    changed: list[int] = []
+    for stamp in stamps:
+        entry = previous_entries.get(stamp.prompt_id)
+        if (
+            entry is not None
+            and entry["id"] == stamp.id
+            and datetime.fromisoformat(entry["updated_at"]) == stamp.updated_at
+        ):
+            entries[stamp.prompt_id] = entry
+        else:
+            changed.append(stamp.prompt_id)
+
+    for start in range(0, len(changed), _ID_BATCH_SIZE):
+        for row in prompt_dal.get_latest_tagged_rows(
+            db, owner_id=owner_id, tag=tag, prompt_ids=changed[start : start + _ID_BATCH_SIZE]
+        ):
+            entries[row.prompt_id] = row._asdict()
+    return sorted(entries.values(), key=lambda entry: entry["name"])
+
+
+def _build_release_bundle(db: Session, *, owner_id: int, tag: str) -> BundlePointer:
+    # Stamps are read before content, so a write racing the build can only leave the
+    # pointer's source digest older than the bundle, which triggers another build.
+    stamps = prompt_dal.get_latest_tagged_stamps(db, owner_id=owner_id, tag=tag)
+    source_digest = _source_digest(stamps)
+    previous = bundle_store.read_pointer(owner_id, tag)
+    if (
+        previous is not None
+        and previous.source_digest == source_digest
+        and bundle_store.bundle_path(owner_id, previous.digest).is_file()
+    ):
+        return previous
+
+    mode = "incremental"
+    entries = (
+        _incremental_entries(db, owner_id=owner_id, tag=tag, previous=previous, stamps=stamps)
+        if previous is not None
+        else None
+    )
+    if entries is None:
+        mode = "full"
+        entries = [
+            row._asdict()
+            for row in prompt_dal.get_latest_tagged_rows(db, owner_id=owner_id, tag=tag)
+        ]
+
+    digest, body = render_bundle(owner_id, tag, entries)
+    bundle_store.write_bundle(owner_id, digest, body)
+    # The last few bundles stay for nodes still downloading them; older ones are deleted
+    # once the pointer no longer lists them.
+    history = [
+        earlier
+        for earlier in dict.fromkeys((previous.digest, *previous.history) if previous else ())
+        if earlier != digest
+    ]
+    keep = settings.RELEASE_BUNDLE_KEEP - 1
+    pointer = BundlePointer(
+        tag=tag,
+        digest=digest,
+        prompt_count=len(entries),
+        built_at=datetime.now(timezone.utc).isoformat(),
+        source_digest=source_digest,
+        history=history[:keep],
+    )
+    bundle_store.write_pointer(owner_id, pointer)
+    for expired in history[keep:]:
+        bundle_store.delete_bundle(owner_id, expired)
+    release_bundle_builds.inc(mode)
+    return pointer
+
+
+def get_release_bundle(db: Session, *, owner_id: int, tag: str) -> BundlePointer:
+    # Cached with the owner's prompt reads, so any prompt write drops it and the next
+    # request compares the stamps again.
+    return dal_caches.read_through(
+        PROMPTS,
+        (owner_id, "release_bundle", tag),
+        lambda: _build_release_bundle(db, owner_id=owner_id, tag=tag),
+    )
+
+
+def find_release_bundle(
+    db: Session, *, owner_id: int, digest: str, tag: str | None
+) -> Path | None:
+    # Bundles are written to this node's RELEASE_BUNDLE_DIR. When the download lands on a
+    # node that did not build it, the tag's current bundle is built here; rendering is
+    # deterministic, so it has the same digest unless the tag has moved on since.
+    path = bundle_store.bundle_path(owner_id, digest)
+    if not path.is_file() and tag is not None:
+        get_release_bundle(db, owner_id=owner_id, tag=tag)
+    return path if path.is_file() else None
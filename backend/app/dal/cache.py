@@ -0,0 +1,104 @@
+from collections.abc import Callable, Hashable, Sequence
+from typing import Any, TypeVar
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.metrics import registry
+from app.db.invalidation import InMemoryInvalidationBus, Invalidation
+
+USER = "user"
+API_KEY = "api_key"
+PROMPTS = "prompts"
+OWNER_SHARD = "owner_shard"
+
+V = TypeVar("V")
+
+dal_cache_entries = registry.gauge("dal_cache_entries", "Entries held by a DAL read cache.", ("cache",))
+dal_cache_hits = registry.counter("dal_cache_hits_total", "DAL reads served from cache.", ("cache",))
+dal_cache_misses = registry.counter(
+    "dal_cache_misses_total", "DAL reads that went to the database.", ("cache",)
+)
+cache_invalidation_listening = registry.gauge(
+    "cache_invalidation_listening", "1 while this worker receives cache invalidations."
+)
+
+
+class DalCaches:
+    # Read-through caches for the per-request auth lookups and latest-version prompt
+    # reads. They stay bypassed until attached to an invalidation bus, and again
+    # whenever that bus stops listening.
+    def __init__(self, *, max_entries: int, ttl_seconds: float) -> None:
+        self.caches: dict[str, TTLCache[Any, Any]] = {
+            kind: TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+            for kind in (USER, API_KEY, PROMPTS, OWNER_SHARD)
+        }
+        self._bus: InMemoryInvalidationBus | None = None
+
+    @property
+    def active(self) -> bool:
+        return self._bus is not None and self._bus.is_listening
+
+    def attach(self, bus: InMemoryInvalidationBus) -> None:
+        self._bus = bus
+        bus.subscribe(self.apply)
+
+    def read_through(self, kind: str, key: Hashable, load: Callable[[], V | None]) -> V | None:
+        # None (not found) is never cached, so a freshly created row is seen at once.
+        if not self.active:
+            return load()
+        cache = self.caches[kind]
+        value = cache.get(key)
+        if value is not None:
+            return value
+        generation = cache.generation
+        value = load()
+        if value is not None:
+            cache.set(key, value, generation=generation)
+        return value
+
+    def apply(self, invalidations: Sequence[Invalidation] | None) -> None:
+        if invalidations is None:
+            for cache in self.caches.values():
+                cache.clear()
+            return
+        for invalidation in invalidations:
+            cache = self.caches.get(invalidation.kind)
+            if cache is None:
+                continue
+            if invalidation.kind in (USER, OWNER_SHARD):
+                cache.discard(int(invalidation.key))
+            elif invalidation.kind == API_KEY:
+                cache.discard(invalidation.key)
+            else:
+                # Prompt entries are keyed by (owner_id, ...), so one write clears every
+                # cached lookup for that owner.
+                owner_id = int(invalidation.key)
+                cache.discard_where(lambda key: key[0] == owner_id)
+
+
+dal_caches = DalCaches(
+    max_entries=settings.CACHE_MAX_ENTRIES, ttl_seconds=settings.CACHE_TTL_SECONDS
+)
+
+
+def register_cache_collectors(dal_caches: DalCaches) -> None:
+    def _collect() -> None:
+        for kind, cache in dal_caches.caches.items():
+            stats = cache.stats()
+            dal_cache_entries.set(kind, value=stats.entries)
+            dal_cache_hits.set(kind, value=stats.hits)
+            dal_cache_misses.set(kind, value=stats.misses)
+        cache_invalidation_listening.set(value=int(dal_caches.active))
+
+    registry.add_collector(_collect)
+
+
+__all__ = [
+    "API_KEY",
+    "OWNER_SHARD",
+    "PROMPTS",
+    "USER",
+    "DalCaches",
+    "dal_caches",
+    "register_cache_collectors",
+]
@@ -0,0 +1,54 @@
+from collections.abc import Callable, Sequence
+from typing import TypeVar
+
+from app.core.config import settings
+from app.core.metrics import registry
+from app.core.single_flight import SingleFlight, SingleFlightTimeoutError
+from app.dal.cache import PROMPTS
+from app.db.invalidation import Invalidation
+
+# (owner_id, name, any-of tags, all-of tags, metadata filter as canonical JSON, limit)
+PromptReadKey = tuple[
+    int | None, str | None, tuple[str, ...], tuple[str, ...], str | None, int | None
+]
+V = TypeVar("V")
+
+prompt_reads_coalesced = registry.counter(
+    "prompt_reads_coalesced_total", "Prompt reads served by another request's in-flight query."
+)
+prompt_reads_coalesce_timeouts = registry.counter(
+    "prompt_reads_coalesce_timeouts_total",
+    "Prompt reads that gave up waiting on a shared query and ran their own.",
+)
+
+prompt_read_flights: SingleFlight[PromptReadKey, object] = SingleFlight()
+
+
+def coalesce_prompt_read(key: PromptReadKey, load: Callable[[], V]) -> V:
+    # Per worker: identical lookups that overlap share one query and one connection.
+    if not settings.PROMPT_READ_COALESCING:
+        return load()
+    try:
+        value, shared = prompt_read_flights.do(
+            key, load, timeout_seconds=settings.PROMPT_READ_COALESCE_TIMEOUT_SECONDS
+        )
+    except SingleFlightTimeoutError:
+        prompt_reads_coalesce_timeouts.inc()
+        return load()
+    if shared:
+        prompt_reads_coalesced.inc()
+    return value  # type: ignore[return-value]
+
+
+def forget_prompt_reads(invalidations: Sequence[Invalidation] | None) -> None:
+    # A query that started before a write committed must not be shared with requests
+    # that arrive after it.
+    if invalidations is None:
+        prompt_read_flights.forget_where(lambda key: True)
+        return
+    owner_ids = {int(item.key) for item in invalidations if item.kind == PROMPTS}
+    if owner_ids:
+        prompt_read_flights.forget_where(lambda key: key[0] in owner_ids)
+
+
+__all__ = ["PromptReadKey", "coalesce_prompt_read", "forget_prompt_reads", "prompt_read_flights"]
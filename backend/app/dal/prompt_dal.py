@@ -1,17 +1,316 @@
+import json
+from collections.abc import Collection, Iterable, Iterator, Sequence
 from datetime import datetime, timezone
-
-from sqlalchemy import delete, func, select
-from sqlalchemy.orm import Session, joinedload, selectinload
-
-from app.models.prompt import Prompt, PromptTag, PromptVersion
+from typing import Any, NamedTuple
+
+from sqlalchemy import (
+    ColumnElement,
+    String,
+    all_,
+    and_,
+    delete,
+    func,
+    lambda_stmt,
+    literal,
+    select,
+    type_coerce,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, aggregate_order_by
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.sql.lambdas import StatementLambdaElement
+from sqlalchemy.orm.attributes import flag_modified, set_committed_value
+
+from app.core.config import settings
+from app.core.delta import apply_delta, encode_delta
+from app.dal.cache import PROMPTS, dal_caches
+from app.dal.coalescing import coalesce_prompt_read
+from app.db.invalidation import queue_invalidation
+from app.models.prompt import Prompt, PromptVersion
+
+
+class PromptNotFoundError(Exception):
+    pass
 
 
 class PromptVersionNotFoundError(Exception):
     pass
 
 
-def _normalize_tag(tag: str | None) -> str | None:
-    return tag.strip() if tag else None
+class PromptVersionRow(NamedTuple):
+    id: int
+    prompt_id: int
+    name: str
+    content: str
+    version: int
+    tag: str | None
+    tags: list[str]
+    metadata: dict[str, Any] | None
+    created_at: datetime
+    updated_at: datetime
+
+
+def _normalize_tags(tags: Iterable[str | None]) -> list[str]:
+    # Stripped, blanks dropped, first occurrence wins so the order stays stable.
+    return list(dict.fromkeys(tag.strip() for tag in tags if tag and tag.strip()))
+
+
+def _is_postgresql(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def _is_snapshot_version(version: int) -> bool:
+    return version % settings.PROMPT_VERSION_SNAPSHOT_INTERVAL == 0
+
+
+def _crosses_snapshot(version: int, newer_version: int) -> bool:
+    # True when a snapshot version lies strictly between the two. A delta re-encoded
+    # across that gap would leave more than one interval of deltas above it, so it is
+    # stored in full instead.
+    interval = settings.PROMPT_VERSION_SNAPSHOT_INTERVAL
+    return (newer_version - 1) // interval > version // interval
+
+
+def _load_content_chain(db: Session, *, prompt_id: int, low: int, high: int) -> dict[int, str]:
+    # Deltas point at the next newer version, so walk down from the nearest full row
+    # (a snapshot or the latest version) above `high`.
+    interval = settings.PROMPT_VERSION_SNAPSHOT_INTERVAL
+    statement = (
+        select(PromptVersion.version, PromptVersion.content, PromptVersion.content_delta)
+        .where(PromptVersion.prompt_id == prompt_id, PromptVersion.version >= low)
+        .order_by(PromptVersion.version.desc())
+    )
+    rows = db.execute(statement.where(PromptVersion.version <= (high // interval + 1) * interval)).all()
+    if not rows or rows[0].content is None:
+        rows = db.execute(statement).all()
+
+    contents: dict[int, str] = {}
+    current: str | None = None
+    for row in rows:
+        if row.content is not None:
+            current = row.content
+        elif current is None:
+            raise PromptVersionNotFoundError(
+                f"Prompt {prompt_id} version {row.version} has no full version to rebuild from."
+            )
+        else:
+            current = apply_delta(current, row.content_delta)
+        contents[row.version] = current
+    return contents
+
+
+def _load_missing_contents(
+    db: Session, missing: Iterable[tuple[int, int]]
+) -> dict[int, dict[int, str]]:
+    bounds: dict[int, tuple[int, int]] = {}
+    for prompt_id, version in missing:
+        low, high = bounds.get(prompt_id, (version, version))
+        bounds[prompt_id] = (min(low, version), max(high, version))
+
+    return {
+        prompt_id: _load_content_chain(db, prompt_id=prompt_id, low=low, high=high)
+        for prompt_id, (low, high) in bounds.items()
+    }
+
+
+def _materialize_contents(db: Session, prompt_versions: Iterable[PromptVersion | None]) -> None:
+    pending = [
+        prompt_version
+        for prompt_version in prompt_versions
+        if prompt_version is not None and prompt_version.content is None
+    ]
+    if not pending:
+        return
+
+    contents = _load_missing_contents(
+        db, ((prompt_version.prompt_id, prompt_version.version) for prompt_version in pending)
+    )
+    for prompt_version in pending:
+        # Loaded as committed state so reconstructed text is never flushed back.
+        set_committed_value(
+            prompt_version, "content", contents[prompt_version.prompt_id][prompt_version.version]
+        )
+
+
+def _encode_content(
+    version: int, content: str, newer_content: str | None
+) -> tuple[str | None, str | None]:
+    # (content, content_delta) to store for a version, given the next newer version's text.
+    delta: str | None = None
+    if (
+        settings.PROMPT_VERSION_STORAGE == "delta"
+        and newer_content is not None
+        and not _is_snapshot_version(version)
+    ):
+        delta = encode_delta(newer_content, content)
+        if len(delta) >= len(content):
+            delta = None
+    return (None if delta is not None else content), delta
+
+
+def _store_content(prompt_version: PromptVersion, content: str, newer_content: str | None) -> None:
+    prompt_version.content, prompt_version.content_delta = _encode_content(
+        prompt_version.version, content, newer_content
+    )
+    flag_modified(prompt_version, "content")
+
+
+def _get_adjacent_version(
+    db: Session, prompt_version: PromptVersion, *, newer: bool
+) -> PromptVersion | None:
+    if newer:
+        statement = (
+            select(PromptVersion)
+            .where(
+                PromptVersion.prompt_id == prompt_version.prompt_id,
+                PromptVersion.version > prompt_version.version,
+            )
+            .order_by(PromptVersion.version.asc())
+        )
+    else:
+        statement = (
+            select(PromptVersion)
+            .where(
+                PromptVersion.prompt_id == prompt_version.prompt_id,
+                PromptVersion.version < prompt_version.version,
+            )
+            .order_by(PromptVersion.version.desc())
+        )
+
+    adjacent = db.execute(statement.limit(1)).scalar_one_or_none()
+    _materialize_contents(db, (adjacent,))
+    return adjacent
+
+
+_prompt_versions_query = (
+    select(PromptVersion)
+    .join(Prompt)
+    .options(joinedload(PromptVersion.prompt))
+)
+
+_prompt_version_rows_query = (
+    select(
+        PromptVersion.id,
+        PromptVersion.prompt_id,
+        Prompt.name,
+        PromptVersion.content,
+        PromptVersion.version,
+        PromptVersion.tags,
+        PromptVersion.metadata_.label("metadata"),
+        PromptVersion.created_at,
+        PromptVersion.updated_at,
+    )
+    .select_from(PromptVersion)
+    .join(Prompt)
+)
+
+
+def _metadata_leaves(
+    metadata: dict[str, Any], path: tuple[str, ...] = ()
+) -> Iterator[tuple[tuple[str, ...], Any]]:
+    for key, value in metadata.items():
+        if isinstance(value, dict):
+            yield from _metadata_leaves(value, (*path, key))
+        else:
+            yield (*path, key), value
+
+
+def _metadata_condition(db: Session, metadata: dict[str, Any]) -> ColumnElement[bool]:
+    if db.get_bind().dialect.name == "postgresql":
+        # One @> against the whole filter document is served by ix_prompt_versions_metadata.
+        return type_coerce(PromptVersion.metadata_, JSONB).contains(metadata)
+    # Other databases (SQLite in development) compare each leaf value in turn.
+    return and_(
+        *(
+            func.json_extract(PromptVersion.metadata_, "$" + "".join(f'."{key}"' for key in path))
+            == value
+            for path, value in _metadata_leaves(metadata)
+        )
+    )
+
+
+def _has_any_tag(db: Session, tags: Sequence[str]) -> ColumnElement[bool]:
+    if _is_postgresql(db):
+        # && and @> are both served by ix_prompt_versions_tags.
+        return PromptVersion.tags.overlap(list(tags))
+    each = func.json_each(PromptVersion.tags).table_valued("value")
+    return select(each.c.value).where(each.c.value.in_(tags)).exists()
+
+
+def _has_all_tags(db: Session, tags: Sequence[str]) -> ColumnElement[bool]:
+    if _is_postgresql(db):
+        return PromptVersion.tags.contains(list(tags))
+    return and_(*(_has_any_tag(db, (tag,)) for tag in tags))
+
+
+def _version_condition(
+    db: Session,
+    *,
+    tags_any: Sequence[str],
+    tags_all: Sequence[str],
+    metadata: dict[str, Any] | None,
+) -> ColumnElement[bool] | None:
+    conditions: list[ColumnElement[bool]] = []
+    if tags_any:
+        conditions.append(_has_any_tag(db, tags_any))
+    if tags_all:
+        conditions.append(_has_all_tags(db, tags_all))
+    if metadata:
+        conditions.append(_metadata_condition(db, metadata))
+    return and_(*conditions) if conditions else None
+
+
+def _tag_filters(
+    tag: str | None, tags_any: Sequence[str] | None, tags_all: Sequence[str] | None
+) -> tuple[tuple[str, ...], tuple[str, ...]]:
+    # Sorted so equivalent filters share compiled SQL and cache entries. A single `tag`
+    # is an all-of filter with one member.
+    return (
+        tuple(sorted(_normalize_tags(tags_any or ()))),
+        tuple(sorted(_normalize_tags((tag, *(tags_all or ()))))),
+    )
+
+
+def _metadata_cache_key(metadata: dict[str, Any] | None) -> str | None:
+    return json.dumps(metadata, sort_keys=True) if metadata else None
+
+
+def _filter_prompt_versions(
+    statement: StatementLambdaElement,
+    *,
+    name: str | None,
+    owner_id: int | None,
+    limit: int | None,
+    condition: ColumnElement[bool] | None = None,
+) -> StatementLambdaElement:
+    # Each optional clause is its own lambda, so every filter combination gets a
+    # stable cache key and reuses its compiled SQL instead of rebuilding the select.
+    if name and owner_id is not None:
+        # (owner_id, name) is unique, so resolving the prompt id up front lets the planner
+        # walk uq_prompt_version backwards instead of sorting the joined versions.
+        statement += lambda s: s.where(
+            PromptVersion.prompt_id
+            == select(Prompt.id)
+            .where(Prompt.owner_id == owner_id, Prompt.name == name)
+            .scalar_subquery()
+        )
+
+    if name:
+        statement += lambda s: s.where(Prompt.name == name)
+
+    if owner_id is not None:
+        statement += lambda s: s.where(Prompt.owner_id == owner_id)
+
+    if condition is not None:
+        statement += lambda s: s.where(condition)
+
+    statement += lambda s: s.order_by(Prompt.name.asc(), PromptVersion.version.desc())
+
+    if limit is not None:
+        statement += lambda s: s.limit(limit)
+
+    return statement
 
 
 def _get_prompt_version_by_id(
@@ -20,17 +319,16 @@ def _get_prompt_version_by_id(
     *,
     owner_id: int | None = None,
 ) -> PromptVersion | None:
-    statement = (
-        select(PromptVersion)
-        .join(Prompt)
-        .options(joinedload(PromptVersion.prompt), selectinload(PromptVersion.tags))
-        .where(PromptVersion.id == prompt_version_id)
+    statement = lambda_stmt(
+        lambda: _prompt_versions_query.where(PromptVersion.id == prompt_version_id)
     )
 
     if owner_id is not None:
-        statement = statement.where(Prompt.owner_id == owner_id)
+        statement += lambda s: s.where(Prompt.owner_id == owner_id)
 
-    return db.execute(statement).unique().scalar_one_or_none()
+    prompt_version = db.execute(statement).unique().scalar_one_or_none()
+    _materialize_contents(db, (prompt_version,))
+    return prompt_version
 
 
 def get_prompt_versions(
@@ -40,27 +338,301 @@ def get_prompt_versions(
     tag: str | None,
     owner_id: int | None = None,
     limit: int | None = None,
+    metadata: dict[str, Any] | None = None,
+    tags_any: Sequence[str] | None = None,
+    tags_all: Sequence[str] | None = None,
 ) -> list[PromptVersion]:
+    any_of, all_of = _tag_filters(tag, tags_any, tags_all)
+    statement = _filter_prompt_versions(
+        lambda_stmt(lambda: _prompt_versions_query),
+        name=name,
+        owner_id=owner_id,
+        limit=limit,
+        condition=_version_condition(db, tags_any=any_of, tags_all=all_of, metadata=metadata),
+    )
+    prompt_versions = db.execute(statement).unique().scalars().all()
+    _materialize_contents(db, prompt_versions)
+    return prompt_versions
+
+
+def _to_prompt_version_rows(db: Session, results: Iterable[Any]) -> list[PromptVersionRow]:
+    rows = [
+        PromptVersionRow(
+            id=row.id,
+            prompt_id=row.prompt_id,
+            name=row.name,
+            content=row.content,
+            version=row.version,
+            tag=row.tags[0] if row.tags else None,
+            tags=row.tags,
+            metadata=row.metadata,
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+        )
+        for row in results
+    ]
+    missing = [(row.prompt_id, row.version) for row in rows if row.content is None]
+    if not missing:
+        return rows
+
+    contents = _load_missing_contents(db, missing)
+    return [
+        row if row.content is not None else row._replace(content=contents[row.prompt_id][row.version])
+        for row in rows
+    ]
+
+
+def _load_prompt_version_rows(
+    db: Session,
+    *,
+    name: str | None,
+    owner_id: int | None,
+    limit: int | None,
+    tags_any: Sequence[str],
+    tags_all: Sequence[str],
+    metadata: dict[str, Any] | None,
+) -> list[PromptVersionRow]:
+    statement = _filter_prompt_versions(
+        lambda_stmt(lambda: _prompt_version_rows_query),
+        name=name,
+        owner_id=owner_id,
+        limit=limit,
+        condition=_version_condition(db, tags_any=tags_any, tags_all=tags_all, metadata=metadata),
+    )
+    return _to_prompt_version_rows(db, db.execute(statement))
+
+
+def get_prompt_version_rows(
+    db: Session,
+    *,
+    name: str | None,
+    tag: str | None,
+    owner_id: int | None = None,
+    limit: int | None = None,
+    metadata: dict[str, Any] | None = None,
+    tags_any: Sequence[str] | None = None,
+    tags_all: Sequence[str] | None = None,
+) -> list[PromptVersionRow]:
+    any_of, all_of = _tag_filters(tag, tags_any, tags_all)
+    lookup_key = (owner_id, name, any_of, all_of, _metadata_cache_key(metadata))
+
+    def load() -> tuple[PromptVersionRow, ...]:
+        return coalesce_prompt_read(
+            (*lookup_key, limit),
+            lambda: tuple(
+                _load_prompt_version_rows(
+                    db,
+                    name=name,
+                    owner_id=owner_id,
+                    limit=limit,
+                    tags_any=any_of,
+                    tags_all=all_of,
+                    metadata=metadata,
+                )
+            ),
+        )
+
+    # Only single-version lookups are cached: they are the hot runtime path and their
+    # size is bounded. Every prompt write invalidates the owner's entries.
+    if owner_id is None or limit != 1:
+        return list(load())
+    return list(dal_caches.read_through(PROMPTS, lookup_key, load))
+
+
+PromptSelector = tuple[str, str | None]
+
+
+def get_latest_prompt_version_rows(
+    db: Session, *, owner_id: int, selectors: Sequence[PromptSelector]
+) -> dict[PromptSelector, PromptVersionRow]:
+    # Resolves a whole set of (name, tag) lookups in one round trip: each selector is a
+    # LIMIT 1 branch that walks uq_prompt_version backwards, joined with UNION ALL.
+    selectors = list(dict.fromkeys(selectors))
+    if not selectors:
+        return {}
+    branches = []
+    for position, (name, tag) in enumerate(selectors):
+        statement = _prompt_version_rows_query.add_columns(literal(position).label("position")).where(
+            PromptVersion.prompt_id
+            == select(Prompt.id)
+            .where(Prompt.owner_id == owner_id, Prompt.name == name)
+            .scalar_subquery()
+        )
+        if tag is not None:
+            statement = statement.where(_has_all_tags(db, (tag,)))
+        latest = statement.order_by(PromptVersion.version.desc()).limit(1).subquery()
+        branches.append(select(latest))
+
+    results = db.execute(union_all(*branches)).all()
+    rows = _to_prompt_version_rows(db, results)
+    return {selectors[result.position]: row for result, row in zip(results, rows)}
+
+
+class PromptSummaryRow(NamedTuple):
+    prompt_id: int
+    name: str
+    latest_version_id: int
+    latest_version: int
+    version_count: int
+    tags: list[str]
+    created_at: datetime
+    updated_at: datetime
+
+
+def _load_prompt_summaries(
+    db: Session, owner_id: int, after: str | None, limit: int
+) -> list[PromptSummaryRow]:
+    page = select(Prompt.id, Prompt.name, Prompt.created_at).where(Prompt.owner_id == owner_id)
+    if after is not None:
+        page = page.where(Prompt.name > after)
+    page = page.order_by(Prompt.name).limit(limit).subquery()
+
+    # Partitioned by name, which the page is already ordered by, so each prompt's
+    # versions are only reordered among themselves.
+    partition = {"partition_by": page.c.name}
+    ranked = (
+        select(
+            page.c.id.label("prompt_id"),
+            page.c.name,
+            PromptVersion.id.label("latest_version_id"),
+            PromptVersion.version.label("latest_version"),
+            func.count().over(**partition).label("version_count"),
+            PromptVersion.tags,
+            page.c.created_at,
+            func.max(PromptVersion.updated_at).over(**partition).label("updated_at"),
+            func.row_number()
+            .over(**partition, order_by=PromptVersion.version.desc())
+            .label("rank"),
+        )
+        .join(PromptVersion, PromptVersion.prompt_id == page.c.id)
+        .subquery()
+    )
     statement = (
-        select(PromptVersion)
-        .join(Prompt)
-        .options(joinedload(PromptVersion.prompt), selectinload(PromptVersion.tags))
-        .order_by(Prompt.name.asc(), PromptVersion.version.desc())
+        select(*(ranked.c[field] for field in PromptSummaryRow._fields))
+        .where(ranked.c.rank == 1)
+        .order_by(ranked.c.name)
+    )
+    return [PromptSummaryRow._make(row) for row in db.execute(statement)]
+
+
+def get_prompt_summaries(
+    db: Session, *, owner_id: int, after: str | None, limit: int
+) -> list[PromptSummaryRow]:
+    # One row per prompt in name order, starting after the prompt named `after`. The
+    # page of prompts is picked first, so the window only runs over their versions, and
+    # the content column is never read.
+    return dal_caches.read_through(
+        PROMPTS,
+        (owner_id, "summary", after, limit),
+        lambda: _load_prompt_summaries(db, owner_id, after, limit),
     )
 
-    if name:
-        statement = statement.where(Prompt.name == name)
 
-    if owner_id is not None:
-        statement = statement.where(Prompt.owner_id == owner_id)
+def _latest_tagged_rank() -> ColumnElement[int]:
+    return func.row_number().over(
+        partition_by=PromptVersion.prompt_id, order_by=PromptVersion.version.desc()
+    )
 
-    if tag:
-        statement = statement.join(PromptTag).where(PromptTag.name == tag)
 
-    if limit is not None:
-        statement = statement.limit(limit)
+def get_latest_tagged_rows(
+    db: Session, *, owner_id: int, tag: str, prompt_ids: Collection[int] | None = None
+) -> list[PromptVersionRow]:
+    # The newest version carrying `tag` for each of the owner's prompts, or for
+    # `prompt_ids` only, in name order.
+    statement = _prompt_version_rows_query.add_columns(
+        _latest_tagged_rank().label("rank")
+    ).where(Prompt.owner_id == owner_id, _has_all_tags(db, (tag,)))
+    if prompt_ids is not None:
+        statement = statement.where(PromptVersion.prompt_id.in_(prompt_ids))
+    ranked = statement.subquery()
+    return _to_prompt_version_rows(
+        db, db.execute(select(ranked).where(ranked.c.rank == 1).order_by(ranked.c.name))
+    )
 
-    return db.execute(statement).unique().scalars().all()
+
+class VersionStamp(NamedTuple):
+    prompt_id: int
+    id: int
+    updated_at: datetime
+
+
+def get_latest_tagged_stamps(db: Session, *, owner_id: int, tag: str) -> list[VersionStamp]:
+    # Same resolution as get_latest_tagged_rows without content. Every write to a version
+    # bumps its updated_at, so an unchanged stamp means an unchanged version.
+    ranked = (
+        select(
+            PromptVersion.prompt_id,
+            PromptVersion.id,
+            PromptVersion.updated_at,
+            _latest_tagged_rank().label("rank"),
+        )
+        .join(Prompt)
+        .where(Prompt.owner_id == owner_id, _has_all_tags(db, (tag,)))
+        .subquery()
+    )
+    return [
+        VersionStamp(prompt_id=row.prompt_id, id=row.id, updated_at=row.updated_at)
+        for row in db.execute(
+            select(ranked.c.prompt_id, ranked.c.id, ranked.c.updated_at)
+            .where(ranked.c.rank == 1)
+            .order_by(ranked.c.prompt_id)
+        )
+    ]
+
+
+def _apply_tag_changes(
+    db: Session, prompt_version: PromptVersion, *, added: list[str], removed: list[str]
+) -> None:
+    if not _is_postgresql(db):
+        prompt_version.tags = [
+            tag for tag in _normalize_tags((*prompt_version.tags, *added)) if tag not in removed
+        ]
+        return
+
+    # Computed from the stored array inside the UPDATE, so concurrent adds and removes on
+    # the same version compose instead of overwriting each other's tag set. The added and
+    # removed tags are bound as two arrays, so the statement's size does not depend on how
+    # many there are; each tag keeps the position of its first occurrence.
+    merged = (
+        func.unnest(PromptVersion.tags.concat(literal(added, ARRAY(String(64)))))
+        .table_valued("tag", with_ordinality="position")
+        .render_derived()
+    )
+    kept = (
+        select(merged.c.tag, func.min(merged.c.position).label("position"))
+        .where(merged.c.tag != all_(literal(removed, ARRAY(String(64)))))
+        .group_by(merged.c.tag)
+        .subquery()
+    )
+    tags = func.coalesce(
+        select(func.array_agg(aggregate_order_by(kept.c.tag, kept.c.position)))
+        .scalar_subquery(),
+        literal([], ARRAY(String(64))),
+    )
+    db.flush()
+    db.execute(
+        update(PromptVersion)
+        .where(PromptVersion.id == prompt_version.id)
+        .values(tags=tags)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _latest_version_lookup(owner_id: int, name: str, *, with_content: bool) -> Any:
+    # The prompt and its latest version number in one read. Delta storage also needs the
+    # latest version's stored content, which the new version's insert re-encodes.
+    latest = (
+        select(PromptVersion.version)
+        .where(PromptVersion.prompt_id == Prompt.id)
+        .order_by(PromptVersion.version.desc())
+        .limit(1)
+    )
+    columns = [Prompt.id, latest.scalar_subquery().label("latest_version")]
+    if with_content:
+        columns.append(
+            latest.with_only_columns(PromptVersion.content).scalar_subquery().label("content")
+        )
+    return select(*columns).where(Prompt.owner_id == owner_id, Prompt.name == name)
 
 
 def create_prompt_version(
@@ -70,46 +642,66 @@ def create_prompt_version(
     name: str,
     content: str,
     tag: str | None,
-) -> PromptVersion:
+    metadata: dict[str, Any] | None = None,
+    tags: Sequence[str] | None = None,
+) -> PromptVersionRow:
     now = datetime.now(timezone.utc)
-    normalized_tag = _normalize_tag(tag)
+    delta_storage = settings.PROMPT_VERSION_STORAGE == "delta"
+    normalized_tags = _normalize_tags((tag, *(tags or ())))
 
     try:
-        prompt = db.execute(
-            select(Prompt).where(Prompt.owner_id == owner_id, Prompt.name == name)
-        ).scalar_one_or_none()
-        if prompt is None:
+        latest = db.execute(
+            _latest_version_lookup(owner_id, name, with_content=delta_storage)
+        ).one_or_none()
+        if latest is None:
             prompt = Prompt(owner_id=owner_id, name=name, created_at=now)
             db.add(prompt)
             db.flush()
-
-        latest_version = db.scalar(
-            select(func.max(PromptVersion.version)).where(PromptVersion.prompt_id == prompt.id)
-        )
-        next_version = (latest_version or 0) + 1
+            prompt_id, latest_version = prompt.id, None
+        else:
+            prompt_id, latest_version = latest.id, latest.latest_version
+
+        if latest_version is not None and delta_storage and latest.content is not None:
+            stored, delta = _encode_content(latest_version, latest.content, content)
+            db.execute(
+                update(PromptVersion)
+                .where(
+                    PromptVersion.prompt_id == prompt_id, PromptVersion.version == latest_version
+                )
+                .values(content=stored, content_delta=delta)
+                .execution_options(synchronize_session=False)
+            )
 
         prompt_version = PromptVersion(
-            prompt_id=prompt.id,
-            version=next_version,
+            prompt_id=prompt_id,
+            version=(latest_version or 0) + 1,
             content=content,
+            tags=normalized_tags,
+            metadata_=metadata,
             created_at=now,
             updated_at=now,
         )
         db.add(prompt_version)
         db.flush()
-
-        if normalized_tag:
-            db.add(PromptTag(prompt_version_id=prompt_version.id, name=normalized_tag))
-
+        # Everything in the response is known here, so it is not read back after commit.
+        created = PromptVersionRow(
+            id=prompt_version.id,
+            prompt_id=prompt_id,
+            name=name,
+            content=content,
+            version=prompt_version.version,
+            tag=normalized_tags[0] if normalized_tags else None,
+            tags=normalized_tags,
+            metadata=metadata,
+            created_at=now,
+            updated_at=now,
+        )
+        queue_invalidation(db, PROMPTS, owner_id)
         db.commit()
     except Exception:
         db.rollback()
         raise
-
-    refreshed = _get_prompt_version_by_id(db, prompt_version.id, owner_id=owner_id)
-    if refreshed is None:
-        raise PromptVersionNotFoundError("Prompt version not found after creation.")
-    return refreshed
+    return created
 
 
 def update_prompt_version(
@@ -121,7 +713,11 @@ def update_prompt_version(
     tag: str | None,
     content_is_set: bool,
     tag_is_set: bool,
-) -> tuple[PromptVersion, str | None]:
+    tags: Sequence[str] | None = None,
+    tags_is_set: bool = False,
+    add_tags: Sequence[str] = (),
+    remove_tags: Sequence[str] = (),
+) -> PromptVersion:
     prompt_version = _get_prompt_version_by_id(db, prompt_version_id, owner_id=owner_id)
     if prompt_version is None:
         raise PromptVersionNotFoundError("Prompt version not found.")
@@ -130,19 +726,31 @@ def update_prompt_version(
     has_changes = False
 
     if content_is_set and content is not None:
-        prompt_version.content = content
+        # The older neighbour may be a delta against this version's old content whatever
+        # the current mode is; only delta storage needs the newer one.
+        older = _get_adjacent_version(db, prompt_version, newer=False)
+        newer = None
+        if settings.PROMPT_VERSION_STORAGE == "delta":
+            newer = _get_adjacent_version(db, prompt_version, newer=True)
+
+        _store_content(prompt_version, content, newer.content if newer is not None else None)
+        if older is not None and older.content_delta is not None:
+            _store_content(older, older.content, content)
+        has_changes = True
+
+    if tag_is_set or tags_is_set:
+        prompt_version.tags = _normalize_tags((tag, *(tags or ())))
         has_changes = True
 
-    explicit_tag: str | None = None
-    if tag_is_set:
-        explicit_tag = _normalize_tag(tag)
-        db.execute(delete(PromptTag).where(PromptTag.prompt_version_id == prompt_version_id))
-        if explicit_tag:
-            db.add(PromptTag(prompt_version_id=prompt_version_id, name=explicit_tag))
+    added = _normalize_tags(add_tags)
+    removed = _normalize_tags(remove_tags)
+    if added or removed:
+        _apply_tag_changes(db, prompt_version, added=added, removed=removed)
         has_changes = True
 
     if has_changes:
         prompt_version.updated_at = now
+        queue_invalidation(db, PROMPTS, owner_id)
 
     try:
         db.commit()
@@ -154,7 +762,99 @@ def update_prompt_version(
     if refreshed is None:
         raise PromptVersionNotFoundError("Prompt version not found after update.")
 
-    return refreshed, explicit_tag
+    return refreshed
+
+
+def delete_prompt_versions(
+    db: Session, *, owner_id: int, prompt_version_ids: Collection[int]
+) -> int:
+    # Set-based, so the statement count does not grow with the number of ids: one read of
+    # the affected prompts' version stamps, a chain read per prompt with deltas to
+    # re-encode, one batched update, and one delete each for the versions and for the
+    # prompts left without any. Ids that are unknown or not the owner's are skipped.
+    requested = set(prompt_version_ids)
+    targeted_prompts = (
+        select(PromptVersion.prompt_id)
+        .join(Prompt, Prompt.id == PromptVersion.prompt_id)
+        .where(Prompt.owner_id == owner_id, PromptVersion.id.in_(requested))
+    )
+    try:
+        # Sorted here rather than in SQL: the rows are few and narrow, and an ORDER BY
+        # over several prompts would need a sort node.
+        stamps = sorted(
+            db.execute(
+                select(
+                    PromptVersion.id,
+                    PromptVersion.prompt_id,
+                    PromptVersion.version,
+                    PromptVersion.content_delta.is_not(None).label("is_delta"),
+                )
+                .where(PromptVersion.prompt_id.in_(targeted_prompts))
+                .with_for_update()
+            ),
+            key=lambda stamp: (stamp.prompt_id, -stamp.version),
+        )
+        deleted_ids = {stamp.id for stamp in stamps if stamp.id in requested}
+        if not deleted_ids:
+            db.rollback()
+            return 0
+
+        # A kept delta whose newer neighbour goes is re-encoded against the next kept
+        # version, or stored in full when no newer version is left or a deleted snapshot
+        # lay between them.
+        repairs: list[tuple[Any, int | None]] = []
+        prompt_id: int | None = None
+        newer_kept: int | None = None
+        newer_deleted = False
+        for stamp in stamps:
+            if stamp.prompt_id != prompt_id:
+                prompt_id, newer_kept, newer_deleted = stamp.prompt_id, None, False
+            if stamp.id in deleted_ids:
+                newer_deleted = True
+                continue
+            if newer_deleted and stamp.is_delta:
+                crosses = newer_kept is not None and _crosses_snapshot(stamp.version, newer_kept)
+                repairs.append((stamp, None if crosses else newer_kept))
+            newer_kept, newer_deleted = stamp.version, False
+
+        if repairs:
+            contents = _load_missing_contents(
+                db,
+                (
+                    (stamp.prompt_id, version)
+                    for stamp, newer in repairs
+                    for version in (stamp.version, newer)
+                    if version is not None
+                ),
+            )
+            rows = []
+            for stamp, newer in repairs:
+                chain = contents[stamp.prompt_id]
+                content, delta = _encode_content(
+                    stamp.version, chain[stamp.version], chain[newer] if newer is not None else None
+                )
+                rows.append({"id": stamp.id, "content": content, "content_delta": delta})
+            db.execute(update(PromptVersion), rows)
+
+        db.execute(
+            delete(PromptVersion)
+            .where(PromptVersion.id.in_(deleted_ids))
+            .execution_options(synchronize_session=False)
+        )
+        db.execute(
+            delete(Prompt)
+            .where(
+                Prompt.id.in_({stamp.prompt_id for stamp in stamps}),
+                ~select(PromptVersion.id).where(PromptVersion.prompt_id == Prompt.id).exists(),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        queue_invalidation(db, PROMPTS, owner_id)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return len(deleted_ids)
 
 
 def delete_prompt_version(
@@ -163,25 +863,44 @@ def delete_prompt_version(
     owner_id: int,
     prompt_version_id: int,
 ) -> None:
-    prompt_version = _get_prompt_version_by_id(db, prompt_version_id, owner_id=owner_id)
-    if prompt_version is None:
+    if not delete_prompt_versions(db, owner_id=owner_id, prompt_version_ids=(prompt_version_id,)):
         raise PromptVersionNotFoundError("Prompt version not found.")
 
-    prompt_id = prompt_version.prompt_id
 
+def delete_prompt(db: Session, *, owner_id: int, prompt_id: int) -> None:
+    # ON DELETE CASCADE removes the versions in the same statement.
     try:
-        db.execute(delete(PromptTag).where(PromptTag.prompt_version_id == prompt_version_id))
-        db.delete(prompt_version)
-        db.flush()
+        result = db.execute(
+            delete(Prompt)
+            .where(Prompt.id == prompt_id, Prompt.owner_id == owner_id)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0:
+            raise PromptNotFoundError("Prompt not found.")
+        queue_invalidation(db, PROMPTS, owner_id)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
 
-        remaining_versions_count = db.scalar(
-            select(func.count(PromptVersion.id)).where(PromptVersion.prompt_id == prompt_id)
+def rebuild_prompt_version_storage(db: Session, *, prompt_id: int) -> None:
+    prompt_versions = (
+        db.execute(
+            select(PromptVersion)
+            .where(PromptVersion.prompt_id == prompt_id)
+            .order_by(PromptVersion.version.asc())
         )
-        if remaining_versions_count == 0:
-            prompt = db.get(Prompt, prompt_id)
-            if prompt is not None:
-                db.delete(prompt)
+        .scalars()
+        .all()
+    )
+    _materialize_contents(db, prompt_versions)
+    contents = [prompt_version.content for prompt_version in prompt_versions]
 
+    try:
+        for index, prompt_version in enumerate(prompt_versions):
+            newer_content = contents[index + 1] if index + 1 < len(contents) else None
+            _store_content(prompt_version, contents[index], newer_content)
         db.commit()
     except Exception:
         db.rollback()
@@ -0,0 +1,305 @@
+from collections.abc import Sequence
+from datetime import datetime, timedelta, timezone
+from typing import Any, NamedTuple
+
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.metrics import registry
+from app.dal.cache import PROMPTS
+from app.dal.prompt_dal import _crosses_snapshot, _materialize_contents, _store_content
+from app.db.invalidation import queue_invalidation
+from app.models.prompt import Prompt, PromptVersion, PromptVersionArchive
+from app.models.retention_policy import RetentionPolicy
+
+prompt_versions_archived = registry.counter(
+    "prompt_versions_archived_total", "Prompt versions moved to the archive by retention."
+)
+
+
+class RetentionPolicyNotFoundError(Exception):
+    pass
+
+
+class RetentionPolicyConflictError(Exception):
+    pass
+
+
+class RetentionRule(NamedTuple):
+    keep_last: int | None
+    keep_tagged: bool
+    keep_days: int | None
+
+
+class ArchivedVersionRow(NamedTuple):
+    id: int
+    name: str
+    version: int
+    content: str
+    tags: list[str]
+    metadata: dict[str, Any] | None
+    created_at: datetime
+    updated_at: datetime
+    archived_at: datetime
+
+
+def list_retention_policies(db: Session, *, owner_id: int) -> list[RetentionPolicy]:
+    statement = (
+        select(RetentionPolicy)
+        .where(RetentionPolicy.owner_id == owner_id)
+        .order_by(RetentionPolicy.prompt_name.is_not(None), RetentionPolicy.prompt_name)
+    )
+    return db.execute(statement).scalars().all()
+
+
+def set_retention_policy(
+    db: Session,
+    *,
+    owner_id: int,
+    prompt_name: str | None,
+    keep_last: int | None,
+    keep_tagged: bool,
+    keep_days: int | None,
+) -> RetentionPolicy:
+    name_condition = (
+        RetentionPolicy.prompt_name.is_(None)
+        if prompt_name is None
+        else RetentionPolicy.prompt_name == prompt_name
+    )
+    policy = db.execute(
+        select(RetentionPolicy).where(RetentionPolicy.owner_id == owner_id, name_condition)
+    ).scalar_one_or_none()
+    if policy is None:
+        policy = RetentionPolicy(owner_id=owner_id, prompt_name=prompt_name)
+        db.add(policy)
+    policy.keep_last = keep_last
+    policy.keep_tagged = keep_tagged
+    policy.keep_days = keep_days
+    policy.updated_at = datetime.now(timezone.utc)
+
+    try:
+        db.commit()
+    except IntegrityError as exc:
+        # Another request created the same policy first.
+        db.rollback()
+        raise RetentionPolicyConflictError("Retention policy was changed concurrently.") from exc
+    except Exception:
+        db.rollback()
+        raise
+
+    db.refresh(policy)
+    return policy
+
+
+def delete_retention_policy(db: Session, *, owner_id: int, policy_id: int) -> None:
+    policy = db.execute(
+        select(RetentionPolicy).where(
+            RetentionPolicy.id == policy_id, RetentionPolicy.owner_id == owner_id
+        )
+    ).scalar_one_or_none()
+    if policy is None:
+        raise RetentionPolicyNotFoundError("Retention policy not found.")
+
+    try:
+        db.delete(policy)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+
+def get_retention_rules(
+    db: Session, *, owner_ids: Sequence[int] | None = None
+) -> dict[int, dict[str | None, RetentionRule]]:
+    # owner id -> prompt name (None for the owner's default) -> rule.
+    statement = select(
+        RetentionPolicy.owner_id,
+        RetentionPolicy.prompt_name,
+        RetentionPolicy.keep_last,
+        RetentionPolicy.keep_tagged,
+        RetentionPolicy.keep_days,
+    )
+    if owner_ids is not None:
+        statement = statement.where(RetentionPolicy.owner_id.in_(owner_ids))
+
+    rules: dict[int, dict[str | None, RetentionRule]] = {}
+    for owner_id, prompt_name, *rule in db.execute(statement):
+        rules.setdefault(owner_id, {})[prompt_name] = RetentionRule._make(rule)
+    return rules
+
+
+def get_owner_prompt_ids(db: Session, *, owner_id: int) -> dict[str, int]:
+    return dict(db.execute(select(Prompt.name, Prompt.id).where(Prompt.owner_id == owner_id)).all())
+
+
+def _utc(value: datetime) -> datetime:
+    # SQLite returns stored UTC times without an offset.
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+def _pruned_versions(versions: Sequence[Any], rule: RetentionRule, now: datetime) -> list[int]:
+    # `versions` are newest first and carry `version`, `tags` and `created_at`. The
+    # latest version is never pruned, so a prompt always keeps something to resolve.
+    cutoff = now - timedelta(days=rule.keep_days) if rule.keep_days is not None else None
+    pruned: list[int] = []
+    for rank, prompt_version in enumerate(versions):
+        if rank == 0 or (rule.keep_last is not None and rank < rule.keep_last):
+            continue
+        if rule.keep_tagged and prompt_version.tags:
+            continue
+        if cutoff is not None and _utc(prompt_version.created_at) >= cutoff:
+            continue
+        pruned.append(prompt_version.version)
+    return pruned
+
+
+def _version_stamps(db: Session, prompt_id: int) -> list[Any]:
+    return db.execute(
+        select(
+            PromptVersion.version,
+            PromptVersion.tags,
+            PromptVersion.created_at,
+            PromptVersion.content_delta.is_not(None).label("is_delta"),
+        )
+        .where(PromptVersion.prompt_id == prompt_id)
+        .order_by(PromptVersion.version.desc())
+    ).all()
+
+
+def _compaction_batch(
+    stamps: Sequence[Any], rule: RetentionRule, now: datetime, batch_size: int
+) -> tuple[set[int], dict[int, int]]:
+    # The oldest `batch_size` prunable versions, and the kept deltas whose newer neighbour
+    # is among them mapped to the next kept version they are re-encoded against.
+    pruned = set(_pruned_versions(stamps, rule, now)[-batch_size:])
+    repairs: dict[int, int] = {}
+    newer_kept: int | None = None
+    for index, stamp in enumerate(stamps):
+        if stamp.version in pruned:
+            continue
+        if index > 0 and stamps[index - 1].version in pruned and stamp.is_delta:
+            repairs[stamp.version] = newer_kept
+        newer_kept = stamp.version
+    return pruned, repairs
+
+
+def compact_prompt_versions(
+    db: Session,
+    *,
+    owner_id: int,
+    prompt_id: int,
+    name: str,
+    rule: RetentionRule,
+    now: datetime,
+    batch_size: int,
+) -> int:
+    # Archives at most `batch_size` of the prompt's oldest prunable versions in one short
+    # transaction; callers repeat until fewer than `batch_size` come back. Only the batch
+    # and the kept versions around its gaps are locked and loaded, so a batch costs the
+    # same however many versions the prompt has.
+    pruned, repairs = _compaction_batch(_version_stamps(db, prompt_id), rule, now, batch_size)
+    while pruned:
+        locked = pruned | set(repairs) | set(repairs.values())
+        try:
+            # Locked so an edit cannot rewrite these rows under us. The batch is picked
+            # again once they are held; a delete that landed in between can move the gaps,
+            # and then the newly needed rows are locked on the next pass.
+            versions = {
+                prompt_version.version: prompt_version
+                for prompt_version in db.execute(
+                    select(PromptVersion)
+                    .where(PromptVersion.prompt_id == prompt_id, PromptVersion.version.in_(locked))
+                    .with_for_update()
+                ).scalars()
+            }
+            pruned, repairs = _compaction_batch(
+                _version_stamps(db, prompt_id), rule, now, batch_size
+            )
+            if not locked.issuperset(pruned | set(repairs) | set(repairs.values())):
+                db.rollback()
+                continue
+            _materialize_contents(db, versions.values())
+
+            for version in sorted(pruned):
+                prompt_version = versions[version]
+                db.add(
+                    PromptVersionArchive(
+                        owner_id=owner_id,
+                        prompt_name=name,
+                        version=prompt_version.version,
+                        content=prompt_version.content,
+                        tags=prompt_version.tags,
+                        metadata_=prompt_version.metadata_,
+                        created_at=prompt_version.created_at,
+                        updated_at=prompt_version.updated_at,
+                        archived_at=now,
+                    )
+                )
+            # A kept delta was encoded against its newer neighbour; that one is pruned, so
+            # it is stored again against the next kept version, or in full when the pruned
+            # gap held a snapshot so chain reads stay within one interval. Texts are read
+            # up front: a repaired row can be the newer side of the next repair.
+            contents = {version: row.content for version, row in versions.items()}
+            for version, newer_version in repairs.items():
+                newer_content = (
+                    None
+                    if _crosses_snapshot(version, newer_version)
+                    else contents[newer_version]
+                )
+                _store_content(versions[version], contents[version], newer_content)
+
+            db.flush()
+            db.execute(
+                delete(PromptVersion).where(
+                    PromptVersion.prompt_id == prompt_id, PromptVersion.version.in_(pruned)
+                )
+            )
+            queue_invalidation(db, PROMPTS, owner_id)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        prompt_versions_archived.inc(amount=len(pruned))
+        return len(pruned)
+
+    db.rollback()
+    return 0
+
+
+def get_archived_version_rows(
+    db: Session, *, owner_id: int, name: str, before_version: int | None, limit: int
+) -> list[ArchivedVersionRow]:
+    statement = select(
+        PromptVersionArchive.id,
+        PromptVersionArchive.prompt_name,
+        PromptVersionArchive.version,
+        PromptVersionArchive.content,
+        PromptVersionArchive.tags,
+        PromptVersionArchive.metadata_,
+        PromptVersionArchive.created_at,
+        PromptVersionArchive.updated_at,
+        PromptVersionArchive.archived_at,
+    ).where(PromptVersionArchive.owner_id == owner_id, PromptVersionArchive.prompt_name == name)
+    if before_version is not None:
+        statement = statement.where(PromptVersionArchive.version < before_version)
+    statement = statement.order_by(
+        PromptVersionArchive.version.desc(), PromptVersionArchive.id.desc()
+    ).limit(limit)
+    return [ArchivedVersionRow._make(row) for row in db.execute(statement)]
+
+
+__all__ = [
+    "ArchivedVersionRow",
+    "RetentionPolicyConflictError",
+    "RetentionPolicyNotFoundError",
+    "RetentionRule",
+    "compact_prompt_versions",
+    "delete_retention_policy",
+    "get_archived_version_rows",
+    "get_owner_prompt_ids",
+    "get_retention_rules",
+    "list_retention_policies",
+    "set_retention_policy",
+]
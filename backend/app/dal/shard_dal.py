@@ -0,0 +1,217 @@
+import hashlib
+from datetime import datetime, timezone
+from typing import NamedTuple
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from app.dal.cache import OWNER_SHARD, PROMPTS, dal_caches
+from app.db.invalidation import queue_invalidation
+from app.db.sharding import DEFAULT_SHARD
+from app.models.owner_shard import OwnerShard
+from app.models.prompt import Prompt, PromptVersion, PromptVersionArchive
+from app.models.user import User
+
+_COPY_BATCH_SIZE = 1000
+
+
+class OwnerMoveInProgressError(Exception):
+    pass
+
+
+class OwnerMoveConflictError(Exception):
+    pass
+
+
+class OwnerPlacement(NamedTuple):
+    shard: str
+    moving_to: str | None
+
+
+_DEFAULT_PLACEMENT = OwnerPlacement(shard=DEFAULT_SHARD, moving_to=None)
+
+
+def _load_owner_placement(db: Session, owner_id: int) -> OwnerPlacement:
+    row = db.execute(
+        select(OwnerShard.shard, OwnerShard.moving_to).where(OwnerShard.owner_id == owner_id)
+    ).one_or_none()
+    return OwnerPlacement._make(row) if row is not None else _DEFAULT_PLACEMENT
+
+
+def get_owner_placement(db: Session, *, owner_id: int) -> OwnerPlacement:
+    # Owners without a directory row get the default placement, which is cached as well.
+    return dal_caches.read_through(
+        OWNER_SHARD, owner_id, lambda: _load_owner_placement(db, owner_id)
+    )
+
+
+def begin_owner_move(db: Session, *, owner_id: int, target: str) -> str:
+    now = datetime.now(timezone.utc)
+    try:
+        row = db.execute(
+            select(OwnerShard).where(OwnerShard.owner_id == owner_id).with_for_update()
+        ).scalar_one_or_none()
+        if row is None:
+            row = OwnerShard(owner_id=owner_id, shard=DEFAULT_SHARD)
+            db.add(row)
+        elif row.moving_to is not None:
+            raise OwnerMoveInProgressError(f"Owner is already moving to {row.moving_to!r}.")
+        source = row.shard
+        row.moving_to = target
+        row.updated_at = now
+        queue_invalidation(db, OWNER_SHARD, owner_id)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return source
+
+
+def finish_owner_move(db: Session, *, owner_id: int, target: str) -> None:
+    try:
+        row = db.get(OwnerShard, owner_id)
+        if row is None or row.moving_to != target:
+            raise OwnerMoveConflictError("The owner's move was cancelled.")
+        if target == DEFAULT_SHARD:
+            db.delete(row)
+        else:
+            row.shard = target
+            row.moving_to = None
+            row.updated_at = datetime.now(timezone.utc)
+        queue_invalidation(db, OWNER_SHARD, owner_id)
+        # Cached reads hold the source shard's ids.
+        queue_invalidation(db, PROMPTS, owner_id)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+
+def abort_owner_move(db: Session, *, owner_id: int) -> None:
+    try:
+        row = db.get(OwnerShard, owner_id)
+        if row is not None:
+            if row.shard == DEFAULT_SHARD:
+                db.delete(row)
+            else:
+                row.moving_to = None
+                row.updated_at = datetime.now(timezone.utc)
+            queue_invalidation(db, OWNER_SHARD, owner_id)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+
+def _utc_naive(value: datetime) -> datetime:
+    # SQLite returns stored UTC times without an offset; compare both kinds as naive UTC.
+    return value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo else value
+
+
+def get_owner_data_digest(db: Session, *, owner_id: int) -> str:
+    # Ids differ between shards after a copy, so the digest covers names, version numbers
+    # and update times only. Any write to the owner's prompts changes it.
+    digest = hashlib.sha256()
+    rows = db.execute(
+        select(Prompt.name, PromptVersion.version, PromptVersion.updated_at)
+        .join(PromptVersion, PromptVersion.prompt_id == Prompt.id)
+        .where(Prompt.owner_id == owner_id)
+        .order_by(Prompt.name, PromptVersion.version)
+    )
+    for name, version, updated_at in rows:
+        digest.update(f"{name}\0{version}\0{_utc_naive(updated_at).isoformat()}\n".encode())
+    return digest.hexdigest()
+
+
+def _delete_owner_rows(db: Session, owner_id: int) -> None:
+    owner_prompt_ids = select(Prompt.id).where(Prompt.owner_id == owner_id)
+    db.execute(delete(PromptVersion).where(PromptVersion.prompt_id.in_(owner_prompt_ids)))
+    db.execute(delete(Prompt).where(Prompt.owner_id == owner_id))
+    db.execute(delete(PromptVersionArchive).where(PromptVersionArchive.owner_id == owner_id))
+
+
+def copy_owner_data(source: Session, target: Session, *, owner_id: int) -> int:
+    # One transaction on the target: a failed copy leaves nothing behind, and rows left
+    # there by an earlier aborted move are replaced. Prompts and versions get new ids.
+    try:
+        _delete_owner_rows(target, owner_id)
+        if target.get(User, owner_id) is None:
+            # Prompt rows reference their owner; authentication stays on the default shard.
+            user = source.execute(select(User.__table__).where(User.id == owner_id)).one()
+            target.execute(insert(User.__table__), [{**user._asdict(), "password_hash": ""}])
+
+        prompts = source.execute(
+            select(Prompt.id, Prompt.name, Prompt.created_at).where(Prompt.owner_id == owner_id)
+        ).all()
+        for start in range(0, len(prompts), _COPY_BATCH_SIZE):
+            target.execute(
+                insert(Prompt.__table__),
+                [
+                    {"owner_id": owner_id, "name": prompt.name, "created_at": prompt.created_at}
+                    for prompt in prompts[start : start + _COPY_BATCH_SIZE]
+                ],
+            )
+        target_ids = dict(
+            target.execute(select(Prompt.name, Prompt.id).where(Prompt.owner_id == owner_id)).all()
+        )
+        prompt_ids = {prompt.id: target_ids[prompt.name] for prompt in prompts}
+
+        # Delta chains are copied as stored; version numbers, not ids, link them.
+        copied = 0
+        versions = source.execute(
+            select(PromptVersion.__table__)
+            .join(Prompt, Prompt.id == PromptVersion.prompt_id)
+            .where(Prompt.owner_id == owner_id)
+            .order_by(PromptVersion.id)
+            .execution_options(yield_per=_COPY_BATCH_SIZE)
+        )
+        for batch in versions.partitions():
+            rows = [version._asdict() for version in batch]
+            for row in rows:
+                del row["id"]
+                row["prompt_id"] = prompt_ids[row["prompt_id"]]
+            target.execute(insert(PromptVersion.__table__), rows)
+            copied += len(rows)
+
+        # Archived versions carry the prompt name, so only their own ids change.
+        archived = source.execute(
+            select(PromptVersionArchive.__table__)
+            .where(PromptVersionArchive.owner_id == owner_id)
+            .order_by(PromptVersionArchive.id)
+            .execution_options(yield_per=_COPY_BATCH_SIZE)
+        )
+        for batch in archived.partitions():
+            rows = [version._asdict() for version in batch]
+            for row in rows:
+                del row["id"]
+            target.execute(insert(PromptVersionArchive.__table__), rows)
+        target.commit()
+    except Exception:
+        target.rollback()
+        raise
+    return copied
+
+
+def delete_owner_data(db: Session, *, owner_id: int, remove_user: bool) -> None:
+    try:
+        _delete_owner_rows(db, owner_id)
+        if remove_user:
+            db.execute(delete(User).where(User.id == owner_id))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+
+__all__ = [
+    "OwnerMoveConflictError",
+    "OwnerMoveInProgressError",
+    "OwnerPlacement",
+    "abort_owner_move",
+    "begin_owner_move",
+    "copy_owner_data",
+    "delete_owner_data",
+    "finish_owner_move",
+    "get_owner_data_digest",
+    "get_owner_placement",
+]
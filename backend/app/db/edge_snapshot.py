@@ -0,0 +1,127 @@
+import asyncio
+import logging
+import os
+from collections.abc import Callable
+from contextlib import suppress
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy import Column, MetaData, String, Table, event, select
+from sqlalchemy.engine import Engine
+
+from app.core.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+# Written by the export job next to the copied tables.
+snapshot_info = Table(
+    "edge_snapshot_info",
+    MetaData(),
+    Column("key", String(64), primary_key=True),
+    Column("value", String, nullable=False),
+)
+
+edge_snapshot_swaps = registry.counter(
+    "edge_snapshot_swaps_total", "Times a new edge snapshot file was picked up."
+)
+edge_snapshot_exported = registry.gauge(
+    "edge_snapshot_exported_timestamp_seconds", "Export time of the edge snapshot being served."
+)
+
+FileIdentity = tuple[int, int, int]
+
+
+def edge_snapshot_url(path: str) -> str:
+    # mode=ro: the serving process can never write to, or create, the snapshot file.
+    return f"sqlite:///file:{Path(path).resolve()}?mode=ro&uri=true"
+
+
+def configure_edge_connections(engine: Engine, *, mmap_bytes: int) -> None:
+    @event.listens_for(engine, "connect")
+    def _configure(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"PRAGMA mmap_size = {int(mmap_bytes)}")
+        cursor.execute("PRAGMA query_only = ON")
+        cursor.close()
+
+
+def read_exported_at(engine: Engine) -> datetime | None:
+    with engine.connect() as conn:
+        value = conn.execute(
+            select(snapshot_info.c.value).where(snapshot_info.c.key == "exported_at")
+        ).scalar_one_or_none()
+    return datetime.fromisoformat(value) if value is not None else None
+
+
+def _file_identity(path: Path) -> FileIdentity | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+class EdgeSnapshotWatcher:
+    # New snapshots arrive by rename, so a changed inode means a new file. Pooled
+    # connections are dropped and the next checkout opens the new file; requests already
+    # running keep the old inode open and finish on the snapshot they started with.
+    def __init__(
+        self,
+        path: str,
+        engine: Engine,
+        *,
+        interval_seconds: float,
+        on_swap: Callable[[], None],
+    ) -> None:
+        self.path = Path(path)
+        self.engine = engine
+        self.interval_seconds = interval_seconds
+        self.on_swap = on_swap
+        self._identity: FileIdentity | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    def check(self) -> bool:
+        identity = _file_identity(self.path)
+        if identity is None or identity == self._identity:
+            return False
+        swapped = self._identity is not None
+        self._identity = identity
+        if swapped:
+            self.engine.dispose()
+            self.on_swap()
+            edge_snapshot_swaps.inc()
+        try:
+            exported_at = read_exported_at(self.engine)
+        except Exception:
+            logger.warning("Edge snapshot %s is not readable.", self.path, exc_info=True)
+            return swapped
+        if exported_at is not None:
+            edge_snapshot_exported.set(value=exported_at.timestamp())
+        logger.info("Serving edge snapshot %s exported at %s.", self.path, exported_at)
+        return swapped
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.to_thread(self.check)
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+
+__all__ = [
+    "EdgeSnapshotWatcher",
+    "configure_edge_connections",
+    "edge_snapshot_url",
+    "read_exported_at",
+    "snapshot_info",
+]
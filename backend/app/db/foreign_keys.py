@@ -0,0 +1,18 @@
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+def enforce_sqlite_foreign_keys(engine: Engine) -> None:
+    # SQLite ignores foreign keys, and so ON DELETE CASCADE, unless each connection turns
+    # them on. Postgres always enforces them.
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine, "connect")
+    def _enforce(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys = ON")
+        cursor.close()
+
+
+__all__ = ["enforce_sqlite_foreign_keys"]
@@ -0,0 +1,198 @@
+import asyncio
+import json
+import logging
+from collections.abc import Callable, Iterable, Sequence
+from contextlib import suppress
+from dataclasses import dataclass
+
+import psycopg
+from psycopg import sql
+from sqlalchemy import event, func, select
+from sqlalchemy.engine import Connection, make_url
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "prompt_manager_invalidation"
+# Postgres rejects NOTIFY payloads of 8000 bytes or more; bigger batches flush everything.
+MAX_PAYLOAD_BYTES = 7900
+_FLUSH_ALL = "*"
+_PENDING_KEY = "pending_invalidations"
+
+
+@dataclass(frozen=True)
+class Invalidation:
+    kind: str
+    key: str
+
+
+# None asks subscribers to drop everything they hold.
+Subscriber = Callable[[Sequence[Invalidation] | None], None]
+
+
+def queue_invalidation(db: Session, kind: str, key: object) -> None:
+    # Published with the commit that makes the change visible, and dropped on rollback.
+    db.info.setdefault(_PENDING_KEY, set()).add(Invalidation(kind=kind, key=str(key)))
+
+
+def _encode(invalidations: Iterable[Invalidation]) -> str:
+    payload = json.dumps(sorted([item.kind, item.key] for item in invalidations))
+    return payload if len(payload.encode()) < MAX_PAYLOAD_BYTES else _FLUSH_ALL
+
+
+def _decode(payload: str) -> list[Invalidation] | None:
+    if payload == _FLUSH_ALL:
+        return None
+    try:
+        return [Invalidation(kind=kind, key=key) for kind, key in json.loads(payload)]
+    except (TypeError, ValueError):
+        logger.warning("Unreadable invalidation payload %r; flushing caches.", payload)
+        return None
+
+
+class InMemoryInvalidationBus:
+    # Delivers only within this process. Fine for a single worker and for tests; with
+    # several workers each one would keep serving what the others changed until TTL.
+    def __init__(self) -> None:
+        self._subscribers: list[Subscriber] = []
+
+    @property
+    def is_listening(self) -> bool:
+        return True
+
+    def subscribe(self, subscriber: Subscriber) -> None:
+        self._subscribers.append(subscriber)
+
+    def publish(self, connection: Connection, invalidations: Sequence[Invalidation]) -> None:
+        pass
+
+    def deliver(self, invalidations: Sequence[Invalidation] | None) -> None:
+        for subscriber in self._subscribers:
+            subscriber(invalidations)
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+
+class PostgresInvalidationBus(InMemoryInvalidationBus):
+    # Writers NOTIFY inside their own transaction, so the message goes out exactly when
+    # the change commits. Every worker LISTENs on a dedicated connection to each
+    # database that takes writes; while any of them is down `is_listening` is False and
+    # callers must bypass their caches.
+    def __init__(
+        self,
+        database_url: str,
+        *,
+        shard_database_urls: Sequence[str] = (),
+        channel: str = INVALIDATION_CHANNEL,
+        reconnect_seconds: float = 1.0,
+        max_reconnect_seconds: float = 30.0,
+    ) -> None:
+        super().__init__()
+        urls = [database_url] + [
+            url for url in shard_database_urls if make_url(url).get_backend_name() == "postgresql"
+        ]
+        self.conninfos = list(
+            dict.fromkeys(
+                make_url(url).set(drivername="postgresql").render_as_string(hide_password=False)
+                for url in urls
+            )
+        )
+        self.channel = channel
+        self.reconnect_seconds = reconnect_seconds
+        self.max_reconnect_seconds = max_reconnect_seconds
+        self._listening: set[str] = set()
+        self._tasks: list[asyncio.Task[None]] = []
+
+    @property
+    def is_listening(self) -> bool:
+        return len(self._listening) == len(self.conninfos)
+
+    def publish(self, connection: Connection, invalidations: Sequence[Invalidation]) -> None:
+        if connection.dialect.name != "postgresql":
+            return
+        connection.execute(select(func.pg_notify(self.channel, _encode(invalidations))))
+
+    async def _listen(self, conninfo: str) -> None:
+        async with await psycopg.AsyncConnection.connect(conninfo, autocommit=True) as conn:
+            await conn.execute(sql.SQL("LISTEN {}").format(sql.Identifier(self.channel)))
+            # Whatever was published while nobody listened is lost, so start from empty.
+            self.deliver(None)
+            self._listening.add(conninfo)
+            logger.info("Listening for cache invalidations on %s.", self.channel)
+            async for notify in conn.notifies():
+                self.deliver(_decode(notify.payload))
+
+    async def _run(self, conninfo: str) -> None:
+        delay = self.reconnect_seconds
+        while True:
+            try:
+                await self._listen(conninfo)
+            except Exception:
+                logger.warning("Cache invalidation listener disconnected.", exc_info=True)
+            finally:
+                was_listening = conninfo in self._listening
+                self._listening.discard(conninfo)
+                self.deliver(None)
+            delay = self.reconnect_seconds if was_listening else min(delay * 2, self.max_reconnect_seconds)
+            await asyncio.sleep(delay)
+
+    async def start(self) -> None:
+        if not self._tasks:
+            loop = asyncio.get_running_loop()
+            self._tasks = [loop.create_task(self._run(conninfo)) for conninfo in self.conninfos]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            with suppress(asyncio.CancelledError):
+                await task
+        self._tasks = []
+
+
+def create_invalidation_bus(
+    kind: str, database_url: str, *, shard_database_urls: Sequence[str] = ()
+) -> InMemoryInvalidationBus:
+    if not kind:
+        kind = "postgres" if make_url(database_url).get_backend_name() == "postgresql" else "memory"
+    if kind == "postgres":
+        return PostgresInvalidationBus(database_url, shard_database_urls=shard_database_urls)
+    if kind == "memory":
+        return InMemoryInvalidationBus()
+    raise ValueError(f"Unknown cache invalidation bus {kind!r}.")
+
+
+def track_invalidations(bus: InMemoryInvalidationBus) -> None:
+    # Hooked on the Session class so sessions from any sessionmaker publish.
+    @event.listens_for(Session, "before_commit")
+    def _publish_pending(session: Session) -> None:
+        pending = session.info.get(_PENDING_KEY)
+        if pending:
+            bus.publish(session.connection(), tuple(pending))
+
+    @event.listens_for(Session, "after_commit")
+    def _deliver_pending(session: Session) -> None:
+        # Local caches are cleared right away; the NOTIFY echo reaches the other workers.
+        pending = session.info.pop(_PENDING_KEY, None)
+        if pending:
+            bus.deliver(tuple(pending))
+
+    @event.listens_for(Session, "after_rollback")
+    def _discard_pending(session: Session) -> None:
+        session.info.pop(_PENDING_KEY, None)
+
+
+__all__ = [
+    "INVALIDATION_CHANNEL",
+    "InMemoryInvalidationBus",
+    "Invalidation",
+    "PostgresInvalidationBus",
+    "Subscriber",
+    "create_invalidation_bus",
+    "queue_invalidation",
+    "track_invalidations",
+]
@@ -0,0 +1,50 @@
+from dataclasses import dataclass, field
+from threading import Lock
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.interfaces import CacheStats
+
+
+@dataclass
+class QueryCacheStats:
+    hits: int = 0
+    misses: int = 0
+    uncached: int = 0
+    _lock: Lock = field(default_factory=Lock, repr=False)
+
+    def record(self, cache_hit: CacheStats | None) -> None:
+        with self._lock:
+            if cache_hit == CacheStats.CACHE_HIT:
+                self.hits += 1
+            elif cache_hit == CacheStats.CACHE_MISS:
+                self.misses += 1
+            else:
+                self.uncached += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.uncached = 0
+
+    def snapshot(self) -> dict[str, float]:
+        with self._lock:
+            cacheable = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "uncached": self.uncached,
+                "hit_rate": self.hits / cacheable if cacheable else 0.0,
+            }
+
+
+def track_query_cache(engine: Engine, stats: QueryCacheStats) -> None:
+    @event.listens_for(engine, "after_cursor_execute")
+    def _record_cache_hit(conn, cursor, statement, parameters, context, executemany) -> None:
+        stats.record(getattr(context, "cache_hit", None))
+
+
+query_cache_stats = QueryCacheStats()
+
+__all__ = ["QueryCacheStats", "query_cache_stats", "track_query_cache"]
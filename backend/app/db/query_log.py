@@ -0,0 +1,75 @@
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class QueryBudgetExceededError(AssertionError):
+    pass
+
+
+@dataclass
+class QueryLog:
+    statements: list[str] = field(default_factory=list)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def repeated(self, threshold: int = 2) -> dict[str, int]:
+        return {
+            statement: occurrences
+            for statement, occurrences in Counter(self.statements).items()
+            if occurrences >= threshold
+        }
+
+    def assert_within(self, budget: int, label: str = "block") -> None:
+        if self.count > budget:
+            listing = "\n".join(f"  {statement}" for statement in self.statements)
+            raise QueryBudgetExceededError(
+                f"{label} issued {self.count} SQL statements (budget {budget}):\n{listing}"
+            )
+
+
+@contextmanager
+def count_queries(engine: Engine) -> Iterator[QueryLog]:
+    log = QueryLog()
+
+    def _record(conn, cursor, statement, parameters, context, executemany) -> None:
+        log.statements.append(statement)
+
+    event.listen(engine, "after_cursor_execute", _record)
+    try:
+        yield log
+    finally:
+        event.remove(engine, "after_cursor_execute", _record)
+
+
+_request_query_log: ContextVar[QueryLog | None] = ContextVar("request_query_log", default=None)
+
+
+def start_request_query_log() -> QueryLog:
+    log = QueryLog()
+    _request_query_log.set(log)
+    return log
+
+
+def track_request_queries(engine: Engine) -> None:
+    @event.listens_for(engine, "after_cursor_execute")
+    def _record(conn, cursor, statement, parameters, context, executemany) -> None:
+        log = _request_query_log.get()
+        if log is not None:
+            log.statements.append(statement)
+
+
+__all__ = [
+    "QueryBudgetExceededError",
+    "QueryLog",
+    "count_queries",
+    "start_request_query_log",
+    "track_request_queries",
+]
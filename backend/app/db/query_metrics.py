@@ -0,0 +1,60 @@
+from time import perf_counter
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.metrics import (
+    db_queries_total,
+    db_query_duration_seconds,
+    get_request_stats,
+    registry,
+)
+from app.db.query_cache import QueryCacheStats
+
+db_pool_size = registry.gauge("db_pool_size", "Configured connection pool size.")
+db_pool_checked_out = registry.gauge("db_pool_checked_out", "Pooled connections in use.")
+db_pool_checked_in = registry.gauge("db_pool_checked_in", "Idle pooled connections.")
+db_pool_overflow = registry.gauge("db_pool_overflow", "Connections open beyond the pool size.")
+db_query_cache_hits = registry.counter(
+    "db_query_cache_hits_total", "Statements served from the compiled-query cache."
+)
+db_query_cache_misses = registry.counter(
+    "db_query_cache_misses_total", "Statements compiled because of a cache miss."
+)
+
+
+def track_query_metrics(engine: Engine) -> None:
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_query_timer(conn, cursor, statement, parameters, context, executemany) -> None:
+        conn.info.setdefault("query_started_at", []).append(perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _record_query(conn, cursor, statement, parameters, context, executemany) -> None:
+        elapsed = perf_counter() - conn.info["query_started_at"].pop()
+        db_queries_total.inc()
+        db_query_duration_seconds.observe(value=elapsed)
+
+        stats = get_request_stats()
+        if stats is not None:
+            stats.queries += 1
+            stats.db_seconds += elapsed
+
+
+def register_engine_collectors(engine: Engine, cache_stats: QueryCacheStats) -> None:
+    def _collect() -> None:
+        pool = engine.pool
+        # Only QueuePool-style pools report sizing; others (NullPool, StaticPool) are skipped.
+        if hasattr(pool, "checkedout"):
+            db_pool_size.set(value=pool.size())
+            db_pool_checked_out.set(value=pool.checkedout())
+            db_pool_checked_in.set(value=pool.checkedin())
+            db_pool_overflow.set(value=max(pool.overflow(), 0))
+
+        snapshot = cache_stats.snapshot()
+        db_query_cache_hits.set(value=snapshot["hits"])
+        db_query_cache_misses.set(value=snapshot["misses"])
+
+    registry.add_collector(_collect)
+
+
+__all__ = ["register_engine_collectors", "track_query_metrics"]
@@ -0,0 +1,106 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from time import perf_counter
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+
+@dataclass(frozen=True)
+class PoolStatus:
+    size: int
+    checked_out: int
+    overflow: int
+
+
+@dataclass(frozen=True)
+class ReadinessStatus:
+    database: str
+    checked_at: datetime | None = None
+    latency_ms: float | None = None
+    error: str | None = None
+    pool: PoolStatus | None = None
+
+
+class ReadinessProbe:
+    def __init__(self, engine: Engine, *, interval_seconds: float, timeout_seconds: float) -> None:
+        self.engine = engine
+        self.interval_seconds = interval_seconds
+        self.timeout_seconds = timeout_seconds
+        self._status = ReadinessStatus(database="unknown")
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="readiness-probe")
+        self._pending: asyncio.Future[float] | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def status(self) -> ReadinessStatus:
+        return self._status
+
+    def is_ready(self) -> bool:
+        status = self._status
+        if status.database != "up" or status.checked_at is None:
+            return False
+        # A stalled refresh loop must not keep reporting an old "up".
+        max_age = self.interval_seconds * 3 + self.timeout_seconds
+        return (datetime.now(timezone.utc) - status.checked_at).total_seconds() <= max_age
+
+    def _ping(self) -> float:
+        started = perf_counter()
+        with self.engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        return (perf_counter() - started) * 1000
+
+    def _pool_status(self) -> PoolStatus | None:
+        pool = self.engine.pool
+        if not hasattr(pool, "checkedout"):
+            return None
+        return PoolStatus(
+            size=pool.size(), checked_out=pool.checkedout(), overflow=max(pool.overflow(), 0)
+        )
+
+    async def refresh(self) -> ReadinessStatus:
+        # A ping that is still stuck from an earlier round is awaited again rather than
+        # started twice, so a slow database never accumulates probe threads.
+        if self._pending is None or self._pending.done():
+            self._pending = asyncio.get_running_loop().run_in_executor(self._executor, self._ping)
+
+        latency_ms: float | None = None
+        error: str | None = None
+        try:
+            latency_ms = await asyncio.wait_for(asyncio.shield(self._pending), self.timeout_seconds)
+        except asyncio.TimeoutError:
+            error = f"probe timed out after {self.timeout_seconds:g}s"
+        except Exception as exc:
+            error = type(exc).__name__
+
+        self._status = ReadinessStatus(
+            database="up" if error is None else "down",
+            checked_at=datetime.now(timezone.utc),
+            latency_ms=latency_ms,
+            error=error,
+            pool=self._pool_status(),
+        )
+        return self._status
+
+    async def _run(self) -> None:
+        while True:
+            await self.refresh()
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+
+__all__ = ["PoolStatus", "ReadinessProbe", "ReadinessStatus"]
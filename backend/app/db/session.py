@@ -1,17 +1,158 @@
-from collections.abc import Generator
+from collections.abc import Callable, Generator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from typing import Any, cast
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.config import settings
+from app.dal.cache import dal_caches, register_cache_collectors
+from app.dal.coalescing import forget_prompt_reads
+from app.db.edge_snapshot import (
+    EdgeSnapshotWatcher,
+    configure_edge_connections,
+    edge_snapshot_url,
+)
+from app.db.foreign_keys import enforce_sqlite_foreign_keys
+from app.db.invalidation import create_invalidation_bus, track_invalidations
+from app.db.query_cache import query_cache_stats, track_query_cache
+from app.db.query_log import track_request_queries
+from app.db.query_metrics import register_engine_collectors, track_query_metrics
+from app.db.readiness import ReadinessProbe
+from app.db.sharding import DEFAULT_SHARD, ShardRouter
+from app.db.slow_queries import SlowQueryLog, track_slow_queries
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+
+def _connect_args(database_url: str) -> dict[str, Any]:
+    if make_url(database_url).get_driver_name() != "psycopg":
+        return {}
+
+    # PgBouncer in transaction mode hands each transaction a different server
+    # connection, so server-side prepared statements must stay disabled there.
+    prepare_threshold = None if settings.DB_PGBOUNCER else settings.DB_PREPARE_THRESHOLD
+    return {"prepare_threshold": prepare_threshold}
+
+
+def _create_engine(url: str) -> Engine:
+    engine = create_engine(
+        url,
+        pool_pre_ping=True,
+        query_cache_size=settings.DB_QUERY_CACHE_SIZE,
+        connect_args=_connect_args(url),
+    )
+    enforce_sqlite_foreign_keys(engine)
+    track_query_cache(engine, query_cache_stats)
+    if settings.METRICS_ENABLED:
+        track_query_metrics(engine)
+    if settings.QUERY_AUDIT:
+        track_request_queries(engine)
+    return engine
+
+
+EDGE_MODE = bool(settings.EDGE_SNAPSHOT_PATH)
+database_url = (
+    edge_snapshot_url(settings.EDGE_SNAPSHOT_PATH) if EDGE_MODE else settings.DATABASE_URL
+)
+engine = _create_engine(database_url)
+if EDGE_MODE:
+    configure_edge_connections(engine, mmap_bytes=settings.EDGE_SNAPSHOT_MMAP_BYTES)
+if settings.METRICS_ENABLED:
+    register_engine_collectors(engine, query_cache_stats)
+# An edge snapshot already holds only the owners it serves.
+shard_engines = (
+    {}
+    if EDGE_MODE
+    else {name: _create_engine(url) for name, url in settings.DATABASE_SHARDS.items()}
+)
+slow_query_log = SlowQueryLog(max_entries=settings.SLOW_QUERY_LOG_SIZE)
+slow_query_explain_executor: ThreadPoolExecutor | None = None
+if settings.SLOW_QUERY_LOG_ENABLED:
+    slow_query_explain_executor = track_slow_queries(
+        engine,
+        slow_query_log,
+        threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+        explain=settings.SLOW_QUERY_EXPLAIN,
+    )
+readiness_probe = ReadinessProbe(
+    engine,
+    interval_seconds=settings.READINESS_PROBE_INTERVAL_SECONDS,
+    timeout_seconds=settings.READINESS_PROBE_TIMEOUT_SECONDS,
+)
+# An edge node has no writers to hear from; only a snapshot swap changes its data.
+invalidation_bus = create_invalidation_bus(
+    "memory" if EDGE_MODE else settings.CACHE_INVALIDATION_BUS,
+    settings.CACHE_INVALIDATION_DATABASE_URL,
+    shard_database_urls=[] if EDGE_MODE else list(settings.DATABASE_SHARDS.values()),
+)
+track_invalidations(invalidation_bus)
+invalidation_bus.subscribe(forget_prompt_reads)
+if settings.CACHE_ENABLED:
+    dal_caches.attach(invalidation_bus)
+    if settings.METRICS_ENABLED:
+        register_cache_collectors(dal_caches)
+edge_snapshot_watcher: EdgeSnapshotWatcher | None = None
+if EDGE_MODE:
+    edge_snapshot_watcher = EdgeSnapshotWatcher(
+        settings.EDGE_SNAPSHOT_PATH,
+        engine,
+        interval_seconds=settings.EDGE_SNAPSHOT_POLL_SECONDS,
+        on_swap=lambda: invalidation_bus.deliver(None),
+    )
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+shard_router = ShardRouter(
+    {
+        DEFAULT_SHARD: SessionLocal,
+        **{
+            name: sessionmaker(bind=shard, autocommit=False, autoflush=False)
+            for name, shard in shard_engines.items()
+        },
+    }
+)
+
+
+# Requests rejected before touching the database never build a session or check
+# out a pooled connection.
+class LazySession:
+    __slots__ = ("_factory", "_session")
+
+    def __init__(self, factory: Callable[[], Session]) -> None:
+        self._factory = factory
+        self._session: Session | None = None
+
+    @property
+    def is_started(self) -> bool:
+        return self._session is not None
+
+    def __getattr__(self, name: str) -> Any:
+        if self._session is None:
+            self._session = self._factory()
+        return getattr(self._session, name)
+
+    def close(self) -> None:
+        if self._session is not None:
+            self._session.close()
+            self._session = None
 
 
 def get_db() -> Generator[Session, None, None]:
-    db = SessionLocal()
+    db = LazySession(SessionLocal)
     try:
-        yield db
+        yield cast(Session, db)
     finally:
         db.close()
+
+
+SHUTDOWN_FLUSH_SECONDS = 5
+
+
+def close_engine(*, timeout_seconds: float = SHUTDOWN_FLUSH_SECONDS) -> None:
+    # Runs after in-flight requests have drained. The plan-capture executor has a single
+    # thread, so once a sentinel task finishes every capture queued before it has too.
+    if slow_query_explain_executor is not None:
+        with suppress(TimeoutError):
+            slow_query_explain_executor.submit(lambda: None).result(timeout=timeout_seconds)
+    engine.dispose()
+    for shard in shard_engines.values():
+        shard.dispose()
@@ -0,0 +1,32 @@
+from sqlalchemy.orm import Session, sessionmaker
+
+# The database behind DATABASE_URL. It also holds users, API keys and the owner directory.
+DEFAULT_SHARD = "default"
+
+
+class UnknownShardError(Exception):
+    pass
+
+
+class ShardRouter:
+    def __init__(self, sessionmakers: dict[str, sessionmaker[Session]]) -> None:
+        if DEFAULT_SHARD not in sessionmakers:
+            raise ValueError(f"The {DEFAULT_SHARD!r} shard must be configured.")
+        self._sessionmakers = sessionmakers
+
+    @property
+    def is_sharded(self) -> bool:
+        return len(self._sessionmakers) > 1
+
+    @property
+    def names(self) -> list[str]:
+        return list(self._sessionmakers)
+
+    def sessionmaker(self, shard: str) -> sessionmaker[Session]:
+        try:
+            return self._sessionmakers[shard]
+        except KeyError:
+            raise UnknownShardError(f"Shard {shard!r} is not configured.") from None
+
+
+__all__ = ["DEFAULT_SHARD", "ShardRouter", "UnknownShardError"]
@@ -0,0 +1,163 @@
+import logging
+import re
+import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from threading import Lock
+from time import perf_counter
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.request_context import get_current_route
+
+logger = logging.getLogger(__name__)
+
+# Bind names are generated from columns (`email_1`, `owner_id_2`) or are anonymous
+# (`param_1`, expanded IN lists), so values are redacted unless the name, without its
+# numeric suffix, is one of these or ends in `_id`.
+SAFE_PARAMETER_NAMES = frozenset(
+    {
+        "id",
+        "version",
+        "is_active",
+        "created_at",
+        "updated_at",
+        "archived_at",
+        "revoked_at",
+        "last_used_at",
+    }
+)
+_BIND_SUFFIX = re.compile(r"(_\d+)+$")
+MAX_PARAMETER_LENGTH = 200
+REDACTED = "[redacted]"
+
+
+@dataclass
+class SlowQuery:
+    recorded_at: datetime
+    duration_ms: float
+    statement: str
+    parameters: dict[str, Any]
+    caller: str | None
+    route: str | None
+    plan: str | None = None
+    plan_error: str | None = None
+
+
+@dataclass
+class SlowQueryLog:
+    max_entries: int
+    _entries: deque[SlowQuery] = field(init=False)
+    _lock: Lock = field(default_factory=Lock, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._entries = deque(maxlen=self.max_entries)
+
+    def add(self, entry: SlowQuery) -> None:
+        with self._lock:
+            self._entries.append(entry)
+
+    def entries(self) -> list[SlowQuery]:
+        with self._lock:
+            return list(reversed(self._entries))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def _is_safe_parameter(name: str) -> bool:
+    base = _BIND_SUFFIX.sub("", name.lower())
+    return base in SAFE_PARAMETER_NAMES or base.endswith("_id")
+
+
+def _redact_parameters(parameters: dict[str, Any]) -> dict[str, Any]:
+    redacted: dict[str, Any] = {}
+    for name, value in parameters.items():
+        if not _is_safe_parameter(name):
+            redacted[name] = REDACTED
+        elif isinstance(value, str) and len(value) > MAX_PARAMETER_LENGTH:
+            redacted[name] = f"{value[:MAX_PARAMETER_LENGTH]}... ({len(value)} chars)"
+        elif isinstance(value, (str, int, float, bool)) or value is None:
+            redacted[name] = value
+        elif isinstance(value, datetime):
+            redacted[name] = value.isoformat()
+        else:
+            redacted[name] = repr(value)
+    return redacted
+
+
+def _find_dal_caller() -> str | None:
+    frame = sys._getframe(1)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith("app.dal."):
+            return f"{module}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return None
+
+
+def _is_explainable(statement: str) -> bool:
+    # EXPLAIN ANALYZE executes the statement, so only plain reads are replayed.
+    return statement.lstrip().upper().startswith("SELECT")
+
+
+def track_slow_queries(
+    engine: Engine,
+    slow_query_log: SlowQueryLog,
+    *,
+    threshold_ms: float,
+    explain: bool,
+) -> ThreadPoolExecutor:
+    explain_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow-query-explain")
+    can_explain = explain and engine.dialect.name == "postgresql"
+
+    def _capture_plan(entry: SlowQuery, statement: str, parameters: Any) -> None:
+        try:
+            with engine.connect().execution_options(slow_query_log=False) as conn:
+                conn.exec_driver_sql("SET TRANSACTION READ ONLY")
+                rows = conn.exec_driver_sql(f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters)
+                entry.plan = "\n".join(row[0] for row in rows)
+        except Exception as exc:
+            entry.plan_error = str(exc)
+            logger.debug("Could not capture plan for slow query.", exc_info=True)
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_timer(conn, cursor, statement, parameters, context, executemany) -> None:
+        conn.info.setdefault("slow_query_started_at", []).append(perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _record_if_slow(conn, cursor, statement, parameters, context, executemany) -> None:
+        duration_ms = (perf_counter() - conn.info["slow_query_started_at"].pop()) * 1000
+        if duration_ms < threshold_ms or context.execution_options.get("slow_query_log") is False:
+            return
+
+        compiled_parameters = context.compiled_parameters[0] if context.compiled_parameters else {}
+        entry = SlowQuery(
+            recorded_at=datetime.now(timezone.utc),
+            duration_ms=duration_ms,
+            statement=statement,
+            parameters=_redact_parameters(compiled_parameters),
+            caller=_find_dal_caller(),
+            route=get_current_route(),
+        )
+        slow_query_log.add(entry)
+        logger.warning(
+            "Slow query (%.1f ms) from %s on %s: %s",
+            duration_ms,
+            entry.caller,
+            entry.route,
+            " ".join(statement.split()),
+        )
+
+        if can_explain and not executemany and _is_explainable(statement):
+            explain_executor.submit(_capture_plan, entry, statement, parameters)
+
+    return explain_executor
+
+
+__all__ = ["SlowQuery", "SlowQueryLog", "track_slow_queries"]
@@ -0,0 +1,45 @@
+from collections.abc import Callable
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.dal import api_key_dal, auth_dal, prompt_dal
+
+# No user or prompt has id 0 or this name, so the statements run for real against
+# empty index ranges without touching data.
+_WARMUP_ID = 0
+_WARMUP_NAME = "__warmup__"
+
+
+def _open_connections(engine: Engine, count: int) -> None:
+    pool_size = engine.pool.size() if hasattr(engine.pool, "size") else count
+    connections = [engine.connect() for _ in range(min(count, pool_size))]
+    for connection in connections:
+        connection.close()
+
+
+def _compile_read_statements(db: Session) -> None:
+    # Every filter combination of the prompt read path is its own compiled-cache entry.
+    for name in (None, _WARMUP_NAME):
+        for tag in (None, _WARMUP_NAME):
+            for limit in (None, 1):
+                prompt_dal.get_prompt_version_rows(
+                    db, name=name, tag=tag, owner_id=_WARMUP_ID, limit=limit
+                )
+    prompt_dal.get_prompt_version_rows(
+        db, name=None, tag=None, owner_id=_WARMUP_ID, tags_any=[_WARMUP_NAME]
+    )
+    auth_dal.get_user_row_by_id(db, user_id=_WARMUP_ID)
+    api_key_dal.get_active_key_row_by_hash(db, key_hash=_WARMUP_NAME)
+
+
+def warm_up_database(
+    engine: Engine, session_factory: Callable[[], Session], *, connections: int
+) -> None:
+    _open_connections(engine, connections)
+    with session_factory() as db:
+        _compile_read_statements(db)
+        db.rollback()
+
+
+__all__ = ["warm_up_database"]
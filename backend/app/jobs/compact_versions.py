@@ -0,0 +1,90 @@
+import argparse
+import time
+from datetime import datetime, timezone
+
+from app.dal import retention_dal, shard_dal
+from app.db.session import SessionLocal, close_engine, shard_router
+
+
+def compact_owner(
+    owner_id: int,
+    rules: dict[str | None, retention_dal.RetentionRule],
+    *,
+    batch_size: int,
+    pause_seconds: float,
+) -> int:
+    # Every batch is its own short transaction that locks one prompt's versions, and the
+    # pause between batches lets queued writes through.
+    with SessionLocal() as directory:
+        placement = shard_dal.get_owner_placement(directory, owner_id=owner_id)
+    if placement.moving_to is not None:
+        # The move's digest check would fail on archived rows; the next run picks it up.
+        return 0
+
+    now = datetime.now(timezone.utc)
+    archived = 0
+    with shard_router.sessionmaker(placement.shard)() as db:
+        prompt_ids = retention_dal.get_owner_prompt_ids(db, owner_id=owner_id)
+        for name, prompt_id in prompt_ids.items():
+            rule = rules.get(name, rules.get(None))
+            if rule is None:
+                continue
+            while True:
+                count = retention_dal.compact_prompt_versions(
+                    db,
+                    owner_id=owner_id,
+                    prompt_id=prompt_id,
+                    name=name,
+                    rule=rule,
+                    now=now,
+                    batch_size=batch_size,
+                )
+                archived += count
+                if count < batch_size:
+                    break
+                time.sleep(pause_seconds)
+    return archived
+
+
+def compact_versions(
+    *, owner_ids: list[int] | None, batch_size: int, pause_seconds: float
+) -> dict[int, int]:
+    with SessionLocal() as directory:
+        rules = retention_dal.get_retention_rules(directory, owner_ids=owner_ids)
+    return {
+        owner_id: compact_owner(
+            owner_id, owner_rules, batch_size=batch_size, pause_seconds=pause_seconds
+        )
+        for owner_id, owner_rules in sorted(rules.items())
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Move prompt versions pruned by retention policies to the archive."
+    )
+    parser.add_argument(
+        "--owner-id",
+        type=int,
+        action="append",
+        dest="owner_ids",
+        help="Only compact this owner (repeatable). Defaults to every owner with a policy.",
+    )
+    parser.add_argument("--batch-size", type=int, default=200, help="Versions per transaction.")
+    parser.add_argument(
+        "--pause-seconds", type=float, default=0.1, help="Sleep between batches of one prompt."
+    )
+    args = parser.parse_args()
+
+    try:
+        archived = compact_versions(
+            owner_ids=args.owner_ids, batch_size=args.batch_size, pause_seconds=args.pause_seconds
+        )
+    finally:
+        close_engine()
+    for owner_id, count in archived.items():
+        print(f"Owner {owner_id}: archived {count} prompt versions.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+import argparse
+import json
+import os
+import tempfile
+import time
+from collections.abc import Sequence
+from contextlib import suppress
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from app.dal import prompt_dal, shard_dal
+from app.db.base import Base
+from app.db.edge_snapshot import snapshot_info
+from app.db.session import SessionLocal, close_engine, shard_router
+from app.db.sharding import DEFAULT_SHARD
+from app.models.prompt import Prompt, PromptVersion, PromptVersionArchive
+from app.models.retention_policy import RetentionPolicy
+from app.models.user import User
+from app.models.user_api_key import UserApiKey
+
+EDGE_TABLES = (
+    User.__table__,
+    UserApiKey.__table__,
+    Prompt.__table__,
+    PromptVersion.__table__,
+    PromptVersionArchive.__table__,
+    RetentionPolicy.__table__,
+)
+# GIN indexes on Postgres; on SQLite they would index JSON text no filter can use.
+SKIPPED_INDEXES = ("ix_prompt_versions_metadata", "ix_prompt_versions_tags")
+INSERT_BATCH_SIZE = 1000
+MOVE_POLL_SECONDS = 1.0
+
+
+def _utc(value: datetime | None) -> datetime | None:
+    # SQLite keeps datetimes without an offset, so everything is written as UTC.
+    return value.astimezone(timezone.utc) if value is not None else None
+
+
+def _rows(source: Session, table: Any, condition: Any) -> list[dict[str, Any]]:
+    return [
+        {key: _utc(value) if isinstance(value, datetime) else value for key, value in row.items()}
+        for row in source.execute(select(table).where(condition)).mappings()
+    ]
+
+
+def _version_rows(source: Session, owner_id: int) -> list[dict[str, Any]]:
+    # Read through the DAL so delta-stored versions are written with their full content.
+    return [
+        {
+            "id": prompt_version.id,
+            "prompt_id": prompt_version.prompt_id,
+            "version": prompt_version.version,
+            "content": prompt_version.content,
+            "content_delta": None,
+            "tags": prompt_version.tags,
+            "metadata": prompt_version.metadata_,
+            "created_at": _utc(prompt_version.created_at),
+            "updated_at": _utc(prompt_version.updated_at),
+        }
+        for prompt_version in prompt_dal.get_prompt_versions(
+            source, name=None, tag=None, owner_id=owner_id
+        )
+    ]
+
+
+class _Ids:
+    # Shards number prompts and versions independently. A row keeps its id unless a row
+    # from another shard already holds it; ids change on a move anyway.
+    def __init__(self) -> None:
+        self._used: set[int] = set()
+        self._top = 0
+
+    def assign(self, source_id: int) -> int:
+        if source_id in self._used:
+            source_id = self._top + 1
+        self._used.add(source_id)
+        self._top = max(self._top, source_id)
+        return source_id
+
+
+def _read_owner(source: Session, owner_id: int) -> dict[str, list[dict[str, Any]]]:
+    if source.get_bind().dialect.name == "postgresql":
+        # One snapshot for every read, so a version never arrives without its prompt.
+        source.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+    return {
+        "prompts": _rows(source, Prompt.__table__, Prompt.owner_id == owner_id),
+        "versions": _version_rows(source, owner_id),
+        "archived": _rows(
+            source, PromptVersionArchive.__table__, PromptVersionArchive.owner_id == owner_id
+        ),
+    }
+
+
+def _read_placed_owner(
+    owner_id: int, *, move_wait_seconds: float
+) -> tuple[str, dict[str, list[dict[str, Any]]]]:
+    # The owner's rows are read from its shard, with the placement checked uncached before
+    # and after: a move that starts or finishes meanwhile may have deleted what was read.
+    # Owners being moved are waited for; exporting the half that is copied would publish
+    # an inconsistent owner.
+    deadline = time.monotonic() + move_wait_seconds
+    while True:
+        with SessionLocal() as directory:
+            placement = shard_dal._load_owner_placement(directory, owner_id)
+        if placement.moving_to is None:
+            with shard_router.sessionmaker(placement.shard)() as source:
+                rows = _read_owner(source, owner_id)
+            with SessionLocal() as directory:
+                if shard_dal._load_owner_placement(directory, owner_id) == placement:
+                    return placement.shard, rows
+        if time.monotonic() >= deadline:
+            raise shard_dal.OwnerMoveInProgressError(
+                f"Owner {owner_id} was still moving after {move_wait_seconds:g}s."
+            )
+        time.sleep(MOVE_POLL_SECONDS)
+
+
+def export_edge_snapshot(
+    output: str | os.PathLike[str], *, owner_ids: Sequence[int], move_wait_seconds: float
+) -> dict[str, int]:
+    # Users, API keys and policies come from the default database, each owner's prompts
+    # from its shard. Everything is read before the file is started, so an owner that
+    # never settles fails the export and leaves the previous snapshot in place.
+    placed = {
+        owner_id: _read_placed_owner(owner_id, move_wait_seconds=move_wait_seconds)
+        for owner_id in owner_ids
+    }
+    with SessionLocal() as source:
+        users = [
+            {**row, "password_hash": ""}
+            for row in _rows(source, User.__table__, User.id.in_(owner_ids))
+        ]
+        api_keys = _rows(
+            source,
+            UserApiKey.__table__,
+            UserApiKey.user_id.in_(owner_ids) & UserApiKey.revoked_at.is_(None),
+        )
+        policies = _rows(source, RetentionPolicy.__table__, RetentionPolicy.owner_id.in_(owner_ids))
+
+    prompts: list[dict[str, Any]] = []
+    versions: list[dict[str, Any]] = []
+    archived: list[dict[str, Any]] = []
+    prompt_ids, version_ids, archive_ids = _Ids(), _Ids(), _Ids()
+    # Default-shard owners first, so their ids are the ones kept.
+    for _, rows in sorted(placed.values(), key=lambda item: item[0] != DEFAULT_SHARD):
+        new_prompt_ids = {row["id"]: prompt_ids.assign(row["id"]) for row in rows["prompts"]}
+        prompts.extend({**row, "id": new_prompt_ids[row["id"]]} for row in rows["prompts"])
+        versions.extend(
+            {
+                **row,
+                "id": version_ids.assign(row["id"]),
+                "prompt_id": new_prompt_ids[row["prompt_id"]],
+            }
+            for row in rows["versions"]
+        )
+        archived.extend({**row, "id": archive_ids.assign(row["id"])} for row in rows["archived"])
+
+    # Builds the file next to its destination and renames it into place, so an edge node
+    # polling `output` only ever opens a complete, analyzed snapshot.
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{output.name}.", dir=output.parent)
+    os.close(fd)
+    target = create_engine(f"sqlite:///{tmp_name}")
+    try:
+        Base.metadata.create_all(target, tables=EDGE_TABLES)
+        snapshot_info.create(target)
+
+        info = {
+            "exported_at": datetime.now(timezone.utc).isoformat(),
+            "owner_ids": json.dumps(sorted(owner_ids)),
+        }
+
+        with target.begin() as conn:
+            for table, rows in (
+                (User.__table__, users),
+                (UserApiKey.__table__, api_keys),
+                (Prompt.__table__, prompts),
+                (PromptVersion.__table__, versions),
+                (PromptVersionArchive.__table__, archived),
+                (RetentionPolicy.__table__, policies),
+            ):
+                for start in range(0, len(rows), INSERT_BATCH_SIZE):
+                    conn.execute(insert(table), rows[start : start + INSERT_BATCH_SIZE])
+            conn.execute(
+                insert(snapshot_info), [{"key": key, "value": value} for key, value in info.items()]
+            )
+        with target.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            for index_name in SKIPPED_INDEXES:
+                conn.exec_driver_sql(f"DROP INDEX IF EXISTS {index_name}")
+            conn.exec_driver_sql("ANALYZE")
+            conn.exec_driver_sql("VACUUM")
+        target.dispose()
+        os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, output)
+    except BaseException:
+        target.dispose()
+        with suppress(OSError):
+            os.unlink(tmp_name)
+        raise
+    return {
+        "users": len(users),
+        "api_keys": len(api_keys),
+        "prompts": len(prompts),
+        "prompt_versions": len(versions),
+        "archived_versions": len(archived),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Export owners' prompts and API keys into a read-only edge snapshot."
+    )
+    parser.add_argument("--owner-id", type=int, action="append", required=True)
+    parser.add_argument("--output", type=Path, required=True)
+    parser.add_argument(
+        "--move-wait-seconds",
+        type=float,
+        default=60,
+        help="How long to wait for an owner that is moving between shards before failing.",
+    )
+    args = parser.parse_args()
+
+    try:
+        counts = export_edge_snapshot(
+            args.output, owner_ids=args.owner_id, move_wait_seconds=args.move_wait_seconds
+        )
+    finally:
+        close_engine()
+    print(f"Exported {counts} -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
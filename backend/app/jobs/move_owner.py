@@ -0,0 +1,73 @@
+import argparse
+import time
+
+from app.dal import shard_dal
+from app.db.session import SessionLocal, close_engine, shard_router
+from app.db.sharding import DEFAULT_SHARD
+
+
+def move_owner(owner_id: int, target: str, *, drain_seconds: float) -> int:
+    # 1. Mark the owner as moving; API workers start answering its writes with 503.
+    # 2. Wait out writes that were already running, then copy to the target and check
+    #    that the source did not change while copying.
+    # 3. Point the directory at the target, wait until workers have re-routed, and only
+    #    then delete the source rows. Reads keep working throughout.
+    target_sessions = shard_router.sessionmaker(target)
+    with SessionLocal() as directory:
+        source = shard_dal.begin_owner_move(directory, owner_id=owner_id, target=target)
+    try:
+        if source == target:
+            raise shard_dal.OwnerMoveConflictError(f"Owner is already on {target!r}.")
+        source_sessions = shard_router.sessionmaker(source)
+        time.sleep(drain_seconds)
+        with source_sessions() as source_db, target_sessions() as target_db:
+            before = shard_dal.get_owner_data_digest(source_db, owner_id=owner_id)
+            copied = shard_dal.copy_owner_data(source_db, target_db, owner_id=owner_id)
+            # A new transaction, so the check sees writes committed during the copy.
+            source_db.rollback()
+            after = shard_dal.get_owner_data_digest(source_db, owner_id=owner_id)
+            copy = shard_dal.get_owner_data_digest(target_db, owner_id=owner_id)
+        if not before == after == copy:
+            raise shard_dal.OwnerMoveConflictError("Prompts changed while they were copied.")
+        with SessionLocal() as directory:
+            shard_dal.finish_owner_move(directory, owner_id=owner_id, target=target)
+    except BaseException:
+        with SessionLocal() as directory:
+            shard_dal.abort_owner_move(directory, owner_id=owner_id)
+        raise
+
+    time.sleep(drain_seconds)
+    with source_sessions() as source_db:
+        # A worker that had not re-routed yet may have written to the source; those rows
+        # are left in place for a manual merge instead of being deleted.
+        if shard_dal.get_owner_data_digest(source_db, owner_id=owner_id) != before:
+            raise shard_dal.OwnerMoveConflictError(
+                f"Prompts changed on {source!r} after the switch; source rows were kept."
+            )
+        shard_dal.delete_owner_data(
+            source_db, owner_id=owner_id, remove_user=source != DEFAULT_SHARD
+        )
+    return copied
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Move an owner's prompts to another shard.")
+    parser.add_argument("--owner-id", type=int, required=True)
+    parser.add_argument("--to", required=True, help=f"{DEFAULT_SHARD!r} or a DATABASE_SHARDS name.")
+    parser.add_argument(
+        "--drain-seconds",
+        type=float,
+        default=5,
+        help="Wait for in-flight requests and cache invalidations at each switch.",
+    )
+    args = parser.parse_args()
+
+    try:
+        copied = move_owner(args.owner_id, args.to, drain_seconds=args.drain_seconds)
+    finally:
+        close_engine()
+    print(f"Moved owner {args.owner_id} to {args.to!r} ({copied} prompt versions).")
+
+
+if __name__ == "__main__":
+    main()
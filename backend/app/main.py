@@ -1,10 +1,81 @@
+import asyncio
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.api.metrics import router as metrics_router, worker_metrics
+from app.api.middleware import (
+    LoadSheddingMiddleware,
+    MetricsMiddleware,
+    QueryAuditMiddleware,
+    ReadOnlyMiddleware,
+)
+from app.api.probes import router as probes_router
 from app.api.v1.router import api_router
 from app.core.config import settings
+from app.core.request_context import RequestContextMiddleware
+from app.core.security import load_crypto_backends
+from app.db.session import (
+    EDGE_MODE,
+    SessionLocal,
+    close_engine,
+    edge_snapshot_watcher,
+    engine,
+    invalidation_bus,
+    readiness_probe,
+)
+from app.db.warmup import warm_up_database
+
+logger = logging.getLogger(__name__)
+
+
+def _warm_up() -> None:
+    load_crypto_backends()
+    try:
+        warm_up_database(engine, SessionLocal, connections=settings.DB_WARMUP_CONNECTIONS)
+    except Exception:
+        # A database that is down at boot is reported by /readyz; the worker still starts.
+        logger.warning("Database warm-up failed.", exc_info=True)
+
+
+# Lifespan runs in each worker after fork, so pooled connections are opened per process.
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    if settings.STARTUP_WARMUP:
+        await asyncio.to_thread(_warm_up)
+    await invalidation_bus.start()
+    readiness_probe.start()
+    if edge_snapshot_watcher is not None:
+        edge_snapshot_watcher.start()
+    if settings.METRICS_ENABLED and worker_metrics is not None:
+        worker_metrics.start()
+    yield
+    if settings.METRICS_ENABLED and worker_metrics is not None:
+        await worker_metrics.stop()
+    if edge_snapshot_watcher is not None:
+        await edge_snapshot_watcher.stop()
+    await readiness_probe.stop()
+    await invalidation_bus.stop()
+    await asyncio.to_thread(close_engine)
+
 
-app = FastAPI(title=settings.PROJECT_NAME)
+app = FastAPI(title=settings.PROJECT_NAME, lifespan=lifespan)
+if settings.SLOW_QUERY_LOG_ENABLED:
+    app.add_middleware(RequestContextMiddleware)
+if settings.QUERY_AUDIT:
+    app.add_middleware(QueryAuditMiddleware)
+if EDGE_MODE:
+    app.add_middleware(ReadOnlyMiddleware)
+if settings.LOAD_SHEDDING_ENABLED:
+    app.add_middleware(LoadSheddingMiddleware)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(metrics_router)
+# Added last so it is the outermost middleware and the shedder's 503s and read-only 405s
+# still carry CORS headers.
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.FRONTEND_ORIGINS,
@@ -12,4 +83,5 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.include_router(probes_router)
 app.include_router(api_router, prefix=settings.API_V1_PREFIX)
@@ -1,5 +1,15 @@
-from app.models.prompt import Prompt, PromptTag, PromptVersion
+from app.models.owner_shard import OwnerShard
+from app.models.prompt import Prompt, PromptVersion, PromptVersionArchive
+from app.models.retention_policy import RetentionPolicy
 from app.models.user import User
 from app.models.user_api_key import UserApiKey
 
-__all__ = ["Prompt", "PromptVersion", "PromptTag", "User", "UserApiKey"]
+__all__ = [
+    "OwnerShard",
+    "Prompt",
+    "PromptVersion",
+    "PromptVersionArchive",
+    "RetentionPolicy",
+    "User",
+    "UserApiKey",
+]
@@ -0,0 +1,18 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class OwnerShard(Base):
+    # Directory of owners placed outside the default database. Owners without a row
+    # live on the default shard.
+    __tablename__ = "owner_shards"
+
+    owner_id: Mapped[int] = mapped_column(ForeignKey("users.id"), primary_key=True)
+    shard: Mapped[str] = mapped_column(String(64), nullable=False)
+    # Set while the owner's prompts are copied to another shard; writes wait until cleared.
+    moving_to: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
@@ -1,6 +1,19 @@
 from datetime import datetime
+from typing import Any
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text, UniqueConstraint
+from sqlalchemy import (
+    CheckConstraint,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    JSON,
+    String,
+    Text,
+    UniqueConstraint,
+    text,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -10,37 +23,85 @@ class Prompt(Base):
     __tablename__ = "prompts"
     __table_args__ = (UniqueConstraint("owner_id", "name", name="uq_prompts_owner_name"),)
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
-    owner_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False, index=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    owner_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
     name: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
 
     owner: Mapped["User"] = relationship(back_populates="prompts")
-    versions: Mapped[list["PromptVersion"]] = relationship(back_populates="prompt")
+    # The database deletes a prompt's versions with it.
+    versions: Mapped[list["PromptVersion"]] = relationship(
+        back_populates="prompt", passive_deletes=True
+    )
 
 
 class PromptVersion(Base):
     __tablename__ = "prompt_versions"
-    __table_args__ = (UniqueConstraint("prompt_id", "version", name="uq_prompt_version"),)
+    __table_args__ = (
+        UniqueConstraint("prompt_id", "version", name="uq_prompt_version"),
+        CheckConstraint(
+            "content IS NOT NULL OR content_delta IS NOT NULL",
+            name="ck_prompt_versions_content_stored",
+        ),
+        # jsonb_path_ops only serves @> containment, which is all the metadata filters use,
+        # and is much smaller than the default jsonb_ops.
+        Index(
+            "ix_prompt_versions_metadata",
+            "metadata",
+            postgresql_using="gin",
+            postgresql_ops={"metadata": "jsonb_path_ops"},
+        ),
+        Index("ix_prompt_versions_tags", "tags", postgresql_using="gin"),
+    )
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
-    prompt_id: Mapped[int] = mapped_column(ForeignKey("prompts.id"), nullable=False, index=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    prompt_id: Mapped[int] = mapped_column(
+        ForeignKey("prompts.id", ondelete="CASCADE"), nullable=False
+    )
     version: Mapped[int] = mapped_column(Integer, nullable=False)
-    content: Mapped[str] = mapped_column(Text, nullable=False)
+    content: Mapped[str | None] = mapped_column(Text, nullable=True)
+    content_delta: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Insertion-ordered and without duplicates; the first entry is the version's `tag`.
+    tags: Mapped[list[str]] = mapped_column(
+        ARRAY(String(64)).with_variant(JSON(), "sqlite"),
+        nullable=False,
+        default=list,
+        server_default=text("'{}'"),
+    )
+    # `metadata` is reserved on declarative classes, so the attribute carries an underscore.
+    metadata_: Mapped[dict[str, Any] | None] = mapped_column(
+        "metadata", JSON().with_variant(JSONB(), "postgresql"), nullable=True
+    )
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
 
     prompt: Mapped[Prompt] = relationship(back_populates="versions")
-    tags: Mapped[list["PromptTag"]] = relationship(back_populates="prompt_version")
-
 
-class PromptTag(Base):
-    __tablename__ = "prompt_tags"
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
-    prompt_version_id: Mapped[int] = mapped_column(
-        ForeignKey("prompt_versions.id"), nullable=False, index=True
+class PromptVersionArchive(Base):
+    # Versions pruned by retention, on the owner's shard. Rows are self-contained (full
+    # content, prompt name instead of id) so they outlive their prompt.
+    __tablename__ = "prompt_versions_archive"
+    __table_args__ = (
+        Index(
+            "ix_prompt_versions_archive_owner_name_version", "owner_id", "prompt_name", "version"
+        ),
     )
-    name: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
 
-    prompt_version: Mapped[PromptVersion] = relationship(back_populates="tags")
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    owner_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
+    prompt_name: Mapped[str] = mapped_column(String(255), nullable=False)
+    version: Mapped[int] = mapped_column(Integer, nullable=False)
+    content: Mapped[str] = mapped_column(Text, nullable=False)
+    tags: Mapped[list[str]] = mapped_column(
+        ARRAY(String(64)).with_variant(JSON(), "sqlite"),
+        nullable=False,
+        default=list,
+        server_default=text("'{}'"),
+    )
+    metadata_: Mapped[dict[str, Any] | None] = mapped_column(
+        "metadata", JSON().with_variant(JSONB(), "postgresql"), nullable=True
+    )
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    archived_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
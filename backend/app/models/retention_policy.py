@@ -0,0 +1,48 @@
+from datetime import datetime
+
+from sqlalchemy import (
+    Boolean,
+    CheckConstraint,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    UniqueConstraint,
+    text,
+)
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class RetentionPolicy(Base):
+    # Kept in the default database next to the shard directory. A row without a prompt
+    # name is the owner's default; a named row replaces it for that prompt.
+    __tablename__ = "retention_policies"
+    __table_args__ = (
+        UniqueConstraint("owner_id", "prompt_name", name="uq_retention_policies_owner_prompt"),
+        # NULLs never collide in the unique constraint, so the default gets its own index.
+        Index(
+            "uq_retention_policies_owner_default",
+            "owner_id",
+            unique=True,
+            postgresql_where=text("prompt_name IS NULL"),
+            sqlite_where=text("prompt_name IS NULL"),
+        ),
+        CheckConstraint(
+            "keep_last IS NULL OR keep_last >= 1", name="ck_retention_policies_keep_last"
+        ),
+        CheckConstraint(
+            "keep_days IS NULL OR keep_days >= 1", name="ck_retention_policies_keep_days"
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    owner_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
+    prompt_name: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    # A version is kept when any rule holds; the latest version is always kept.
+    keep_last: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    keep_tagged: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
+    keep_days: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
@@ -0,0 +1,15 @@
+from datetime import datetime
+from typing import Any
+
+from pydantic import BaseModel
+
+
+class SlowQueryResponse(BaseModel):
+    recorded_at: datetime
+    duration_ms: float
+    statement: str
+    parameters: dict[str, Any]
+    caller: str | None
+    route: str | None
+    plan: str | None
+    plan_error: str | None
@@ -0,0 +1,11 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class ReleaseBundleResponse(BaseModel):
+    tag: str
+    digest: str
+    prompt_count: int
+    built_at: datetime
+    url: str
@@ -1,6 +1,27 @@
+from datetime import datetime
+
 from pydantic import BaseModel
 
 
 class HealthResponse(BaseModel):
     status: str
     database: str
+
+
+class LivenessResponse(BaseModel):
+    status: str
+
+
+class PoolStatusResponse(BaseModel):
+    size: int
+    checked_out: int
+    overflow: int
+
+
+class ReadinessResponse(BaseModel):
+    status: str
+    database: str
+    checked_at: datetime | None
+    latency_ms: float | None
+    error: str | None
+    pool: PoolStatusResponse | None
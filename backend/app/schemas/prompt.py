@@ -1,31 +1,97 @@
+import json
+from collections.abc import Iterable
 from datetime import datetime
-from typing import Any
+from typing import Annotated, Any
 
-from pydantic import BaseModel, Field, model_validator
+from pydantic import BaseModel, Field, StringConstraints, model_validator
+
+MAX_TAGS_PER_REQUEST = 32
+MAX_PROMPTS_PER_RESOLVE = 100
+MAX_PROMPTS_PER_SUMMARY_PAGE = 500
+MAX_ARCHIVED_VERSIONS_PER_PAGE = 100
+MAX_VERSIONS_PER_BULK_DELETE = 1000
+
+TagName = Annotated[str, StringConstraints(min_length=1, max_length=64)]
+TagList = Annotated[list[TagName], Field(max_length=MAX_TAGS_PER_REQUEST)]
 
 
 class PromptCreateRequest(BaseModel):
     name: str = Field(min_length=1, max_length=255)
     content: str = Field(min_length=1)
     tag: str | None = Field(default=None, min_length=1, max_length=64)
+    tags: TagList | None = None
     metadata: dict[str, Any] | None = None
 
 
+METADATA_FILTER_PREFIX = "metadata."
+
+
+def parse_metadata_filters(params: Iterable[tuple[str, str]]) -> dict[str, Any] | None:
+    # `metadata.model=gpt-x&metadata.params.temperature=0.2` becomes
+    # {"model": "gpt-x", "params": {"temperature": 0.2}}. Values are read as JSON when
+    # they parse (numbers, booleans, quoted strings) and as plain strings otherwise.
+    # Lists, objects and null are refused: Postgres matches them by containment and SQLite
+    # by equality, so the two engines would answer differently.
+    filters: dict[str, Any] = {}
+    for key, raw_value in params:
+        if not key.startswith(METADATA_FILTER_PREFIX):
+            continue
+        path = key[len(METADATA_FILTER_PREFIX) :].split(".")
+        if not all(path):
+            raise ValueError(f"Invalid metadata filter {key!r}.")
+        try:
+            value = json.loads(raw_value)
+        except ValueError:
+            value = raw_value
+        if value is None or isinstance(value, (list, dict)):
+            raise ValueError(
+                f"Metadata filter {key!r} must be a string, number or boolean; "
+                "quote it to match that text."
+            )
+
+        node = filters
+        for segment in path[:-1]:
+            node = node.setdefault(segment, {})
+            if not isinstance(node, dict):
+                raise ValueError(f"Conflicting metadata filters for {key!r}.")
+        if path[-1] in node:
+            raise ValueError(f"Conflicting metadata filters for {key!r}.")
+        node[path[-1]] = value
+    return filters or None
+
+
 class PromptLookupQuery(BaseModel):
     name: str | None = Field(default=None, min_length=1, max_length=255)
     tag: str | None = Field(default=None, min_length=1, max_length=64)
+    tags_any: TagList | None = None
+    tags_all: TagList | None = None
+    metadata: dict[str, Any] | None = None
+
+
+UPDATE_FIELDS = ("content", "tag", "tags", "add_tags", "remove_tags")
 
 
 class PromptUpdateRequest(BaseModel):
     content: str | None = Field(default=None, min_length=1)
+    # `tag` and `tags` replace the version's whole tag set; `add_tags` and `remove_tags`
+    # change only the named tags.
     tag: str | None = Field(default=None, min_length=1, max_length=64)
+    tags: TagList | None = None
+    add_tags: TagList = []
+    remove_tags: TagList = []
 
     @model_validator(mode="after")
     def validate_at_least_one_field(self) -> "PromptUpdateRequest":
         if "content" in self.model_fields_set and self.content is None:
             raise ValueError("content cannot be null when provided.")
-        if "content" not in self.model_fields_set and "tag" not in self.model_fields_set:
-            raise ValueError("At least one field (content or tag) must be provided.")
+        if "tags" in self.model_fields_set and self.tags is None:
+            raise ValueError("tags cannot be null when provided.")
+        if "tag" in self.model_fields_set and "tags" in self.model_fields_set:
+            raise ValueError("Provide either tag or tags, not both.")
+        if not self.model_fields_set.intersection(UPDATE_FIELDS):
+            raise ValueError(
+                "At least one field (content, tag, tags, add_tags or remove_tags) must be provided."
+            )
         return self
 
 
@@ -36,5 +102,63 @@ class PromptVersionResponse(BaseModel):
     content: str
     version: int
     tag: str | None
+    tags: list[str] = []
+    metadata: dict[str, Any] | None = None
+    created_at: datetime
+    updated_at: datetime
+
+
+class PromptVersionBulkDeleteRequest(BaseModel):
+    ids: list[int] = Field(min_length=1, max_length=MAX_VERSIONS_PER_BULK_DELETE)
+
+
+class PromptVersionBulkDeleteResponse(BaseModel):
+    # Ids that did not exist or belong to another user are not counted.
+    deleted: int
+
+
+class PromptSelector(BaseModel):
+    name: str = Field(min_length=1, max_length=255)
+    # None resolves the latest version whatever its tags.
+    tag: str | None = Field(default=None, min_length=1, max_length=64)
+
+
+class PromptResolveRequest(BaseModel):
+    prompts: list[PromptSelector] = Field(min_length=1, max_length=MAX_PROMPTS_PER_RESOLVE)
+
+
+class PromptResolution(BaseModel):
+    name: str
+    tag: str | None
+    prompt: PromptVersionResponse | None
+
+
+class PromptSummary(BaseModel):
+    prompt_id: int
+    name: str
+    latest_version_id: int
+    latest_version: int
+    version_count: int
+    # Tags of the latest version.
+    tags: list[str]
+    created_at: datetime
+    # Newest updated_at across all versions.
+    updated_at: datetime
+
+
+class PromptSummaryPage(BaseModel):
+    items: list[PromptSummary]
+    # Pass as `cursor` to get the next page; None on the last page.
+    next_cursor: str | None
+
+
+class ArchivedPromptVersionResponse(BaseModel):
+    id: int
+    name: str
+    content: str
+    version: int
+    tags: list[str]
+    metadata: dict[str, Any] | None
     created_at: datetime
     updated_at: datetime
+    archived_at: datetime
@@ -0,0 +1,26 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field, model_validator
+
+
+class RetentionPolicyRequest(BaseModel):
+    # None sets the owner's default; a name sets the policy for that prompt only.
+    prompt_name: str | None = Field(default=None, min_length=1, max_length=255)
+    keep_last: int | None = Field(default=None, ge=1)
+    keep_tagged: bool = True
+    keep_days: int | None = Field(default=None, ge=1)
+
+    @model_validator(mode="after")
+    def validate_keeps_versions(self) -> "RetentionPolicyRequest":
+        if self.keep_last is None and self.keep_days is None:
+            raise ValueError("At least one of keep_last or keep_days must be provided.")
+        return self
+
+
+class RetentionPolicyResponse(BaseModel):
+    id: int
+    prompt_name: str | None
+    keep_last: int | None
+    keep_tagged: bool
+    keep_days: int | None
+    updated_at: datetime
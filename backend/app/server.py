@@ -0,0 +1,16 @@
+from uvicorn.workers import UvicornWorker
+
+from app.core.config import settings
+from app.db.session import SHUTDOWN_FLUSH_SECONDS
+
+
+class AppUvicornWorker(UvicornWorker):
+    # Uvicorn waits for open connections without a limit by default, and gunicorn kills
+    # the worker once graceful_timeout expires. Stop draining a little earlier so
+    # lifespan shutdown (probe stop, queued plan captures, engine dispose) still runs.
+    CONFIG_KWARGS = {
+        **UvicornWorker.CONFIG_KWARGS,
+        "timeout_graceful_shutdown": max(
+            settings.SERVER_GRACEFUL_TIMEOUT_SECONDS - SHUTDOWN_FLUSH_SECONDS, 1
+        ),
+    }
@@ -0,0 +1,100 @@
+import argparse
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.dal import prompt_dal
+from app.dal.coalescing import prompt_reads_coalesced
+from app.db.base import Base
+from app.models.prompt import Prompt, PromptVersion
+from app.models.user import User
+
+
+def _seed(session_factory: sessionmaker) -> int:
+    now = datetime.now(timezone.utc)
+    with session_factory() as db:
+        user = User(email="bench@example.com", password_hash="x", is_active=True, created_at=now)
+        db.add(user)
+        db.flush()
+        prompt = Prompt(owner_id=user.id, name="hot", created_at=now)
+        db.add(prompt)
+        db.flush()
+        db.add(
+            PromptVersion(
+                prompt_id=prompt.id, version=1, content="hot content", created_at=now, updated_at=now
+            )
+        )
+        db.commit()
+        return user.id
+
+
+def _burst(session_factory: sessionmaker, owner_id: int, callers: int) -> float:
+    barrier = threading.Barrier(callers)
+
+    def read() -> None:
+        barrier.wait()
+        with session_factory() as db:
+            rows = prompt_dal.get_prompt_version_rows(
+                db, name="hot", tag=None, owner_id=owner_id, limit=1
+            )
+            assert rows[0].content == "hot content"
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=callers) as executor:
+        for future in [executor.submit(read) for _ in range(callers)]:
+            future.result()
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Count prompt queries for a burst of identical concurrent reads."
+    )
+    parser.add_argument("--callers", type=int, default=50)
+    parser.add_argument("--bursts", type=int, default=5)
+    parser.add_argument(
+        "--query-delay-ms", type=float, default=50, help="Added latency per prompt query."
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(
+            f"sqlite:///{Path(directory) / 'bench.db'}", pool_size=args.callers, max_overflow=0
+        )
+        Base.metadata.create_all(engine)
+        session_factory = sessionmaker(bind=engine)
+        owner_id = _seed(session_factory)
+        queries = 0
+        lock = threading.Lock()
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def _slow_prompt_query(conn, cursor, statement, parameters, context, executemany) -> None:
+            nonlocal queries
+            if "prompt_versions" in statement:
+                with lock:
+                    queries += 1
+                time.sleep(args.query_delay_ms / 1000)
+
+        for coalescing in (False, True):
+            settings.PROMPT_READ_COALESCING = coalescing
+            queries = 0
+            before = sum(float(line.split()[-1]) for line in prompt_reads_coalesced.samples())
+            elapsed = sum(_burst(session_factory, owner_id, args.callers) for _ in range(args.bursts))
+            collapsed = sum(float(line.split()[-1]) for line in prompt_reads_coalesced.samples())
+            print(
+                f"coalescing={'on ' if coalescing else 'off'} "
+                f"reads={args.callers * args.bursts} queries={queries} "
+                f"collapsed={collapsed - before:.0f} burst={elapsed / args.bursts * 1000:.0f} ms"
+            )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
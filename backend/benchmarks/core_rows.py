@@ -0,0 +1,92 @@
+import argparse
+import gc
+import statistics
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.api.v1.endpoints.prompts import _to_prompt_row
+from app.dal import prompt_dal
+from app.db.base import Base
+from app.models.prompt import Prompt, PromptVersion
+from app.models.user import User
+
+
+def _seed(db: Session, *, prompts: int, versions: int, content_size: int) -> int:
+    now = datetime.now(timezone.utc)
+    user = User(email="bench@example.com", password_hash="x", is_active=True, created_at=now)
+    db.add(user)
+    db.flush()
+    content = ("Answer in a calm and concise tone. " * (content_size // 35 + 1))[:content_size]
+    for prompt_index in range(prompts):
+        prompt = Prompt(owner_id=user.id, name=f"prompt-{prompt_index:04d}", created_at=now)
+        db.add(prompt)
+        db.flush()
+        for version in range(1, versions + 1):
+            db.add(
+                PromptVersion(
+                    prompt_id=prompt.id,
+                    version=version,
+                    content=content,
+                    tags=["production"] if version == versions else [],
+                    created_at=now,
+                    updated_at=now,
+                )
+            )
+    db.commit()
+    return user.id
+
+
+def _orm_listing(db: Session, owner_id: int, limit: int) -> list[dict]:
+    versions = prompt_dal.get_prompt_versions(db, name=None, tag=None, owner_id=owner_id, limit=limit)
+    return [_to_prompt_row(version) for version in versions]
+
+
+def _core_listing(db: Session, owner_id: int, limit: int) -> list[dict]:
+    rows = prompt_dal.get_prompt_version_rows(db, name=None, tag=None, owner_id=owner_id, limit=limit)
+    return [row._asdict() for row in rows]
+
+
+def _measure(path, db: Session, owner_id: int, limit: int, repeat: int) -> tuple[float, float]:
+    samples: list[float] = []
+    for _ in range(repeat):
+        db.expunge_all()
+        started = time.perf_counter()
+        path(db, owner_id, limit)
+        samples.append((time.perf_counter() - started) * 1_000)
+
+    db.expunge_all()
+    gc.collect()
+    tracemalloc.start()
+    result = path(db, owner_id, limit)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(samples), peak / len(result)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare ORM and Core prompt listing reads.")
+    parser.add_argument("--prompts", type=int, default=20)
+    parser.add_argument("--versions", type=int, default=10)
+    parser.add_argument("--content-size", type=int, default=2000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as db:
+        owner_id = _seed(db, prompts=args.prompts, versions=args.versions, content_size=args.content_size)
+        if _orm_listing(db, owner_id, args.limit) != _core_listing(db, owner_id, args.limit):
+            raise RuntimeError("ORM and Core listings returned different rows.")
+
+        for label, path in (("orm", _orm_listing), ("core", _core_listing)):
+            latency_ms, bytes_per_row = _measure(path, db, owner_id, args.limit, args.repeat)
+            print(f"{label:>4}: p50={latency_ms:7.2f} ms  peak={bytes_per_row:8.0f} B/row")
+
+
+if __name__ == "__main__":
+    main()
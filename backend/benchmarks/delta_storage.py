@@ -0,0 +1,116 @@
+import argparse
+import random
+import statistics
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.dal import prompt_dal
+from app.db.base import Base
+from app.models.prompt import PromptVersion
+from app.models.user import User
+
+WORDS = ["context", "answer", "user", "model", "tone", "format", "cite", "brief", "json", "step"]
+
+
+def _initial_content(rng: random.Random, lines: int) -> list[str]:
+    return [" ".join(rng.choices(WORDS, k=12)) + "\n" for _ in range(lines)]
+
+
+def _edit(rng: random.Random, lines: list[str]) -> list[str]:
+    edited = list(lines)
+    index = rng.randrange(len(edited))
+    action = rng.random()
+    if action < 0.6:
+        edited[index] = " ".join(rng.choices(WORDS, k=12)) + "\n"
+    elif action < 0.8:
+        edited.insert(index, " ".join(rng.choices(WORDS, k=12)) + "\n")
+    elif len(edited) > 1:
+        del edited[index]
+    return edited
+
+
+def _seed(db: Session, *, versions: int, lines: int, seed: int) -> int:
+    rng = random.Random(seed)
+    user = User(
+        email="bench@example.com",
+        password_hash="x",
+        is_active=True,
+        created_at=datetime.now(timezone.utc),
+    )
+    db.add(user)
+    db.commit()
+
+    content = _initial_content(rng, lines)
+    prompt_id = 0
+    for _ in range(versions):
+        created = prompt_dal.create_prompt_version(
+            db, owner_id=user.id, name="bench", content="".join(content), tag=None
+        )
+        prompt_id = created.prompt_id
+        content = _edit(rng, content)
+    return prompt_id
+
+
+def _stored_bytes(db: Session) -> int:
+    return db.scalar(
+        select(
+            func.sum(
+                func.coalesce(func.length(PromptVersion.content), 0)
+                + func.coalesce(func.length(PromptVersion.content_delta), 0)
+            )
+        )
+    )
+
+
+def _read_latency_us(db: Session, *, prompt_id: int, reads: int, seed: int) -> list[float]:
+    rng = random.Random(seed)
+    ids = db.scalars(select(PromptVersion.id).where(PromptVersion.prompt_id == prompt_id)).all()
+    samples: list[float] = []
+    for _ in range(reads):
+        prompt_version_id = rng.choice(ids)
+        db.expire_all()
+        started = time.perf_counter()
+        prompt_dal._get_prompt_version_by_id(db, prompt_version_id)
+        samples.append((time.perf_counter() - started) * 1_000_000)
+    return samples
+
+
+def run(mode: str, *, versions: int, lines: int, reads: int, seed: int) -> dict[str, float]:
+    settings.PROMPT_VERSION_STORAGE = mode
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as db:
+        prompt_id = _seed(db, versions=versions, lines=lines, seed=seed)
+        samples = _read_latency_us(db, prompt_id=prompt_id, reads=reads, seed=seed)
+        stored = _stored_bytes(db)
+    engine.dispose()
+    samples.sort()
+    return {
+        "stored_bytes": stored,
+        "read_p50_us": statistics.median(samples),
+        "read_p95_us": samples[int(len(samples) * 0.95) - 1],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare full vs delta prompt version storage.")
+    parser.add_argument("--versions", type=int, default=300)
+    parser.add_argument("--lines", type=int, default=80)
+    parser.add_argument("--reads", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    for mode in ("full", "delta"):
+        result = run(mode, versions=args.versions, lines=args.lines, reads=args.reads, seed=args.seed)
+        print(
+            f"{mode:>5}: stored={result['stored_bytes']:>10,} B  "
+            f"read p50={result['read_p50_us']:8.1f} us  p95={result['read_p95_us']:8.1f} us"
+        )
+
+
+if __name__ == "__main__":
+    main()
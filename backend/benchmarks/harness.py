@@ -0,0 +1,55 @@
+import tempfile
+from collections.abc import Generator, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import cast
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app import models  # noqa: F401
+from app.db.base import Base
+from app.db.foreign_keys import enforce_sqlite_foreign_keys
+from app.db.session import LazySession, get_db
+from app.main import app
+
+
+@dataclass
+class Account:
+    jwt_headers: dict[str, str]
+    api_key_headers: dict[str, str]
+
+
+@contextmanager
+def sqlite_client() -> Iterator[tuple[TestClient, Engine]]:
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{Path(directory) / 'bench.db'}")
+        enforce_sqlite_foreign_keys(engine)
+        Base.metadata.create_all(engine)
+        session_factory = sessionmaker(bind=engine, autoflush=False)
+
+        def _get_db() -> Generator[Session, None, None]:
+            db = LazySession(session_factory)
+            try:
+                yield cast(Session, db)
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = _get_db
+        try:
+            yield TestClient(app), engine
+        finally:
+            app.dependency_overrides.pop(get_db, None)
+            engine.dispose()
+
+
+def create_account(client: TestClient, email: str = "bench@example.com") -> Account:
+    credentials = {"email": email, "password": "password123"}
+    client.post("/api/v1/auth/register", json=credentials)
+    token = client.post("/api/v1/auth/login", json=credentials).json()["access_token"]
+    jwt_headers = {"Authorization": f"Bearer {token}"}
+    api_key = client.post("/api/v1/auth/api-keys", headers=jwt_headers, json={"name": "bench"}).json()
+    return Account(jwt_headers=jwt_headers, api_key_headers={"X-API-Key": api_key["api_key"]})
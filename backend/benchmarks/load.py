@@ -0,0 +1,238 @@
+import argparse
+import json
+import random
+import statistics
+import subprocess
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from benchmarks.seed import zipf_weights
+
+API_PREFIX = "/api/v1"
+DEFAULT_MIX = {
+    "read_latest_api_key": 40,
+    "read_tag_api_key": 20,
+    "read_name_jwt": 15,
+    "list_jwt": 10,
+    "create_jwt": 10,
+    "update_jwt": 5,
+}
+
+Request = tuple[str, str, dict[str, Any]]
+
+
+class Workload:
+    def __init__(self, manifest: dict[str, Any], zipf_exponent: float, seed: int) -> None:
+        self.users = manifest["users"]
+        self.seed = seed
+        self.prompt_weights = zipf_weights(len(self.users[0]["prompts"]), zipf_exponent)
+        self._counter = 0
+        self._lock = threading.Lock()
+
+    def _pick(self, rng: random.Random) -> tuple[dict[str, Any], dict[str, Any]]:
+        user = rng.choice(self.users)
+        prompt = rng.choices(user["prompts"], self.prompt_weights)[0]
+        return user, prompt
+
+    def _unique_suffix(self) -> int:
+        with self._lock:
+            self._counter += 1
+            return self._counter
+
+    def build(self, scenario: str, rng: random.Random) -> Request:
+        user, prompt = self._pick(rng)
+        api_key = {"X-API-Key": user["api_key"]}
+        jwt = {"Authorization": f"Bearer {user['access_token']}"}
+        path = f"{API_PREFIX}/prompts"
+
+        if scenario == "read_latest_api_key":
+            return "GET", path, {"headers": api_key, "params": {"name": prompt["name"], "latest": "true"}}
+        if scenario == "read_tag_api_key":
+            tag = prompt["tags"][0] if prompt["tags"] else "production"
+            params = {"name": prompt["name"], "tag": tag, "latest": "true"}
+            return "GET", path, {"headers": api_key, "params": params}
+        if scenario == "read_name_jwt":
+            return "GET", path, {"headers": jwt, "params": {"name": prompt["name"]}}
+        if scenario == "list_jwt":
+            return "GET", path, {"headers": jwt, "params": {"limit": 100}}
+        if scenario == "create_jwt":
+            body = {"name": prompt["name"], "content": f"benchmark edit {self._unique_suffix()}"}
+            return "POST", path, {"headers": jwt, "json": body}
+        if scenario == "update_jwt":
+            body = {"content": f"benchmark update {self._unique_suffix()}"}
+            return "PUT", f"{path}/{prompt['latest_version_id']}", {"headers": jwt, "json": body}
+        raise ValueError(f"Unknown scenario: {scenario}")
+
+
+def _percentile(sorted_samples: list[float], percentile: float) -> float:
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, max(0, round(percentile / 100 * len(sorted_samples)) - 1))
+    return sorted_samples[index]
+
+
+def summarize(latencies_ms: list[float], errors: int, elapsed: float) -> dict[str, float]:
+    samples = sorted(latencies_ms)
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "throughput_rps": len(samples) / elapsed if elapsed else 0.0,
+        "mean_ms": statistics.fmean(samples) if samples else 0.0,
+        "p50_ms": _percentile(samples, 50),
+        "p95_ms": _percentile(samples, 95),
+        "p99_ms": _percentile(samples, 99),
+        "max_ms": samples[-1] if samples else 0.0,
+    }
+
+
+def run(
+    client: httpx.Client,
+    workload: Workload,
+    *,
+    mix: dict[str, int],
+    concurrency: int,
+    duration: float,
+    warmup: float,
+) -> dict[str, Any]:
+    scenarios = list(mix)
+    weights = [mix[scenario] for scenario in scenarios]
+    latencies: dict[str, list[float]] = defaultdict(list)
+    errors: dict[str, int] = defaultdict(int)
+    statuses: dict[str, int] = defaultdict(int)
+    measure_from = time.perf_counter() + warmup
+    stop_at = measure_from + duration
+
+    def worker(worker_index: int) -> None:
+        rng = random.Random(workload.seed * 1000 + worker_index)
+        while True:
+            started = time.perf_counter()
+            if started >= stop_at:
+                return
+            scenario = rng.choices(scenarios, weights)[0]
+            method, path, options = workload.build(scenario, rng)
+            try:
+                status_code = client.request(method, path, **options).status_code
+            except httpx.HTTPError:
+                status_code = 0
+            finished = time.perf_counter()
+            if started < measure_from:
+                continue
+            statuses[str(status_code)] += 1
+            if 200 <= status_code < 300:
+                latencies[scenario].append((finished - started) * 1000)
+            else:
+                errors[scenario] += 1
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    all_latencies = [sample for samples in latencies.values() for sample in samples]
+    return {
+        "overall": summarize(all_latencies, sum(errors.values()), duration),
+        "scenarios": {
+            scenario: summarize(latencies[scenario], errors[scenario], duration)
+            for scenario in scenarios
+        },
+        "statuses": dict(statuses),
+    }
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _parse_mix(value: str) -> dict[str, int]:
+    mix: dict[str, int] = {}
+    for part in value.split(","):
+        scenario, _, weight = part.partition("=")
+        if scenario.strip() not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"Unknown scenario: {scenario}")
+        mix[scenario.strip()] = int(weight)
+    return mix
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Drive the prompt API at fixed concurrency.")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--manifest", type=Path, default=Path("benchmarks/results/manifest.json"))
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--warmup", type=float, default=5.0)
+    parser.add_argument("--zipf-exponent", type=float, default=1.1)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument(
+        "--mix",
+        type=_parse_mix,
+        default=DEFAULT_MIX,
+        help="Comma-separated scenario=weight pairs, e.g. read_latest_api_key=80,create_jwt=20",
+    )
+    parser.add_argument("--output", type=Path, default=None)
+    args = parser.parse_args()
+
+    manifest = json.loads(args.manifest.read_text())
+    workload = Workload(manifest, args.zipf_exponent, args.seed)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    with httpx.Client(base_url=args.base_url, limits=limits, timeout=30.0) as client:
+        result = run(
+            client,
+            workload,
+            mix=args.mix,
+            concurrency=args.concurrency,
+            duration=args.duration,
+            warmup=args.warmup,
+        )
+
+    revision = _git_revision()
+    started_at = datetime.now(timezone.utc)
+    report = {
+        "meta": {
+            "git_revision": revision,
+            "recorded_at": started_at.isoformat(),
+            "base_url": args.base_url,
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "warmup_s": args.warmup,
+            "mix": args.mix,
+            "dataset": manifest["counts"],
+            "dataset_parameters": manifest["parameters"],
+        },
+        **result,
+    }
+    output = args.output or Path(
+        f"benchmarks/results/{revision or 'unknown'}-{started_at:%Y%m%dT%H%M%S}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+
+    overall = result["overall"]
+    print(
+        f"{overall['requests']} requests, {overall['errors']} errors, "
+        f"{overall['throughput_rps']:.1f} req/s, p50={overall['p50_ms']:.1f} ms "
+        f"p95={overall['p95_ms']:.1f} ms p99={overall['p99_ms']:.1f} ms -> {output}"
+    )
+    for scenario, summary in result["scenarios"].items():
+        print(
+            f"  {scenario:<22} n={summary['requests']:<6} p50={summary['p50_ms']:7.1f} "
+            f"p95={summary['p95_ms']:7.1f} p99={summary['p99_ms']:7.1f} errors={summary['errors']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
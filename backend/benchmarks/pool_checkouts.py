@@ -0,0 +1,57 @@
+import argparse
+import sys
+
+from sqlalchemy import event
+
+from benchmarks.harness import create_account, sqlite_client
+
+EXPECTED_MAX_CHECKOUTS = {
+    "prompts without credentials": 0,
+    "prompts with malformed JWT": 0,
+    "me without credentials": 0,
+    "prompts with JWT": 1,
+    # touch_last_used commits, so the listing query checks out a second time.
+    "prompts with API key": 2,
+    "health": 1,
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Count pool checkouts per request type.")
+    parser.add_argument("--requests", type=int, default=20)
+    args = parser.parse_args()
+
+    failures = []
+    with sqlite_client() as (client, engine):
+        account = create_account(client)
+        checkouts = 0
+
+        @event.listens_for(engine, "checkout")
+        def _count_checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+            nonlocal checkouts
+            checkouts += 1
+
+        requests = {
+            "prompts without credentials": ("/api/v1/prompts", {}),
+            "prompts with malformed JWT": ("/api/v1/prompts", {"Authorization": "Bearer nope"}),
+            "me without credentials": ("/api/v1/auth/me", {}),
+            "prompts with JWT": ("/api/v1/prompts", account.jwt_headers),
+            "prompts with API key": ("/api/v1/prompts", account.api_key_headers),
+            "health": ("/api/v1/health", {}),
+        }
+        for label, (path, headers) in requests.items():
+            checkouts = 0
+            for _ in range(args.requests):
+                client.get(path, headers=headers)
+            per_request = checkouts / args.requests
+            print(f"{label:<30} {per_request:5.2f} checkouts/request")
+            if per_request > EXPECTED_MAX_CHECKOUTS[label]:
+                failures.append(label)
+
+    if failures:
+        print(f"Over budget: {', '.join(failures)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+import sys
+
+from sqlalchemy import func, select
+
+from app.api.middleware import QUERY_BUDGETS
+from app.core.config import settings
+from app.db.query_log import QueryBudgetExceededError, count_queries
+from app.models.prompt import PromptVersion
+from benchmarks.harness import sqlite_client
+
+
+def check_budgets(storage: str, failures: list[str], checked: set[tuple[str, str]]) -> None:
+    # Delta storage adds chain reads and re-encodes versions next to a deleted one, so
+    # every route is counted under both storage modes.
+    settings.PROMPT_VERSION_STORAGE = storage
+    print(f"-- {storage} storage")
+    with sqlite_client() as (client, engine):
+
+        def request(method: str, route: str, path: str, **kwargs):
+            with count_queries(engine) as log:
+                response = client.request(method, path, **kwargs)
+            checked.add((method, route))
+            budget = QUERY_BUDGETS[(method, route)]
+            print(f"{method:<6} {path:<36} {response.status_code} {log.count:>2}/{budget}")
+            try:
+                log.assert_within(budget, f"{method} {route}")
+            except QueryBudgetExceededError as exc:
+                failures.append(str(exc))
+            return response
+
+        credentials = {"email": "budget@example.com", "password": "password123"}
+        request("POST", "/api/v1/auth/register", "/api/v1/auth/register", json=credentials)
+        token = request("POST", "/api/v1/auth/login", "/api/v1/auth/login", json=credentials).json()
+        headers = {"Authorization": f"Bearer {token['access_token']}"}
+        request("GET", "/api/v1/auth/me", "/api/v1/auth/me", headers=headers)
+        key = request(
+            "POST", "/api/v1/auth/api-keys", "/api/v1/auth/api-keys", headers=headers, json={"name": "k"}
+        ).json()
+        request("GET", "/api/v1/auth/api-keys", "/api/v1/auth/api-keys", headers=headers)
+        request("GET", "/api/v1/health", "/api/v1/health")
+
+        created = [
+            request(
+                "POST",
+                "/api/v1/prompts",
+                "/api/v1/prompts",
+                headers=headers,
+                json={
+                    "name": "budget",
+                    "content": "shared line\n" * 20 + f"v{index}",
+                    "tag": "prod",
+                },
+            ).json()
+            for index in range(3)
+        ]
+        request("GET", "/api/v1/prompts", "/api/v1/prompts", headers=headers)
+        request("GET", "/api/v1/prompts", "/api/v1/prompts?tag=prod", headers={"X-API-Key": key["api_key"]})
+        request(
+            "GET",
+            "/api/v1/prompts/summary",
+            "/api/v1/prompts/summary?limit=10",
+            headers={"X-API-Key": key["api_key"]},
+        )
+        request(
+            "GET",
+            "/api/v1/prompts/archive",
+            "/api/v1/prompts/archive?name=budget",
+            headers={"X-API-Key": key["api_key"]},
+        )
+        policy_route = "/api/v1/retention-policies"
+        policy = request(
+            "PUT", policy_route, policy_route, headers=headers, json={"keep_last": 10}
+        ).json()
+        request("GET", policy_route, policy_route, headers=headers)
+        request(
+            "DELETE",
+            f"{policy_route}/{{policy_id}}",
+            f"{policy_route}/{policy['id']}",
+            headers=headers,
+        )
+
+        # Deleting the middle version leaves a gap below a kept one, so delta storage
+        # re-encodes the oldest version against the latest.
+        version_route = "/api/v1/prompts/{prompt_version_id}"
+        request(
+            "PUT",
+            version_route,
+            f"/api/v1/prompts/{created[-1]['id']}",
+            headers=headers,
+            json={"content": "shared line\n" * 20 + "edited", "tag": "a"},
+        )
+        request("DELETE", version_route, f"/api/v1/prompts/{created[1]['id']}", headers=headers)
+
+        # Bulk deletes cost the same number of statements for 2 ids as for 40. Both leave a
+        # gap below a kept version, so delta storage re-encodes one version each time.
+        bulk_contents = {
+            client.post(
+                "/api/v1/prompts",
+                headers=headers,
+                json={"name": "bulk", "content": content},
+            ).json()["id"]: content
+            for content in ("shared line\n" * 20 + f"v{index}" for index in range(50))
+        }
+        bulk_ids = list(bulk_contents)
+        bulk_route = "/api/v1/prompts/versions/delete"
+        for ids in (bulk_ids[1:3], bulk_ids[5:45]):
+            request("POST", bulk_route, bulk_route, headers=headers, json={"ids": ids})
+
+        # The survivors, re-encoded or not, must still rebuild to the text they were
+        # created with.
+        survivors = client.get("/api/v1/prompts?name=bulk", headers=headers).json()
+        kept_ids = bulk_ids[:1] + bulk_ids[3:5] + bulk_ids[45:]
+        expected = [bulk_contents[kept_id] for kept_id in reversed(kept_ids)]
+        if [survivor["content"] for survivor in survivors] != expected:
+            failures.append(f"{storage}: bulk delete changed the content of surviving versions")
+        with engine.connect() as conn:
+            deltas = conn.scalar(
+                select(func.count()).where(PromptVersion.content_delta.is_not(None))
+            )
+        if storage == "delta" and not deltas:
+            failures.append("delta: no surviving version was stored as a delta")
+        # Postgres matches list and null filters by containment and SQLite by equality (or
+        # not at all), so both refuse them rather than answer differently.
+        client.post(
+            "/api/v1/prompts",
+            headers=headers,
+            json={
+                "name": "tagged",
+                "content": "x",
+                "metadata": {"model": "gpt-x", "langs": ["en", "fr"], "owner": None},
+            },
+        )
+        matched = client.get("/api/v1/prompts?metadata.model=gpt-x", headers=headers)
+        if [row["name"] for row in matched.json()] != ["tagged"]:
+            failures.append(f"{storage}: a scalar metadata filter returned {matched.json()}")
+        for query in ('metadata.langs=["en","fr"]', "metadata.owner=null", "metadata.a={}"):
+            response = client.get(f"/api/v1/prompts?{query}", headers=headers)
+            if response.status_code != 422:
+                failures.append(f"{storage}: ?{query} returned {response.status_code}, not 422")
+        prompt_id = client.get("/api/v1/prompts?name=bulk&latest=true", headers=headers).json()[0][
+            "prompt_id"
+        ]
+        request(
+            "DELETE",
+            "/api/v1/prompts/{prompt_id}/versions",
+            f"/api/v1/prompts/{prompt_id}/versions",
+            headers=headers,
+        )
+        request(
+            "DELETE",
+            "/api/v1/auth/api-keys/{key_id}",
+            f"/api/v1/auth/api-keys/{key['id']}",
+            headers=headers,
+        )
+
+
+def main() -> None:
+    failures: list[str] = []
+    checked: set[tuple[str, str]] = set()
+    for storage in ("full", "delta"):
+        check_budgets(storage, failures, checked)
+
+    unchecked = sorted(set(QUERY_BUDGETS) - checked)
+    if unchecked:
+        failures.append(f"No request exercised: {unchecked}")
+    if failures:
+        print("\n".join(failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import argparse
+import itertools
+import random
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.dal import prompt_dal
+from app.db.base import Base
+from app.db.query_cache import QueryCacheStats, track_query_cache
+from app.models.prompt import Prompt, PromptVersion
+from app.models.user import User
+
+
+def _seed(db: Session, *, prompts: int, versions: int) -> list[int]:
+    now = datetime.now(timezone.utc)
+    owner_ids: list[int] = []
+    for user_index in range(2):
+        user = User(
+            email=f"bench{user_index}@example.com",
+            password_hash="x",
+            is_active=True,
+            created_at=now,
+        )
+        db.add(user)
+        db.flush()
+        owner_ids.append(user.id)
+        for prompt_index in range(prompts):
+            prompt = Prompt(owner_id=user.id, name=f"prompt-{prompt_index}", created_at=now)
+            db.add(prompt)
+            db.flush()
+            for version in range(1, versions + 1):
+                db.add(
+                    PromptVersion(
+                        prompt_id=prompt.id,
+                        version=version,
+                        content=f"content {version}",
+                        tags=[f"tag-{version % 3}"],
+                        created_at=now,
+                        updated_at=now,
+                    )
+                )
+    db.commit()
+    return owner_ids
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Report compiled-query cache hit rates for DAL reads.")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--prompts", type=int, default=10)
+    parser.add_argument("--versions", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    stats = QueryCacheStats()
+    track_query_cache(engine, stats)
+    rng = random.Random(args.seed)
+
+    with sessionmaker(bind=engine)() as db:
+        owner_ids = _seed(db, prompts=args.prompts, versions=args.versions)
+        combinations = list(
+            itertools.product((None, "prompt"), (None, "tag"), (None, 1, 10), ("rows", "orm", "by_id"))
+        )
+        stats.reset()
+        started = time.perf_counter()
+        for _ in range(args.requests):
+            name, tag, limit, path = rng.choice(combinations)
+            owner_id = rng.choice(owner_ids)
+            name = f"prompt-{rng.randrange(args.prompts)}" if name else None
+            tag = f"tag-{rng.randrange(3)}" if tag else None
+            if path == "rows":
+                prompt_dal.get_prompt_version_rows(db, name=name, tag=tag, owner_id=owner_id, limit=limit)
+            elif path == "orm":
+                prompt_dal.get_prompt_versions(db, name=name, tag=tag, owner_id=owner_id, limit=limit)
+            else:
+                prompt_dal._get_prompt_version_by_id(db, rng.randrange(1, 50), owner_id=owner_id)
+            db.expunge_all()
+        elapsed = time.perf_counter() - started
+
+    snapshot = stats.snapshot()
+    print(
+        f"statements={snapshot['hits'] + snapshot['misses'] + snapshot['uncached']} "
+        f"hits={snapshot['hits']} misses={snapshot['misses']} uncached={snapshot['uncached']} "
+        f"hit_rate={snapshot['hit_rate']:.1%} "
+        f"avg_request={elapsed / args.requests * 1_000_000:.0f} us"
+    )
+
+
+if __name__ == "__main__":
+    main()
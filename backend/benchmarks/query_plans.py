@@ -0,0 +1,254 @@
+import argparse
+import sys
+from collections.abc import Callable, Iterator
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.dal import api_key_dal, auth_dal, prompt_dal, retention_dal, shard_dal
+from app.models.prompt import Prompt, PromptVersion
+from app.models.user import User
+from app.models.user_api_key import UserApiKey
+
+SORT_NODES = {"Sort", "Incremental Sort"}
+SCAN_NODES = {"Seq Scan", "Index Scan", "Index Only Scan", "Bitmap Heap Scan", "Bitmap Index Scan"}
+GIN_INDEXES = {"ix_prompt_versions_metadata", "ix_prompt_versions_tags"}
+METADATA_FILTER = {"model": "gpt-4o", "params": {"temperature": 0.2}}
+
+
+def _walk(plan: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    yield plan
+    for child in plan.get("Plans", ()):
+        yield from _walk(child)
+
+
+def _uses_gin_index(plan: dict[str, Any]) -> bool:
+    return any(node.get("Index Name") in GIN_INDEXES for node in _walk(plan))
+
+
+def plan_problems(plan: dict[str, Any]) -> list[str]:
+    problems: list[str] = []
+    for node in _walk(plan):
+        node_type = node["Node Type"]
+        if node_type == "Incremental Sort" and node.get("Presorted Key"):
+            # Prompts arrive in name order from the index and only each prompt's own
+            # versions are reordered, which streams under LIMIT.
+            continue
+        if node_type == "Sort" and _uses_gin_index(node):
+            # GIN returns matches in no particular order, so only the filtered rows
+            # are sorted; that is the intended plan for containment filters.
+            continue
+        if node_type in SORT_NODES:
+            problems.append(f"{node_type} on {', '.join(node.get('Sort Key', ()))}")
+        elif node_type == "Seq Scan":
+            problems.append(f"Seq Scan on {node['Relation Name']}")
+    return problems
+
+
+def _describe(plan: dict[str, Any]) -> str:
+    return ", ".join(
+        f"{node['Node Type']} {node.get('Index Name') or node.get('Relation Name')}"
+        for node in _walk(plan)
+        if node["Node Type"] in SCAN_NODES
+    )
+
+
+def _capture_selects(engine: Engine, run: Callable[[Session], object]) -> list[tuple[str, Any]]:
+    captured: list[tuple[str, Any]] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany) -> None:
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        with Session(engine) as db:
+            run(db)
+            db.rollback()
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+    return captured
+
+
+def _explain(conn: Connection, statement: str, parameters: Any) -> dict[str, Any]:
+    # Small seeded tables make seq scans cheaper than any index, so price them out to
+    # check that an index exists for each predicate rather than what the planner prefers.
+    conn.exec_driver_sql("SET enable_seqscan = off")
+    result = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+    return result.scalar_one()[0]["Plan"]
+
+
+def _pick_sample(db: Session) -> dict[str, Any]:
+    # The prompt with the most versions among tagged ones exercises every read path.
+    tagged = (
+        select(PromptVersion.prompt_id, PromptVersion.tags[1].label("tag"))
+        .where(PromptVersion.tags != [])
+        .subquery()
+    )
+    row = db.execute(
+        select(Prompt.owner_id, Prompt.name, func.min(tagged.c.tag), func.count(PromptVersion.id))
+        .join(PromptVersion, PromptVersion.prompt_id == Prompt.id)
+        .join(tagged, tagged.c.prompt_id == Prompt.id)
+        .group_by(Prompt.id)
+        .order_by(func.count(PromptVersion.id).desc())
+        .limit(1)
+    ).one()
+    owner_id, name, tag, _ = row
+    version = db.execute(
+        select(PromptVersion)
+        .join(Prompt)
+        .where(Prompt.owner_id == owner_id, Prompt.name == name)
+        .order_by(PromptVersion.version.desc())
+        .offset(1)
+        .limit(1)
+    ).scalar_one()
+    key_hash = db.scalar(select(UserApiKey.key_hash).where(UserApiKey.user_id == owner_id).limit(1))
+    email = db.scalar(select(User.email).where(User.id == owner_id))
+    return {
+        "owner_id": owner_id,
+        "name": name,
+        "tag": tag,
+        "version": version,
+        "key_hash": key_hash,
+        "email": email,
+    }
+
+
+def dal_cases(sample: dict[str, Any]) -> dict[str, Callable[[Session], object]]:
+    owner_id = sample["owner_id"]
+    name = sample["name"]
+    tag = sample["tag"]
+    version = sample["version"]
+
+    def by_id(db: Session) -> object:
+        return prompt_dal._get_prompt_version_by_id(db, version.id, owner_id=owner_id)
+
+    def adjacent(db: Session) -> object:
+        prompt_version = db.get(PromptVersion, version.id)
+        prompt_dal._get_adjacent_version(db, prompt_version, newer=True)
+        return prompt_dal._get_adjacent_version(db, prompt_version, newer=False)
+
+    def create_lookups(db: Session) -> object:
+        return db.execute(
+            prompt_dal._latest_version_lookup(owner_id, name, with_content=True)
+        ).one()
+
+    return {
+        "rows latest by name": lambda db: prompt_dal.get_prompt_version_rows(
+            db, name=name, tag=None, owner_id=owner_id, limit=1
+        ),
+        "rows latest by name and tag": lambda db: prompt_dal.get_prompt_version_rows(
+            db, name=name, tag=tag, owner_id=owner_id, limit=1
+        ),
+        "rows by name": lambda db: prompt_dal.get_prompt_version_rows(
+            db, name=name, tag=None, owner_id=owner_id
+        ),
+        "rows by tag": lambda db: prompt_dal.get_prompt_version_rows(
+            db, name=None, tag=tag, owner_id=owner_id, limit=100
+        ),
+        "rows by any tag": lambda db: prompt_dal.get_prompt_version_rows(
+            db, name=None, tag=None, owner_id=owner_id, limit=100, tags_any=[tag, "eu"]
+        ),
+        "rows by all tags": lambda db: prompt_dal.get_prompt_version_rows(
+            db, name=None, tag=None, owner_id=owner_id, limit=100, tags_all=[tag, "eu"]
+        ),
+        "resolve many": lambda db: prompt_dal.get_latest_prompt_version_rows(
+            db, owner_id=owner_id, selectors=[(name, None), (name, tag), ("missing", None)]
+        ),
+        "bundle stamps": lambda db: prompt_dal.get_latest_tagged_stamps(
+            db, owner_id=owner_id, tag=tag
+        ),
+        "bundle rows": lambda db: prompt_dal.get_latest_tagged_rows(
+            db, owner_id=owner_id, tag=tag, prompt_ids=[1, 2, 3]
+        ),
+        "rows list": lambda db: prompt_dal.get_prompt_version_rows(
+            db, name=None, tag=None, owner_id=owner_id, limit=100
+        ),
+        "rows by metadata": lambda db: prompt_dal.get_prompt_version_rows(
+            db, name=None, tag=None, owner_id=owner_id, limit=100, metadata=METADATA_FILTER
+        ),
+        "rows latest by metadata": lambda db: prompt_dal.get_prompt_version_rows(
+            db, name=name, tag=None, owner_id=owner_id, limit=1, metadata=METADATA_FILTER
+        ),
+        "orm latest by name": lambda db: prompt_dal.get_prompt_versions(
+            db, name=name, tag=None, owner_id=owner_id, limit=1
+        ),
+        "orm by tag": lambda db: prompt_dal.get_prompt_versions(
+            db, name=None, tag=tag, owner_id=owner_id, limit=100
+        ),
+        "version by id": by_id,
+        "adjacent versions": adjacent,
+        "content chain": lambda db: prompt_dal._load_content_chain(
+            db, prompt_id=version.prompt_id, low=1, high=version.version
+        ),
+        "create lookups": create_lookups,
+        "api key by hash": lambda db: api_key_dal.get_active_key_row_by_hash(
+            db, key_hash=sample["key_hash"]
+        ),
+        "user by id": lambda db: auth_dal.get_user_row_by_id(db, user_id=owner_id),
+        "user by email": lambda db: auth_dal.get_user_by_email(db, email=sample["email"]),
+        "prompt summary": lambda db: prompt_dal._load_prompt_summaries(db, owner_id, None, 101),
+        "owner placement": lambda db: shard_dal._load_owner_placement(db, owner_id),
+        "owner data digest": lambda db: shard_dal.get_owner_data_digest(db, owner_id=owner_id),
+        "retention rules": lambda db: retention_dal.get_retention_rules(db, owner_ids=[owner_id]),
+        "owner prompt ids": lambda db: retention_dal.get_owner_prompt_ids(db, owner_id=owner_id),
+        # A rule that keeps everything stops after the lock-free candidate check.
+        "compaction check": lambda db: retention_dal.compact_prompt_versions(
+            db,
+            owner_id=owner_id,
+            prompt_id=version.prompt_id,
+            name=name,
+            rule=retention_dal.RetentionRule(keep_last=None, keep_tagged=True, keep_days=36500),
+            now=datetime.now(timezone.utc),
+            batch_size=1,
+        ),
+        # An id that matches nothing stops after the stamps read, so nothing is deleted.
+        "bulk delete stamps": lambda db: prompt_dal.delete_prompt_versions(
+            db, owner_id=owner_id, prompt_version_ids=[-1]
+        ),
+        "archived versions": lambda db: retention_dal.get_archived_version_rows(
+            db, owner_id=owner_id, name=name, before_version=version.version, limit=20
+        ),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Check that DAL queries on a seeded Postgres database avoid sorts and seq scans."
+    )
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    parser.add_argument("--verbose", action="store_true", help="Print every plan.")
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    if engine.dialect.name != "postgresql":
+        sys.exit("Query plan checks need a seeded Postgres database (see benchmarks.seed).")
+
+    with Session(engine) as db:
+        sample = _pick_sample(db)
+
+    failures: list[str] = []
+    for label, run in dal_cases(sample).items():
+        with engine.connect() as conn:
+            for statement, parameters in _capture_selects(engine, run):
+                plan = _explain(conn, statement, parameters)
+                problems = plan_problems(plan)
+                status = "FAIL" if problems else "ok"
+                print(f"{status:<4} {label:<28} {_describe(plan)}")
+                if args.verbose:
+                    print(f"       {statement}")
+                if problems:
+                    failures.append(f"{label}: {'; '.join(problems)}\n  {statement}")
+    engine.dispose()
+
+    if failures:
+        print("\n".join(failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
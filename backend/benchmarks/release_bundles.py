@@ -0,0 +1,127 @@
+import argparse
+import tempfile
+import time
+from collections.abc import Callable
+from datetime import datetime, timezone
+from pathlib import Path
+
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.bundle_store import BundleStore
+from app.dal import bundle_dal, prompt_dal
+from app.db.base import Base
+from app.models.prompt import Prompt, PromptVersion
+from app.models.user import User
+
+TAG = "production"
+
+
+def _seed(session_factory: sessionmaker, *, prompts: int, versions: int) -> int:
+    now = datetime.now(timezone.utc)
+    with session_factory() as db:
+        user = User(email="bench@example.com", password_hash="x", is_active=True, created_at=now)
+        db.add(user)
+        db.flush()
+        db.execute(
+            insert(Prompt),
+            [{"owner_id": user.id, "name": f"prompt-{index:05d}", "created_at": now} for index in range(prompts)],
+        )
+        prompt_ids = db.scalars(Prompt.__table__.select().with_only_columns(Prompt.id)).all()
+        # The tag sits on the second-newest version, as it would after a release.
+        db.execute(
+            insert(PromptVersion),
+            [
+                {
+                    "prompt_id": prompt_id,
+                    "version": version,
+                    "content": f"content {prompt_id}.{version} " * 20,
+                    "tags": [TAG] if version == versions - 1 else [],
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for prompt_id in prompt_ids
+                for version in range(1, versions + 1)
+            ],
+        )
+        db.commit()
+        return user.id
+
+
+def _measure(
+    session_factory: sessionmaker, counter: list[int], run: Callable[[Session], object]
+) -> tuple[float, int]:
+    counter[0] = 0
+    with session_factory() as db:
+        started = time.perf_counter()
+        run(db)
+        elapsed = time.perf_counter() - started
+    return elapsed, counter[0]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare per-node tag queries with building and checking a release bundle."
+    )
+    parser.add_argument("--prompts", type=int, default=2000)
+    parser.add_argument("--versions", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{Path(directory) / 'bench.db'}")
+        Base.metadata.create_all(engine)
+        session_factory = sessionmaker(bind=engine)
+        owner_id = _seed(session_factory, prompts=args.prompts, versions=args.versions)
+        bundle_dal.bundle_store = BundleStore(Path(directory) / "bundles")
+        queries = [0]
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def _count(conn, cursor, statement, parameters, context, executemany) -> None:
+            queries[0] += 1
+
+        def move_tag(db: Session) -> None:
+            prompt_version = db.scalars(
+                PromptVersion.__table__.select()
+                .with_only_columns(PromptVersion.id)
+                .where(PromptVersion.version == args.versions)
+                .limit(1)
+            ).one()
+            prompt_dal.update_prompt_version(
+                db,
+                owner_id=owner_id,
+                prompt_version_id=prompt_version,
+                content=None,
+                tag=None,
+                content_is_set=False,
+                tag_is_set=False,
+                add_tags=[TAG],
+            )
+
+        def build(db: Session) -> object:
+            return bundle_dal.get_release_bundle(db, owner_id=owner_id, tag=TAG)
+
+        cases: list[tuple[str, Callable[[Session], object]]] = [
+            (
+                "tag query (per node)",
+                lambda db: prompt_dal.get_prompt_versions(db, name=None, tag=TAG, owner_id=owner_id),
+            ),
+            ("bundle full build", build),
+            ("bundle unchanged", build),
+        ]
+        for label, run in cases:
+            elapsed, count = _measure(session_factory, queries, run)
+            print(f"{label:<22} {elapsed * 1000:8.1f} ms  queries={count}")
+
+        _measure(session_factory, queries, move_tag)
+        elapsed, count = _measure(session_factory, queries, build)
+        print(f"{'bundle after tag move':<22} {elapsed * 1000:8.1f} ms  queries={count}")
+
+        with session_factory() as db:
+            pointer = build(db)
+        size = bundle_dal.bundle_store.bundle_path(owner_id, pointer.digest).stat().st_size
+        print(f"bundle: prompts={pointer.prompt_count} size={size:,} B digest={pointer.digest[:12]}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+import argparse
+import json
+import random
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import create_engine, func, insert, select, text
+from sqlalchemy.engine import Engine
+
+from app import models  # noqa: F401
+from app.core.config import settings
+from app.core.security import (
+    create_access_token,
+    generate_api_key,
+    get_api_key_prefix,
+    hash_api_key,
+    hash_password,
+)
+from app.db.base import Base
+from app.models.prompt import Prompt, PromptVersion
+from app.models.user import User
+from app.models.user_api_key import UserApiKey
+
+BENCH_PASSWORD = "benchmark-password"
+WORDS = (
+    "answer question context user assistant model tone format cite source brief detailed json "
+    "markdown step reasoning policy refuse safe helpful example output input schema field"
+).split()
+MODELS = ("gpt-4o", "gpt-4o-mini", "claude-sonnet", "llama-3-70b")
+TEMPERATURES = (0, 0.2, 0.7, 1.0)
+INSERT_BATCH_SIZE = 1000
+
+
+def zipf_weights(size: int, exponent: float) -> list[float]:
+    return [1 / rank**exponent for rank in range(1, size + 1)]
+
+
+def _content(rng: random.Random, mean_size: int) -> str:
+    size = max(64, int(rng.lognormvariate(0, 0.5) * mean_size))
+    lines: list[str] = []
+    length = 0
+    while length < size:
+        line = " ".join(rng.choices(WORDS, k=rng.randint(6, 16))) + "\n"
+        lines.append(line)
+        length += len(line)
+    return "".join(lines)[:size]
+
+
+def _edit(rng: random.Random, content: str) -> str:
+    lines = content.splitlines(keepends=True) or [""]
+    index = rng.randrange(len(lines))
+    lines[index] = " ".join(rng.choices(WORDS, k=rng.randint(6, 16))) + "\n"
+    return "".join(lines)
+
+
+def _next_id(engine: Engine, model: type) -> int:
+    with engine.connect() as conn:
+        return (conn.scalar(select(func.max(model.id))) or 0) + 1
+
+
+def _insert_batches(engine: Engine, model: type, rows: list[dict[str, Any]]) -> None:
+    with engine.begin() as conn:
+        for start in range(0, len(rows), INSERT_BATCH_SIZE):
+            conn.execute(insert(model), rows[start : start + INSERT_BATCH_SIZE])
+
+
+def _sync_sequences(engine: Engine) -> None:
+    # Rows are inserted with explicit ids, so Postgres sequences must catch up.
+    if engine.dialect.name != "postgresql":
+        return
+    with engine.begin() as conn:
+        for table in ("users", "user_api_keys", "prompts", "prompt_versions"):
+            conn.execute(
+                text(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                    f"COALESCE((SELECT MAX(id) FROM {table}), 1))"
+                )
+            )
+
+
+def seed(
+    engine: Engine,
+    *,
+    users: int,
+    prompts_per_user: int,
+    max_versions: int,
+    zipf_exponent: float,
+    content_size: int,
+    seed_value: int,
+) -> dict[str, Any]:
+    rng = random.Random(seed_value)
+    now = datetime.now(timezone.utc)
+    version_weights = zipf_weights(max_versions, zipf_exponent)
+    password_hash = hash_password(BENCH_PASSWORD)
+
+    user_id = _next_id(engine, User)
+    api_key_id = _next_id(engine, UserApiKey)
+    prompt_id = _next_id(engine, Prompt)
+    version_id = _next_id(engine, PromptVersion)
+    run_marker = f"{seed_value}-{user_id}"
+
+    user_rows: list[dict[str, Any]] = []
+    api_key_rows: list[dict[str, Any]] = []
+    prompt_rows: list[dict[str, Any]] = []
+    version_rows: list[dict[str, Any]] = []
+    manifest_users: list[dict[str, Any]] = []
+
+    for user_index in range(users):
+        email = f"bench-{run_marker}-{user_index}@example.com"
+        user_rows.append(
+            {
+                "id": user_id,
+                "email": email,
+                "password_hash": password_hash,
+                "is_active": True,
+                "created_at": now,
+            }
+        )
+        raw_api_key = generate_api_key()
+        api_key_rows.append(
+            {
+                "id": api_key_id,
+                "user_id": user_id,
+                "name": "benchmark",
+                "prefix": get_api_key_prefix(raw_api_key),
+                "key_hash": hash_api_key(raw_api_key),
+                "created_at": now,
+                "last_used_at": None,
+                "revoked_at": None,
+            }
+        )
+        api_key_id += 1
+
+        manifest_prompts: list[dict[str, Any]] = []
+        for prompt_index in range(prompts_per_user):
+            name = f"prompt-{prompt_index:05d}"
+            prompt_rows.append(
+                {"id": prompt_id, "owner_id": user_id, "name": name, "created_at": now}
+            )
+            version_count = rng.choices(range(1, max_versions + 1), version_weights)[0]
+            content = _content(rng, content_size)
+            first_row = len(version_rows)
+            for version in range(1, version_count + 1):
+                updated_at = now - timedelta(minutes=version_count - version)
+                version_rows.append(
+                    {
+                        "id": version_id,
+                        "prompt_id": prompt_id,
+                        "version": version,
+                        "content": content,
+                        "content_delta": None,
+                        "tags": [],
+                        "metadata": {
+                            "model": rng.choice(MODELS),
+                            "params": {"temperature": rng.choice(TEMPERATURES)},
+                        },
+                        "created_at": updated_at,
+                        "updated_at": updated_at,
+                    }
+                )
+                version_id += 1
+                content = _edit(rng, content)
+
+            latest_version_id = version_id - 1
+            prompt_version_rows = version_rows[first_row:]
+            tags: list[str] = []
+            if rng.random() < 0.7:
+                prompt_version_rows[-1]["tags"].append("production")
+                tags.append("production")
+            if rng.random() < 0.4:
+                rng.choice(prompt_version_rows)["tags"].append("staging")
+                tags.append("staging")
+            if rng.random() < 0.1:
+                rng.choice(prompt_version_rows)["tags"].append("eu")
+                tags.append("eu")
+
+            manifest_prompts.append(
+                {
+                    "name": name,
+                    "versions": version_count,
+                    "latest_version_id": latest_version_id,
+                    "tags": tags,
+                }
+            )
+            prompt_id += 1
+
+        manifest_users.append(
+            {
+                "email": email,
+                "api_key": raw_api_key,
+                "access_token": create_access_token(subject=str(user_id)),
+                "prompts": manifest_prompts,
+            }
+        )
+        user_id += 1
+
+    _insert_batches(engine, User, user_rows)
+    _insert_batches(engine, UserApiKey, api_key_rows)
+    _insert_batches(engine, Prompt, prompt_rows)
+    _insert_batches(engine, PromptVersion, version_rows)
+    _sync_sequences(engine)
+
+    return {
+        "seed": seed_value,
+        "password": BENCH_PASSWORD,
+        "counts": {
+            "users": len(user_rows),
+            "prompts": len(prompt_rows),
+            "prompt_versions": len(version_rows),
+            "tagged_versions": sum(1 for row in version_rows if row["tags"]),
+        },
+        "parameters": {
+            "prompts_per_user": prompts_per_user,
+            "max_versions": max_versions,
+            "zipf_exponent": zipf_exponent,
+            "content_size": content_size,
+        },
+        "users": manifest_users,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Seed synthetic prompt data for benchmarks.")
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--prompts-per-user", type=int, default=100)
+    parser.add_argument("--max-versions", type=int, default=200)
+    parser.add_argument("--zipf-exponent", type=float, default=1.3)
+    parser.add_argument("--content-size", type=int, default=4000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--create-schema", action="store_true", help="Create tables (SQLite runs).")
+    parser.add_argument("--manifest", type=Path, default=Path("benchmarks/results/manifest.json"))
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    if args.create_schema:
+        Base.metadata.create_all(engine)
+
+    manifest = seed(
+        engine,
+        users=args.users,
+        prompts_per_user=args.prompts_per_user,
+        max_versions=args.max_versions,
+        zipf_exponent=args.zipf_exponent,
+        content_size=args.content_size,
+        seed_value=args.seed,
+    )
+    engine.dispose()
+
+    args.manifest.parent.mkdir(parents=True, exist_ok=True)
+    args.manifest.write_text(json.dumps(manifest, indent=2))
+    print(f"Seeded {manifest['counts']} -> {args.manifest}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, serialize_response
+
+from app.api.responses import FastJSONResponse
+from app.api.v1.endpoints.prompts import _to_prompt_response, _to_prompt_row
+from app.main import app
+
+
+def _rows(count: int, content_size: int) -> list[SimpleNamespace]:
+    created_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    content = ("You are a careful assistant. " * (content_size // 29 + 1))[:content_size]
+    return [
+        SimpleNamespace(
+            id=index,
+            prompt_id=index // 10,
+            prompt=SimpleNamespace(name=f"prompt-{index // 10}"),
+            content=content,
+            version=index % 10 + 1,
+            tags=["production"] if index % 3 == 0 else [],
+            metadata_={"model": "gpt-4o"} if index % 2 == 0 else None,
+            created_at=created_at,
+            updated_at=created_at + timedelta(seconds=index),
+        )
+        for index in range(count)
+    ]
+
+
+def _response_field():
+    for route in app.routes:
+        if isinstance(route, APIRoute) and route.path == "/api/v1/prompts" and "GET" in route.methods:
+            return route.response_field
+    raise RuntimeError("GET /api/v1/prompts route not found.")
+
+
+async def _model_path(rows, field) -> bytes:
+    models = [_to_prompt_response(row) for row in rows]
+    content = await serialize_response(field=field, response_content=models)
+    return JSONResponse(content).body
+
+
+async def _fast_path(rows, field) -> bytes:
+    return FastJSONResponse([_to_prompt_row(row) for row in rows]).body
+
+
+async def _us_per_row(path, rows, field, repeat: int) -> float:
+    await path(rows, field)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        await path(rows, field)
+    return (time.perf_counter() - started) * 1_000_000 / (repeat * len(rows))
+
+
+async def _run(rows, field, repeat: int) -> tuple[float, float]:
+    if json.loads(await _model_path(rows, field)) != json.loads(await _fast_path(rows, field)):
+        raise RuntimeError("Serialization paths produced different payloads.")
+    return (
+        await _us_per_row(_model_path, rows, field, repeat),
+        await _us_per_row(_fast_path, rows, field, repeat),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare prompt listing serialization paths.")
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--content-size", type=int, default=4000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    rows = _rows(args.rows, args.content_size)
+    field = _response_field()
+    model_us, fast_us = asyncio.run(_run(rows, field, args.repeat))
+    print(f"pydantic + response_model: {model_us:7.2f} us/row")
+    print(f"dict rows + orjson:        {fast_us:7.2f} us/row  ({model_us / fast_us:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
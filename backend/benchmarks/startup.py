@@ -0,0 +1,112 @@
+import argparse
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+IMPORT_SNIPPET = (
+    "import time; started = time.perf_counter(); import app.main; "
+    "print(time.perf_counter() - started)"
+)
+
+
+def measure_import(runs: int) -> list[float]:
+    samples: list[float] = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-c", IMPORT_SNIPPET], capture_output=True, check=True, text=True
+        )
+        samples.append(float(result.stdout))
+    return samples
+
+
+def slowest_imports(limit: int) -> list[tuple[int, str]]:
+    # -X importtime reports cumulative microseconds per module on stderr.
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stderr
+    seen: dict[str, int] = {}
+    for line in stderr.splitlines()[1:]:
+        _, cumulative, name = line.split("|")
+        name = name.strip()
+        # Application modules plus whole third-party packages (not their submodules).
+        if name.startswith("app.") or "." not in name:
+            seen[name] = max(seen.get(name, 0), int(cumulative))
+    return sorted(((cumulative, name) for name, cumulative in seen.items()), reverse=True)[:limit]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_boot(workers: int, timeout: float) -> float:
+    port = _free_port()
+    env = {
+        **os.environ,
+        "SERVER_HOST": "127.0.0.1",
+        "SERVER_PORT": str(port),
+        "WEB_CONCURRENCY": str(workers),
+    }
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "app.main:app"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}") as client:
+            while time.perf_counter() - started < timeout:
+                try:
+                    if client.get("/readyz").status_code == 200:
+                        return time.perf_counter() - started
+                except httpx.TransportError:
+                    pass
+                time.sleep(0.05)
+        raise TimeoutError(f"Server was not ready within {timeout:g}s.")
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=60)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Measure app.main import time and server boot time."
+    )
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument(
+        "--boot-workers",
+        type=int,
+        default=0,
+        help="Also start gunicorn with this many workers and time until /readyz returns 200.",
+    )
+    parser.add_argument("--boot-timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    samples = measure_import(args.runs)
+    print(
+        f"import app.main: median={statistics.median(samples) * 1000:.0f} ms "
+        f"min={min(samples) * 1000:.0f} ms over {args.runs} runs"
+    )
+    print("slowest imports (cumulative):")
+    for cumulative, name in slowest_imports(args.top):
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    if args.boot_workers:
+        elapsed = measure_boot(args.boot_workers, args.boot_timeout)
+        print(f"gunicorn with {args.boot_workers} workers ready in {elapsed * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
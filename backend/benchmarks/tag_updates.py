@@ -0,0 +1,80 @@
+import argparse
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import create_engine, delete
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.dal import prompt_dal
+from app.models.user import User
+from app.schemas.prompt import MAX_TAGS_PER_REQUEST
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Time a PUT-sized tag update that adds and removes the most tags allowed."
+    )
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    parser.add_argument("--max-seconds", type=float, default=1.0)
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    if engine.dialect.name != "postgresql":
+        # SQLite merges tags in Python; only Postgres builds the array in the UPDATE.
+        sys.exit("Tag update checks need a Postgres database.")
+
+    existing = [f"old-{index}" for index in range(8)]
+    added = [f"new-{index}" for index in range(MAX_TAGS_PER_REQUEST - 2)] + existing[:2]
+    removed = [f"old-{index}" for index in range(4, 8)] + added[:4]
+    expected = [tag for tag in dict.fromkeys((*existing, *added)) if tag not in removed]
+
+    with Session(engine) as db:
+        user = User(
+            email=f"tag-bench-{uuid.uuid4().hex}@example.com",
+            password_hash="x",
+            is_active=True,
+            created_at=datetime.now(timezone.utc),
+        )
+        db.add(user)
+        db.commit()
+        created = prompt_dal.create_prompt_version(
+            db, owner_id=user.id, name="tags", content="x", tag=None, tags=existing
+        )
+        try:
+            started = time.perf_counter()
+            updated = prompt_dal.update_prompt_version(
+                db,
+                owner_id=user.id,
+                prompt_version_id=created.id,
+                content=None,
+                tag=None,
+                content_is_set=False,
+                tag_is_set=False,
+                add_tags=added,
+                remove_tags=removed,
+            )
+            elapsed = time.perf_counter() - started
+            tags = list(updated.tags)
+        finally:
+            db.rollback()
+            prompt_dal.delete_prompt(db, owner_id=user.id, prompt_id=created.prompt_id)
+            db.execute(delete(User).where(User.id == user.id))
+            db.commit()
+    engine.dispose()
+
+    print(f"add {len(added)} / remove {len(removed)} tags: {elapsed * 1000:.1f} ms")
+    failures: list[str] = []
+    if tags != expected:
+        failures.append(f"Tags were {tags}, expected {expected}")
+    if elapsed > args.max_seconds:
+        failures.append(f"Tag update took {elapsed:.2f}s (limit {args.max_seconds:.2f}s)")
+    if failures:
+        print("\n".join(failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
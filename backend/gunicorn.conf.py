@@ -0,0 +1,43 @@
+import os
+
+# Workers publish their metrics here so a scrape of any one reports the whole server. Set
+# before settings are imported, since they are read once at import.
+os.environ.setdefault("METRICS_MULTIPROC_DIR", "var/metrics")
+
+from app.core.config import settings  # noqa: E402
+
+bind = f"{settings.SERVER_HOST}:{settings.SERVER_PORT}"
+workers = settings.WEB_CONCURRENCY
+worker_class = "app.server.AppUvicornWorker"
+# Import the app once in the master so workers fork with it already loaded. Nothing
+# connects to the database at import time; lifespan warm-up runs in each worker.
+preload_app = True
+keepalive = settings.SERVER_KEEPALIVE_SECONDS
+backlog = settings.SERVER_BACKLOG
+graceful_timeout = settings.SERVER_GRACEFUL_TIMEOUT_SECONDS
+accesslog = "-"
+errorlog = "-"
+
+
+def post_fork(server, worker) -> None:
+    from app.db.session import engine, shard_engines
+
+    # Drop any pool state inherited from the master without closing connections
+    # the master (or a sibling) might still own.
+    engine.dispose(close=False)
+    for shard_engine in shard_engines.values():
+        shard_engine.dispose(close=False)
+
+
+def on_starting(server) -> None:
+    from app.core.metrics_multiprocess import clear_worker_metrics
+
+    if settings.METRICS_MULTIPROC_DIR:
+        clear_worker_metrics(settings.METRICS_MULTIPROC_DIR)
+
+
+def child_exit(server, worker) -> None:
+    from app.core.metrics_multiprocess import mark_worker_exited
+
+    if settings.METRICS_MULTIPROC_DIR:
+        mark_worker_exited(settings.METRICS_MULTIPROC_DIR, worker.pid)
@@ -35,6 +35,22 @@ export type PromptVersionResponse = {
   updated_at: string;
 };
 
+export type PromptSummary = {
+  prompt_id: number;
+  name: string;
+  latest_version_id: number;
+  latest_version: number;
+  version_count: number;
+  tags: string[];
+  created_at: string;
+  updated_at: string;
+};
+
+export type PromptSummaryPage = {
+  items: PromptSummary[];
+  next_cursor: string | null;
+};
+
 export type RegisterRequest = {
   email: string;
   password: string;
@@ -154,6 +170,14 @@ export class PromptApiClient {
     return this.request<PromptVersionResponse[]>(path);
   }
 
+  async getPromptSummaries(cursor?: string | null, limit = 500): Promise<PromptSummaryPage> {
+    const params = new URLSearchParams({ limit: String(limit) });
+    if (cursor) {
+      params.set("cursor", cursor);
+    }
+    return this.request<PromptSummaryPage>(`/api/v1/prompts/summary?${params.toString()}`);
+  }
+
   async createPrompt(payload: PromptCreateRequest): Promise<PromptVersionResponse> {
     return this.request<PromptVersionResponse>("/api/v1/prompts", {
       method: "POST",
@@ -14,7 +14,7 @@ import { Input } from "@/components/ui/input";
 import { Label } from "@/components/ui/label";
 import { ScrollArea } from "@/components/ui/scroll-area";
 import { Textarea } from "@/components/ui/textarea";
-import { promptApiClient } from "@/lib/api-client";
+import { promptApiClient, type PromptSummaryPage } from "@/lib/api-client";
 import { clearAccessToken } from "@/lib/auth";
 
 export function HomePage() {
@@ -32,16 +32,17 @@ export function HomePage() {
     navigate("/login", { replace: true });
   }
 
-  function uniquePromptNames(names: string[]): string[] {
-    return [...new Set(names)];
-  }
-
   async function loadPromptNames() {
     setLoadingPrompts(true);
     setPromptLoadError(null);
     try {
-      const versions = await promptApiClient.getPrompts({});
-      const names = uniquePromptNames(versions.map((version) => version.name));
+      const names: string[] = [];
+      let cursor: string | null = null;
+      do {
+        const page: PromptSummaryPage = await promptApiClient.getPromptSummaries(cursor);
+        names.push(...page.items.map((summary) => summary.name));
+        cursor = page.next_cursor;
+      } while (cursor);
       setPromptNames(names);
       setSelectedPrompt((current) => {
         if (!names.length) {
@@ -0,0 +1,228 @@
+import json
+import sys
+import tempfile
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import httpx
+
+from prompt_manager import PromptManagerClient, PromptManagerUnavailableError
+
+WAIT_SECONDS = 5.0
+
+
+class FakeServer:
+    # Serves one prompt per name through httpx.MockTransport, with ETags and 304s like the
+    # real GET /api/v1/prompts. `down` turns every request into a connection error, and
+    # `hold` parks GETs until it is set.
+    def __init__(self) -> None:
+        self.versions: dict[str, int] = {}
+        self.down = False
+        self.hold = threading.Event()
+        self.hold.set()
+        self.requests: list[tuple[str, str, str | None, int]] = []
+        self._lock = threading.Lock()
+
+    def publish(self, name: str) -> None:
+        self.versions[name] = self.versions.get(name, 0) + 1
+
+    def count(self, method: str) -> int:
+        with self._lock:
+            return sum(1 for request in self.requests if request[0] == method)
+
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handle)
+
+    def _row(self, name: str) -> dict:
+        version = self.versions[name]
+        return {
+            "id": version,
+            "prompt_id": 1,
+            "name": name,
+            "content": f"{name} v{version}",
+            "version": version,
+            "tag": None,
+            "tags": [],
+            "metadata": None,
+            "created_at": "2026-01-01T00:00:00+00:00",
+            "updated_at": "2026-01-01T00:00:00+00:00",
+        }
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        if self.down:
+            raise httpx.ConnectError("server is down", request=request)
+        if request.method == "POST":
+            prompts = [
+                {
+                    "name": item["name"],
+                    "tag": item["tag"],
+                    "prompt": self._row(item["name"]) if item["name"] in self.versions else None,
+                }
+                for item in json.loads(request.content)["prompts"]
+            ]
+            self._log(request, 200)
+            return httpx.Response(200, json=prompts)
+
+        self.hold.wait(WAIT_SECONDS)
+        name = request.url.params["name"]
+        if name not in self.versions:
+            self._log(request, 200)
+            return httpx.Response(200, json=[])
+        etag = f'"{name}-{self.versions[name]}"'
+        if request.headers.get("if-none-match") == etag:
+            self._log(request, 304)
+            return httpx.Response(304, headers={"ETag": etag})
+        self._log(request, 200)
+        return httpx.Response(200, json=[self._row(name)], headers={"ETag": etag})
+
+    def _log(self, request: httpx.Request, status_code: int) -> None:
+        with self._lock:
+            self.requests.append(
+                (
+                    request.method,
+                    request.url.path,
+                    request.headers.get("if-none-match"),
+                    status_code,
+                )
+            )
+
+
+def _wait_for(condition: Callable[[], bool]) -> bool:
+    deadline = time.monotonic() + WAIT_SECONDS
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+def check_not_modified() -> list[str]:
+    # With no TTL and no stale window every read revalidates synchronously.
+    server = FakeServer()
+    server.publish("greeting")
+    with PromptManagerClient(
+        "key", ttl_seconds=0, stale_seconds=0, transport=server.transport()
+    ) as client:
+        first = client.get_prompt("greeting")
+        second = client.get_prompt("greeting")
+
+    failures: list[str] = []
+    statuses = [(etag, status_code) for _, _, etag, status_code in server.requests]
+    if statuses != [(None, 200), ('"greeting-1"', 304)]:
+        failures.append(f"304: expected a 200 then a conditional 304, got {statuses}")
+    if second != first:
+        failures.append("304: the cached value was not returned after a 304")
+    return failures
+
+
+def check_stale_while_revalidate() -> list[str]:
+    server = FakeServer()
+    server.publish("greeting")
+    failures: list[str] = []
+    with PromptManagerClient(
+        "key", ttl_seconds=0, stale_seconds=60, transport=server.transport()
+    ) as client:
+        client.get_prompt("greeting")
+        server.publish("greeting")
+        # The refresh is parked in the server, so a read that waited for it would hang.
+        server.hold.clear()
+        started = time.monotonic()
+        stale = client.get_prompt("greeting")
+        elapsed = time.monotonic() - started
+        if stale.version != 1 or elapsed > 1:
+            failures.append(
+                f"stale: read returned v{stale.version} after {elapsed:.2f}s, expected v1 at once"
+            )
+        server.hold.set()
+        if not _wait_for(lambda: client.prompt_status("greeting").version == 2):
+            failures.append("stale: the background refresh never stored v2")
+        elif client.get_prompt("greeting").version != 2:
+            failures.append("stale: the refreshed value was not served")
+    return failures
+
+
+def check_snapshot_fallback(directory: Path) -> list[str]:
+    server = FakeServer()
+    server.publish("greeting")
+    snapshot_path = directory / "snapshot.json"
+    with PromptManagerClient(
+        "key", snapshot_path=snapshot_path, transport=server.transport()
+    ) as client:
+        saved = client.get_prompt("greeting")
+
+    # A restarted process has an empty cache; only the snapshot can answer.
+    server.down = True
+    failures: list[str] = []
+    with PromptManagerClient(
+        "key", snapshot_path=snapshot_path, transport=server.transport()
+    ) as client:
+        try:
+            if client.get_prompt("greeting") != saved:
+                failures.append("snapshot: the fallback returned a different version")
+        except PromptManagerUnavailableError:
+            failures.append("snapshot: the saved copy was not used while the server was down")
+    with PromptManagerClient("key", transport=server.transport()) as client:
+        try:
+            client.get_prompt("greeting")
+            failures.append("snapshot: a client without a snapshot did not raise")
+        except PromptManagerUnavailableError:
+            pass
+    return failures
+
+
+def check_prefetch_shutdown() -> list[str]:
+    server = FakeServer()
+    server.publish("greeting")
+    failures: list[str] = []
+    client = PromptManagerClient(
+        "key", prefetch=["greeting"], refresh_interval_seconds=0.01, transport=server.transport()
+    )
+    prefetcher = client._prefetcher
+    if not _wait_for(lambda: server.count("POST") >= 3):
+        failures.append("prefetch: the refresh thread did not run")
+    started = time.monotonic()
+    client.close()
+    elapsed = time.monotonic() - started
+    if prefetcher is None or prefetcher.is_alive():
+        failures.append("prefetch: the refresh thread is still running after close()")
+    if elapsed > 1:
+        failures.append(f"prefetch: close() took {elapsed:.2f}s")
+    after_close = server.count("POST")
+    time.sleep(0.1)
+    if server.count("POST") != after_close:
+        failures.append("prefetch: requests were sent after close()")
+
+    # A long interval must not delay shutdown either.
+    client = PromptManagerClient(
+        "key", prefetch=["greeting"], refresh_interval_seconds=3600, transport=server.transport()
+    )
+    started = time.monotonic()
+    client.close()
+    if time.monotonic() - started > 1:
+        failures.append("prefetch: close() waited for the refresh interval")
+    return failures
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        checks = {
+            "304 revalidation": check_not_modified,
+            "stale-while-revalidate": check_stale_while_revalidate,
+            "snapshot fallback": lambda: check_snapshot_fallback(Path(directory)),
+            "prefetch shutdown": check_prefetch_shutdown,
+        }
+        failures: list[str] = []
+        for label, check in checks.items():
+            problems = check()
+            print(f"{'FAIL' if problems else 'ok':<4} {label}")
+            failures.extend(problems)
+
+    if failures:
+        print("\n".join(failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
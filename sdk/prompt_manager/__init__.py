@@ -0,0 +1,18 @@
+from prompt_manager.client import PromptManagerClient
+from prompt_manager.errors import (
+    PromptManagerError,
+    PromptManagerHTTPError,
+    PromptManagerUnavailableError,
+    PromptNotFoundError,
+)
+from prompt_manager.models import PromptStatus, PromptVersion
+
+__all__ = [
+    "PromptManagerClient",
+    "PromptManagerError",
+    "PromptManagerHTTPError",
+    "PromptManagerUnavailableError",
+    "PromptNotFoundError",
+    "PromptStatus",
+    "PromptVersion",
+]
@@ -0,0 +1,72 @@
+from dataclasses import dataclass
+from threading import Lock
+from time import monotonic
+
+from prompt_manager.models import PromptVersion
+
+PromptKey = tuple[str, str | None]
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    value: PromptVersion
+    etag: str | None
+    # Wall-clock time the server last confirmed `value` (a 200 or a 304). Fallbacks keep
+    # it, so it always says how old the data really is.
+    fetched_at: float
+    # Monotonic deadlines: served as is until `fresh_until`, served while refreshing in
+    # the background until `stale_until`, fetched synchronously after that.
+    fresh_until: float
+    stale_until: float
+
+    def is_fresh(self, now: float) -> bool:
+        return now < self.fresh_until
+
+    def is_servable(self, now: float) -> bool:
+        return now < self.stale_until
+
+
+class PromptCache:
+    def __init__(self, *, ttl_seconds: float, stale_seconds: float) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self._entries: dict[PromptKey, CacheEntry] = {}
+        self._lock = Lock()
+
+    def get(self, key: PromptKey) -> CacheEntry | None:
+        return self._entries.get(key)
+
+    def items(self) -> list[tuple[PromptKey, CacheEntry]]:
+        with self._lock:
+            return list(self._entries.items())
+
+    def make_entry(
+        self, value: PromptVersion, *, etag: str | None, fetched_at: float
+    ) -> CacheEntry:
+        now = monotonic()
+        return CacheEntry(
+            value=value,
+            etag=etag,
+            fetched_at=fetched_at,
+            fresh_until=now + self.ttl_seconds,
+            stale_until=now + self.ttl_seconds + self.stale_seconds,
+        )
+
+    def put(
+        self, key: PromptKey, value: PromptVersion, *, etag: str | None, fetched_at: float
+    ) -> CacheEntry:
+        entry = self.make_entry(value, etag=etag, fetched_at=fetched_at)
+        with self._lock:
+            self._entries[key] = entry
+        return entry
+
+    def discard(self, key: PromptKey) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+__all__ = ["CacheEntry", "PromptCache", "PromptKey"]
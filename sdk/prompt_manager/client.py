@@ -0,0 +1,332 @@
+import logging
+import os
+import time
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event, Lock, Thread
+from time import monotonic
+from types import TracebackType
+from typing import Any
+
+import httpx
+
+from prompt_manager.cache import CacheEntry, PromptCache, PromptKey
+from prompt_manager.errors import (
+    PromptManagerHTTPError,
+    PromptManagerUnavailableError,
+    PromptNotFoundError,
+)
+from prompt_manager.models import PromptStatus, PromptVersion
+from prompt_manager.snapshot import PromptSnapshot, SnapshotEntry
+
+logger = logging.getLogger(__name__)
+
+PROMPTS_PATH = "/api/v1/prompts"
+RESOLVE_PATH = "/api/v1/prompts/resolve"
+# Matches the server's per-request limit for POST /prompts/resolve.
+RESOLVE_BATCH_SIZE = 100
+
+
+class _ServerUnavailable(Exception):
+    pass
+
+
+def _http_error(response: httpx.Response) -> PromptManagerHTTPError:
+    return PromptManagerHTTPError(
+        f"Prompt Manager returned {response.status_code}: {response.text}",
+        status_code=response.status_code,
+    )
+
+
+class PromptManagerClient:
+    # Resolves the latest version of a prompt (optionally for a tag) through one pooled
+    # keep-alive connection set. Results are cached for `ttl_seconds`, then served for up
+    # to `stale_seconds` more while a background refresh revalidates them with their ETag.
+    # When the server is down, the last good value is served from memory or, after a
+    # restart, from `snapshot_path`.
+    #
+    # Prompts listed in `prefetch` are loaded in one bulk request when the client is
+    # created and re-resolved every `refresh_interval_seconds` by a background thread,
+    # so reading them never waits on the network.
+    def __init__(
+        self,
+        api_key: str,
+        *,
+        base_url: str = "http://localhost:8000",
+        ttl_seconds: float = 60.0,
+        stale_seconds: float = 300.0,
+        snapshot_path: str | os.PathLike[str] | None = None,
+        timeout_seconds: float = 5.0,
+        max_connections: int = 10,
+        refresh_workers: int = 2,
+        prefetch: Iterable[str | tuple[str, str | None]] = (),
+        refresh_interval_seconds: float | None = None,
+        transport: httpx.BaseTransport | None = None,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._http = httpx.Client(
+            base_url=base_url,
+            headers={"X-API-Key": api_key, "Accept": "application/json"},
+            timeout=timeout_seconds,
+            limits=httpx.Limits(
+                max_connections=max_connections, max_keepalive_connections=max_connections
+            ),
+            transport=transport,
+        )
+        self._cache = PromptCache(ttl_seconds=ttl_seconds, stale_seconds=stale_seconds)
+        self._snapshot = PromptSnapshot(snapshot_path) if snapshot_path is not None else None
+        self._refresher = ThreadPoolExecutor(
+            max_workers=refresh_workers, thread_name_prefix="prompt-manager-refresh"
+        )
+        self._refreshing: set[PromptKey] = set()
+        self._refreshing_lock = Lock()
+
+        self._declared_keys: tuple[PromptKey, ...] = tuple(
+            dict.fromkeys(
+                (item, None) if isinstance(item, str) else (item[0], item[1]) for item in prefetch
+            )
+        )
+        # Replaced as whole dicts by the prefetch refresh and never mutated afterwards, so
+        # readers take a plain reference to them without locking.
+        self._declared: dict[PromptKey, CacheEntry] = {}
+        self._declared_errors: dict[PromptKey, str] = {}
+        self._declared_lock = Lock()
+        self._refresh_interval_seconds = (
+            refresh_interval_seconds if refresh_interval_seconds is not None else ttl_seconds / 2
+        )
+        self._stopping = Event()
+        self._prefetcher: Thread | None = None
+        if self._declared_keys:
+            self.refresh_declared()
+            self._prefetcher = Thread(
+                target=self._prefetch_loop, name="prompt-manager-prefetch", daemon=True
+            )
+            self._prefetcher.start()
+
+    def __enter__(self) -> "PromptManagerClient":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._stopping.set()
+        if self._prefetcher is not None:
+            self._prefetcher.join()
+        self._refresher.shutdown(wait=True, cancel_futures=True)
+        self._http.close()
+
+    def get_prompt(self, name: str, *, tag: str | None = None) -> PromptVersion:
+        key: PromptKey = (name, tag)
+        declared = self._declared.get(key)
+        if declared is not None:
+            return declared.value
+        entry = self._cache.get(key)
+        now = monotonic()
+        if entry is not None and entry.is_fresh(now):
+            return entry.value
+        if entry is not None and entry.is_servable(now):
+            self._refresh_in_background(key)
+            return entry.value
+        return self._resolve(key).value
+
+    def invalidate(self, name: str | None = None, *, tag: str | None = None) -> None:
+        # Declared prompts are not affected; use refresh_declared() to reload them now.
+        if name is None:
+            self._cache.clear()
+        else:
+            self._cache.discard((name, tag))
+
+    def refresh_declared(self) -> None:
+        with self._declared_lock:
+            keys = self._declared_keys
+            try:
+                resolved = self._fetch_many(keys)
+            except (_ServerUnavailable, PromptManagerHTTPError) as exc:
+                logger.warning("Refreshing declared prompts failed (%s).", exc)
+                self._declared_errors = dict.fromkeys(keys, str(exc))
+                if not self._declared and isinstance(exc, _ServerUnavailable):
+                    self._declared = self._declared_from_snapshot()
+                return
+
+            fetched_at = time.time()
+            declared: dict[PromptKey, CacheEntry] = {}
+            errors: dict[PromptKey, str] = {}
+            changed: dict[PromptKey, SnapshotEntry] = {}
+            for key in keys:
+                value = resolved.get(key)
+                if value is None:
+                    errors[key] = "Prompt not found."
+                    continue
+                declared[key] = self._cache.make_entry(value, etag=None, fetched_at=fetched_at)
+                previous = self._declared.get(key)
+                if previous is None or previous.value != value:
+                    changed[key] = SnapshotEntry(value=value, etag=None, fetched_at=fetched_at)
+            self._declared = declared
+            self._declared_errors = errors
+            if self._snapshot is not None:
+                self._snapshot.save_many(changed)
+
+    def prompt_status(self, name: str, *, tag: str | None = None) -> PromptStatus | None:
+        key: PromptKey = (name, tag)
+        declared = key in self._declared_keys
+        entry = self._declared.get(key) if declared else self._cache.get(key)
+        if entry is None and not declared:
+            return None
+        return self._status(key, entry, declared=declared, now=time.time())
+
+    def status(self) -> list[PromptStatus]:
+        now = time.time()
+        declared = self._declared
+        declared_keys = set(self._declared_keys)
+        statuses = [
+            self._status(key, declared.get(key), declared=True, now=now)
+            for key in self._declared_keys
+        ]
+        statuses.extend(
+            self._status(key, entry, declared=False, now=now)
+            for key, entry in self._cache.items()
+            if key not in declared_keys
+        )
+        return statuses
+
+    def _status(
+        self, key: PromptKey, entry: CacheEntry | None, *, declared: bool, now: float
+    ) -> PromptStatus:
+        age = now - entry.fetched_at if entry is not None else None
+        return PromptStatus(
+            name=key[0],
+            tag=key[1],
+            declared=declared,
+            version=entry.value.version if entry is not None else None,
+            fetched_at=entry.fetched_at if entry is not None else None,
+            age_seconds=age,
+            stale=age is None or age > self.ttl_seconds,
+            error=self._declared_errors.get(key) if declared else None,
+        )
+
+    def _prefetch_loop(self) -> None:
+        while not self._stopping.wait(self._refresh_interval_seconds):
+            try:
+                self.refresh_declared()
+            except Exception:
+                logger.exception("Declared prompt refresh crashed.")
+
+    def _declared_from_snapshot(self) -> dict[PromptKey, CacheEntry]:
+        if self._snapshot is None:
+            return {}
+        declared: dict[PromptKey, CacheEntry] = {}
+        for key in self._declared_keys:
+            saved = self._snapshot.get(key)
+            if saved is not None:
+                declared[key] = self._cache.make_entry(
+                    saved.value, etag=saved.etag, fetched_at=saved.fetched_at
+                )
+        if declared:
+            logger.warning("Serving %d declared prompts from the snapshot.", len(declared))
+        return declared
+
+    def _refresh_in_background(self, key: PromptKey) -> None:
+        with self._refreshing_lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        try:
+            self._refresher.submit(self._background_refresh, key)
+        except RuntimeError:
+            # The client is closing; the stale value is still returned to the caller.
+            with self._refreshing_lock:
+                self._refreshing.discard(key)
+
+    def _background_refresh(self, key: PromptKey) -> None:
+        try:
+            self._resolve(key)
+        except PromptNotFoundError:
+            pass
+        except Exception:
+            logger.warning("Background refresh of prompt %r failed.", key, exc_info=True)
+        finally:
+            with self._refreshing_lock:
+                self._refreshing.discard(key)
+
+    def _send(self, method: str, path: str, **kwargs: Any) -> httpx.Response:
+        try:
+            response = self._http.request(method, path, **kwargs)
+        except httpx.TransportError as exc:
+            raise _ServerUnavailable(str(exc)) from exc
+        if response.status_code >= 500:
+            raise _ServerUnavailable(f"Prompt Manager returned {response.status_code}.")
+        return response
+
+    def _resolve(self, key: PromptKey) -> CacheEntry:
+        entry = self._cache.get(key)
+        try:
+            return self._fetch(key, entry)
+        except _ServerUnavailable as exc:
+            return self._fall_back(key, entry, exc)
+
+    def _fetch(self, key: PromptKey, entry: CacheEntry | None) -> CacheEntry:
+        name, tag = key
+        params: dict[str, str] = {"name": name, "latest": "true"}
+        if tag is not None:
+            params["tag"] = tag
+        headers = {"If-None-Match": entry.etag} if entry is not None and entry.etag else {}
+        response = self._send("GET", PROMPTS_PATH, params=params, headers=headers)
+        if response.status_code == 304 and entry is not None:
+            return self._cache.put(key, entry.value, etag=entry.etag, fetched_at=time.time())
+        if response.status_code != 200:
+            raise _http_error(response)
+
+        rows = response.json()
+        if not rows:
+            self._cache.discard(key)
+            suffix = f" tagged {tag!r}" if tag is not None else ""
+            raise PromptNotFoundError(f"No prompt named {name!r}{suffix}.")
+        value = PromptVersion.from_json(rows[0])
+        etag = response.headers.get("etag")
+        fetched_at = time.time()
+        if self._snapshot is not None and (entry is None or entry.value != value):
+            self._snapshot.save(key, SnapshotEntry(value=value, etag=etag, fetched_at=fetched_at))
+        return self._cache.put(key, value, etag=etag, fetched_at=fetched_at)
+
+    def _fetch_many(self, keys: Sequence[PromptKey]) -> dict[PromptKey, PromptVersion | None]:
+        resolved: dict[PromptKey, PromptVersion | None] = {}
+        for start in range(0, len(keys), RESOLVE_BATCH_SIZE):
+            batch = keys[start : start + RESOLVE_BATCH_SIZE]
+            response = self._send(
+                "POST",
+                RESOLVE_PATH,
+                json={"prompts": [{"name": name, "tag": tag} for name, tag in batch]},
+            )
+            if response.status_code != 200:
+                raise _http_error(response)
+            for item in response.json():
+                prompt = item["prompt"]
+                resolved[(item["name"], item["tag"])] = (
+                    PromptVersion.from_json(prompt) if prompt is not None else None
+                )
+        return resolved
+
+    def _fall_back(
+        self, key: PromptKey, entry: CacheEntry | None, exc: _ServerUnavailable
+    ) -> CacheEntry:
+        # Re-cached with a fresh TTL so an outage costs one failed request per TTL
+        # instead of one per read; `fetched_at` still reports the original age.
+        if entry is not None:
+            logger.warning("Prompt Manager unavailable (%s); serving cached %r.", exc, key)
+            return self._cache.put(key, entry.value, etag=entry.etag, fetched_at=entry.fetched_at)
+        saved = self._snapshot.get(key) if self._snapshot is not None else None
+        if saved is not None:
+            logger.warning("Prompt Manager unavailable (%s); serving snapshot %r.", exc, key)
+            return self._cache.put(key, saved.value, etag=saved.etag, fetched_at=saved.fetched_at)
+        raise PromptManagerUnavailableError(
+            f"Prompt Manager is unavailable and {key!r} has no cached copy."
+        ) from exc
+
+
+__all__ = ["PROMPTS_PATH", "RESOLVE_PATH", "PromptManagerClient"]
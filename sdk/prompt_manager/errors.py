@@ -0,0 +1,24 @@
+class PromptManagerError(Exception):
+    pass
+
+
+class PromptNotFoundError(PromptManagerError):
+    pass
+
+
+class PromptManagerUnavailableError(PromptManagerError):
+    pass
+
+
+class PromptManagerHTTPError(PromptManagerError):
+    def __init__(self, message: str, *, status_code: int) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+
+
+__all__ = [
+    "PromptManagerError",
+    "PromptManagerHTTPError",
+    "PromptManagerUnavailableError",
+    "PromptNotFoundError",
+]
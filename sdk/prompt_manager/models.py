@@ -0,0 +1,62 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+
+@dataclass(frozen=True)
+class PromptVersion:
+    id: int
+    prompt_id: int
+    name: str
+    content: str
+    version: int
+    tag: str | None
+    tags: tuple[str, ...]
+    metadata: dict[str, Any] | None
+    created_at: datetime
+    updated_at: datetime
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> "PromptVersion":
+        return cls(
+            id=data["id"],
+            prompt_id=data["prompt_id"],
+            name=data["name"],
+            content=data["content"],
+            version=data["version"],
+            tag=data.get("tag"),
+            tags=tuple(data.get("tags") or ()),
+            metadata=data.get("metadata"),
+            created_at=datetime.fromisoformat(data["created_at"]),
+            updated_at=datetime.fromisoformat(data["updated_at"]),
+        )
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "prompt_id": self.prompt_id,
+            "name": self.name,
+            "content": self.content,
+            "version": self.version,
+            "tag": self.tag,
+            "tags": list(self.tags),
+            "metadata": self.metadata,
+            "created_at": self.created_at.isoformat(),
+            "updated_at": self.updated_at.isoformat(),
+        }
+
+
+@dataclass(frozen=True)
+class PromptStatus:
+    name: str
+    tag: str | None
+    declared: bool
+    # None until a value was loaded, from the server or the snapshot.
+    version: int | None
+    fetched_at: float | None
+    age_seconds: float | None
+    stale: bool
+    error: str | None
+
+
+__all__ = ["PromptStatus", "PromptVersion"]
@@ -0,0 +1,102 @@
+import json
+import logging
+import os
+import tempfile
+from collections.abc import Mapping
+from contextlib import suppress
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Lock
+from typing import Any
+
+from prompt_manager.cache import PromptKey
+from prompt_manager.models import PromptVersion
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT = 1
+
+
+@dataclass(frozen=True)
+class SnapshotEntry:
+    value: PromptVersion
+    etag: str | None
+    fetched_at: float
+
+
+class PromptSnapshot:
+    # Last-known-good copy of every prompt this client resolved, used only when the
+    # server cannot be reached. Written with a rename so a crash mid-write leaves the
+    # previous file in place.
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self.path = Path(path)
+        self._entries: dict[PromptKey, SnapshotEntry] | None = None
+        self._lock = Lock()
+
+    def _load(self) -> dict[PromptKey, SnapshotEntry]:
+        if self._entries is not None:
+            return self._entries
+        entries: dict[PromptKey, SnapshotEntry] = {}
+        try:
+            document = json.loads(self.path.read_text(encoding="utf-8"))
+            if document.get("format") == SNAPSHOT_FORMAT:
+                for item in document["prompts"]:
+                    entries[(item["name"], item["tag"])] = SnapshotEntry(
+                        value=PromptVersion.from_json(item["prompt"]),
+                        etag=item.get("etag"),
+                        fetched_at=item["fetched_at"],
+                    )
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, TypeError):
+            logger.warning("Ignoring unreadable prompt snapshot %s.", self.path, exc_info=True)
+        self._entries = entries
+        return entries
+
+    def get(self, key: PromptKey) -> SnapshotEntry | None:
+        with self._lock:
+            return self._load().get(key)
+
+    def save(self, key: PromptKey, entry: SnapshotEntry) -> None:
+        self.save_many({key: entry})
+
+    def save_many(self, changes: Mapping[PromptKey, SnapshotEntry]) -> None:
+        if not changes:
+            return
+        with self._lock:
+            entries = self._load()
+            entries.update(changes)
+            document: dict[str, Any] = {
+                "format": SNAPSHOT_FORMAT,
+                "prompts": [
+                    {
+                        "name": name,
+                        "tag": tag,
+                        "etag": item.etag,
+                        "fetched_at": item.fetched_at,
+                        "prompt": item.value.to_json(),
+                    }
+                    for (name, tag), item in entries.items()
+                ],
+            }
+            try:
+                self._write(json.dumps(document))
+            except OSError:
+                logger.warning("Could not write prompt snapshot %s.", self.path, exc_info=True)
+
+    def _write(self, payload: str) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(prefix=f".{self.path.name}.", dir=self.path.parent)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as tmp:
+                tmp.write(payload)
+                tmp.flush()
+                os.fsync(tmp.fileno())
+            os.replace(tmp_name, self.path)
+        except BaseException:
+            with suppress(OSError):
+                os.unlink(tmp_name)
+            raise
+
+
+__all__ = ["PromptSnapshot", "SnapshotEntry"]